@@ -0,0 +1,95 @@
+"""
+Benchmark do Big-M das restrições R8 do FCSA MILP (global x por (l,t))
+Para cada problema e tipo de Big-M, reporta o limitante da relaxação LP do passo 2,
+o número de nós de branch-and-bound, o gap e o tempo total.
+
+Uso:
+    python benchmarks/benchmark_big_m.py
+    python benchmarks/benchmark_big_m.py --backend highs --links 100 300
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar diretório raiz ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_construcao import PASTA_BASE, replicar_problema
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.presolve import SolverReduzido
+from modelos.solvers import criar_solver
+
+
+def limite_lp(modelo: FCSA_MILP, backend: str) -> float:
+    """Valor da relaxação LP do passo 2 (com R16) do modelo já construído e resolvido"""
+    ps = modelo._presolve
+    relaxada = ps.matriz.com_limites(ps.matriz.lb, ps.matriz.ub, np.full(ps.matriz.num_colunas, 'C'))
+    lp = SolverReduzido(criar_solver(relaxada, 'highs' if backend == 'highs' else 'cplex'), ps)
+    ind = np.flatnonzero(modelo._c_f)
+    lp.adicionar_restricao(ind, modelo._c_f[ind], 'L', modelo.solucao['f_otimo'], 'R16_lexicografica')
+    lp.definir_objetivo(modelo._c_custo)
+    return lp.resolver()['objetivo']
+
+
+def medir(pasta: str, backend: str, big_m: str, time_limit: float) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        modelo = FCSA_MILP(pasta)
+        modelo.log_output = False
+        if time_limit:
+            modelo.time_limit = time_limit
+        modelo.construir(backend=backend, big_m=big_m)
+        if not modelo.resolver():
+            return {'problema': pasta, 'big_m': big_m, 'erro': 'sem solução'}
+        lp = limite_lp(modelo, backend)
+    s = modelo.solucao
+    return {
+        'problema': Path(pasta).name,
+        'big_m': big_m,
+        'limite_lp': lp,
+        'objetivo': s['valor_objetivo'],
+        'gap_lp_%': 100 * (s['valor_objetivo'] - lp) / abs(s['valor_objetivo']),
+        'nos': s['nos_bb'],
+        'gap_%': s['gap_%'],
+        'tempo_s': s['tempo_s'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do Big-M do FCSA MILP')
+    parser.add_argument('--backend', default='cplex', choices=FCSA_MILP.BACKENDS)
+    parser.add_argument('--problemas', nargs='*', default=['dados/problema0', 'dados/problema1'])
+    parser.add_argument('--links', type=int, nargs='*', default=[],
+                        help='Tamanhos de instâncias replicadas a partir de problema0')
+    parser.add_argument('--time-limit', type=float, default=None)
+    args = parser.parse_args()
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        pastas = list(args.problemas)
+        pastas += [str(replicar_problema(PASTA_BASE, n, Path(tmp) / f'L{n}')) for n in args.links]
+        for pasta in pastas:
+            for big_m in FCSA_MILP.TIPOS_BIG_M[::-1]:
+                resultados.append(medir(pasta, args.backend, big_m, args.time_limit))
+
+    print(f"\n{'='*90}\n📐 BIG-M GLOBAL x POR (l,t) - backend {args.backend}\n{'='*90}")
+    print(f"{'Problema':<10} | {'Big-M':>6} | {'Limite LP':>14} | {'Objetivo':>14} | "
+          f"{'Gap LP':>7} | {'Nós':>7} | {'Gap':>6} | {'Tempo (s)':>9}")
+    print('-' * 90)
+    for r in resultados:
+        if 'erro' in r:
+            print(f"{r['problema']:<10} | {r['big_m']:>6} | {r['erro']}")
+            continue
+        print(f"{r['problema']:<10} | {r['big_m']:>6} | {r['limite_lp']:>14,.2f} | {r['objetivo']:>14,.2f} | "
+              f"{r['gap_lp_%']:>6.2f}% | {r['nos']:>7} | {r['gap_%']:>5.2f}% | {r['tempo_s']:>9.2f}")
+    print('=' * 90)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark de construção do modelo FCSA MILP
+Mede o tempo e a memória Python de FCSA_MILP.construir() em função do número de links |L|
+
+Uso:
+    python benchmarks/benchmark_construcao.py
+    python benchmarks/benchmark_construcao.py --links 15 100 250 500 --backend docplex cplex
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar diretório raiz ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos.modelo_Caio import FCSA_MILP
+
+PASTA_BASE = Path(__file__).resolve().parent.parent / 'dados' / 'problema0'
+
+
+def replicar_problema(pasta_base: Path, n_links: int, destino: Path, seed: int = 0) -> Path:
+    """
+    Cria pasta de problema com n_links replicando os perfis de pasta_base
+
+    Os links são sorteados (com reposição) entre os links originais e recebem
+    coordenadas aleatórias na mesma região, de modo que a cobertura espacial
+    mantenha densidade semelhante à do problema original.
+    """
+    rng = np.random.default_rng(seed)
+    destino.mkdir(parents=True, exist_ok=True)
+
+    links = pd.read_csv(pasta_base / 'links.csv')
+    origem = rng.choice(links['link_id'].to_numpy(), size=n_links)
+    novos = np.arange(n_links)
+    mapa = pd.DataFrame({'link_id': novos, 'origem': origem})
+
+    escala = np.sqrt(n_links / len(links))
+    lat0, lon0 = links['latitude'].mean(), links['longitude'].mean()
+    dlat = (links['latitude'].max() - links['latitude'].min()) * escala
+    dlon = (links['longitude'].max() - links['longitude'].min()) * escala
+
+    novos_links = links.set_index('link_id').loc[origem].reset_index(drop=True)
+    novos_links.insert(0, 'link_id', novos)
+    novos_links['latitude'] = lat0 + (rng.random(n_links) - 0.5) * dlat
+    novos_links['longitude'] = lon0 + (rng.random(n_links) - 0.5) * dlon
+    novos_links.to_csv(destino / 'links.csv', index=False)
+
+    for arquivo in ['custos_estacoes.csv', 'areas_disponiveis.csv', 'parametros_transporte.csv',
+                    'demanda_energia.csv', 'irradiacao_solar.csv']:
+        df = pd.read_csv(pasta_base / arquivo)
+        df = mapa.merge(df.rename(columns={'link_id': 'origem'}), on='origem').drop(columns='origem')
+        df.sort_values([c for c in ['link_id', 'periodo'] if c in df.columns]).to_csv(destino / arquivo, index=False)
+
+    for arquivo in ['custos_carports_pv.csv', 'tarifas_energia.csv', 'config_geral.yaml']:
+        (destino / arquivo).write_bytes((pasta_base / arquivo).read_bytes())
+
+    return destino
+
+
+def medir_construcao(pasta: Path, backend: str) -> dict:
+    """Instancia o modelo e mede apenas o tempo e o pico de memória Python de construir()"""
+    modelo = FCSA_MILP(str(pasta))
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    modelo.construir(backend=backend)
+    tempo = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'backend': backend,
+        'links': len(modelo.L),
+        'variaveis': modelo._solver.num_colunas,
+        'restricoes': modelo._solver.num_linhas,
+        'tempo_construcao_s': tempo,
+        'pico_memoria_mb': pico / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de construção do FCSA MILP')
+    parser.add_argument('--links', type=int, nargs='+', default=[15, 50, 100, 250, 500])
+    parser.add_argument('--backend', nargs='+', default=['docplex'], choices=FCSA_MILP.BACKENDS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.links:
+            pasta = replicar_problema(PASTA_BASE, n, Path(tmp) / f'L{n}', seed=args.seed)
+            for backend in args.backend:
+                resultados.append(medir_construcao(pasta, backend))
+
+    print(f"\n{'='*80}\n⏱️  TEMPO DE CONSTRUÇÃO vs |L|\n{'='*80}")
+    print(f"{'Backend':>8} | {'|L|':>6} | {'Variáveis':>9} | {'Restrições':>10} | "
+          f"{'Tempo (s)':>9} | {'µs/restr.':>9} | {'Pico (MB)':>9}")
+    print('-' * 80)
+    for r in resultados:
+        us = 1e6 * r['tempo_construcao_s'] / max(r['restricoes'], 1)
+        print(f"{r['backend']:>8} | {r['links']:>6} | {r['variaveis']:>9} | {r['restricoes']:>10} | "
+              f"{r['tempo_construcao_s']:>9.3f} | {us:>9.1f} | {r['pico_memoria_mb']:>9.1f}")
+    print('=' * 80)
+
+
+if __name__ == '__main__':
+    main()
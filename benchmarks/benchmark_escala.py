@@ -0,0 +1,304 @@
+"""
+Suíte de benchmarks de escala (construção e solução)
+Executa os modelos em instâncias geradas de tamanho crescente e grava os resultados
+em JSON, para comparar o desempenho entre versões do código.
+
+Casos:
+    - FCSA_MILP (método lexicográfico) em pastas geradas por dados/gerador_instancias.py
+      para a grade |L| x |T|; tempos por fase da telemetria (carga, cobertura,
+      construção, passo 1, passo 2, extração) e pico de memória
+    - ModeloEletropostos e ModeloEletropostosMultiObjetivo (três tipos de objetivo)
+      com n nós gerados (densidade constante: a área cresce com n)
+
+Cada caso roda num processo novo (multiprocessing 'spawn'), de modo que o pico de
+memória residente (ru_maxrss) é o do próprio caso. Com --repeticoes > 1, guarda-se o
+menor tempo de cada fase.
+
+Uso:
+    python benchmarks/benchmark_escala.py
+    python benchmarks/benchmark_escala.py --links 15 100 500 1000 --periodos 24 96 --backend cplex
+    python benchmarks/benchmark_escala.py --nos 15 100 --sem-fcsa
+    python benchmarks/benchmark_escala.py --comparar benchmarks/resultados/a.json benchmarks/resultados/b.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar diretório raiz ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dados.gerador_instancias import gerar_problema
+from modelos.instancia import FCSAInstance
+from modelos.solvers import BACKENDS
+from modelos.telemetria import pico_rss_mb, versao_codigo
+
+PASTA_RESULTADOS = Path(__file__).parent / 'resultados'
+TIPOS_OBJETIVO = ('minimizar_custo', 'maximizar_cobertura', 'multi_objetivo')
+# Fases do FCSA_MILP mostradas na tabela (as demais ficam apenas no JSON)
+FASES_FCSA = ('carga', 'cobertura', 'construcao', 'passo1', 'passo2', 'extracao')
+
+
+def dados_eletropostos(n: int, seed: int = 42) -> dict:
+    """
+    n nós no formato de dados/dados_exemplo.obter_dados_teste_grande
+
+    A área (lado 10·√n km) mantém ~0.01 nó/km², de modo que o número de conexões
+    por nó (raio de 15 km) não cresce com n.
+    """
+    rng = np.random.default_rng(seed)
+    lado = 10.0 * np.sqrt(n)
+    coordenadas = rng.uniform(0, lado, size=(n, 2))
+    demandas = np.round(rng.uniform(20, 80, n), 1)
+    capacidades = np.round(rng.uniform(60, 200, n), 1)
+    custos = np.round(capacidades * rng.uniform(500, 800, n), 0)
+    return {
+        'coordenadas': [tuple(c) for c in coordenadas.tolist()],
+        'demandas': demandas.tolist(),
+        'capacidades_eletropostos': capacidades.tolist(),
+        'custos_instalacao': custos.tolist(),
+        'max_distancia': 15,
+    }
+
+
+def _caso_fcsa(pasta: str, backend: str, time_limit: float, usar_cache: bool) -> dict:
+    from modelos.modelo_Caio import FCSA_MILP
+
+    modelo = FCSA_MILP(pasta, usar_cache=usar_cache)
+    modelo.time_limit, modelo.log_output = time_limit, False
+    ok = modelo.resolver(backend=backend)
+    rel = modelo.telemetria.relatorio()
+    solver = {f['fase']: f for f in rel['fases'] if 'status' in f}
+    return {
+        'objetivo': modelo.solucao['valor_objetivo'] if ok else None,
+        'status': solver.get('passo2', solver.get('passo1', {})).get('status'),
+        'fases': {f['fase']: f['wall_s'] for f in rel['fases']},
+        'modelo': rel['modelo'],
+    }
+
+
+def _caso_basico(n: int, backend: str, time_limit: float) -> dict:
+    from modelos.modelo_basico import ModeloEletropostos
+
+    d = dados_eletropostos(n)
+    t0 = time.perf_counter()
+    modelo = ModeloEletropostos(d['coordenadas'], d['demandas'], d['capacidades_eletropostos'],
+                                d['custos_instalacao'], d['max_distancia'], solver=backend)
+    modelo.time_limit = time_limit
+    t1 = time.perf_counter()
+    ok = modelo.resolver()
+    return {
+        'objetivo': modelo.costo_total if ok else None,
+        'fases': {'preparacao': t1 - t0, 'resolver': time.perf_counter() - t1},
+    }
+
+
+def _caso_multi_objetivo(n: int, tipo: str, backend: str, time_limit: float) -> dict:
+    from modelos.modelo_multi_objetivo import ModeloEletropostosMultiObjetivo
+
+    d = dados_eletropostos(n)
+    orcamento = 0.3 * sum(d['custos_instalacao'])
+    t0 = time.perf_counter()
+    modelo = ModeloEletropostosMultiObjetivo(
+        d['coordenadas'], d['demandas'], d['capacidades_eletropostos'], d['custos_instalacao'],
+        d['max_distancia'], tipo_objetivo=tipo, orcamento_maximo=orcamento, pesos=(0.7, 0.3),
+        solver=backend
+    )
+    modelo.time_limit = time_limit
+    t1 = time.perf_counter()
+    ok = modelo.resolver()
+    return {
+        'objetivo': modelo.valor_objetivo if ok else None,
+        'fases': {'preparacao': t1 - t0, 'resolver': time.perf_counter() - t1},
+    }
+
+
+def _executar_caso(funcao, args) -> dict:
+    """Executa o caso no processo atual (filho), silenciando a saída"""
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            r = funcao(*args)
+        r['erro'] = None if r['objetivo'] is not None else 'sem solução'
+    except Exception as e:
+        r = {'objetivo': None, 'fases': {}, 'erro': f'{type(e).__name__}: {str(e).splitlines()[0][:60]}'}
+    r['tempo_s'] = time.perf_counter() - t0
+    r['pico_rss_mb'] = pico_rss_mb()
+    return r
+
+
+def _em_processo_novo(funcao, args) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as ex:
+        return ex.submit(_executar_caso, funcao, args).result()
+
+
+def medir(funcao, args, repeticoes: int) -> dict:
+    """Menor tempo de cada fase (e do total) e maior pico de memória entre as repetições"""
+    execucoes = [_em_processo_novo(funcao, args) for _ in range(repeticoes)]
+    r = dict(execucoes[0])
+    r['fases'] = {fase: min(e['fases'].get(fase, np.inf) for e in execucoes) for fase in r['fases']}
+    r['tempo_s'] = min(e['tempo_s'] for e in execucoes)
+    picos = [e['pico_rss_mb'] for e in execucoes if e['pico_rss_mb'] is not None]
+    r['pico_rss_mb'] = max(picos) if picos else None
+    return r
+
+
+def _commit_git() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def executar_suite(args) -> dict:
+    casos = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.sem_fcsa:
+            for T in args.periodos:
+                for L in args.links:
+                    pasta = gerar_problema(Path(tmp) / f'L{L}_T{T}', L, num_periodos=T, seed=args.seed)
+                    if not args.sem_cache:
+                        # Cache compilado já criado: 'carga' mede o caminho de cargas seguintes
+                        FCSAInstance.de_pasta(pasta)
+                    print(f"   ▶️  FCSA_MILP |L|={L} |T|={T}")
+                    r = medir(_caso_fcsa, (str(pasta), args.backend, args.time_limit, not args.sem_cache),
+                              args.repeticoes)
+                    casos.append({'caso': f'FCSA_MILP|L={L}|T={T}', 'modelo': 'FCSA_MILP',
+                                  'parametros': {'links': L, 'periodos': T}, **r})
+
+        for n in args.nos:
+            print(f"   ▶️  ModeloEletropostos n={n}")
+            r = medir(_caso_basico, (n, args.backend, args.time_limit), args.repeticoes)
+            casos.append({'caso': f'ModeloEletropostos|n={n}', 'modelo': 'ModeloEletropostos',
+                          'parametros': {'nos': n}, **r})
+            for tipo in TIPOS_OBJETIVO:
+                print(f"   ▶️  ModeloEletropostosMultiObjetivo {tipo} n={n}")
+                r = medir(_caso_multi_objetivo, (n, tipo, args.backend, args.time_limit),
+                          args.repeticoes)
+                casos.append({'caso': f'ModeloEletropostosMultiObjetivo:{tipo}|n={n}',
+                              'modelo': 'ModeloEletropostosMultiObjetivo',
+                              'parametros': {'nos': n, 'tipo_objetivo': tipo}, **r})
+
+    return {
+        'versao_codigo': versao_codigo(),
+        'commit': _commit_git(),
+        'data_hora': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'backend': args.backend,
+        'repeticoes': args.repeticoes,
+        'time_limit': args.time_limit,
+        'cache_instancia': not args.sem_cache,
+        'seed': args.seed,
+        'casos': casos,
+    }
+
+
+def imprimir_resultados(resultado: dict):
+    print(f"\n{'='*108}\n📈 BENCHMARK DE ESCALA ({resultado['versao_codigo']}, {resultado['backend']})\n{'='*108}")
+    print(f"{'Caso':<58} | {'Total (s)':>9} | {'Pico RSS (MB)':>13} | {'Objetivo':>16} | Obs.")
+    print('-' * 108)
+    for c in resultado['casos']:
+        objetivo = f"{c['objetivo']:>16,.2f}" if c['objetivo'] is not None else f"{'-':>16}"
+        rss = f"{c['pico_rss_mb']:.1f}" if c['pico_rss_mb'] is not None else '-'
+        print(f"{c['caso']:<58} | {c['tempo_s']:>9.3f} | {rss:>13} | {objetivo} | {c['erro'] or ''}")
+
+    fcsa = [c for c in resultado['casos'] if c['modelo'] == 'FCSA_MILP']
+    if fcsa:
+        print(f"\n{'Fases FCSA_MILP (s)':<24} | " + ' | '.join(f"{f:>10}" for f in FASES_FCSA))
+        print('-' * 108)
+        for c in fcsa:
+            rotulo = f"|L|={c['parametros']['links']} |T|={c['parametros']['periodos']}"
+            print(f"{rotulo:<24} | " + ' | '.join(f"{c['fases'].get(f, np.nan):>10.3f}" for f in FASES_FCSA))
+    print('=' * 108)
+
+
+def comparar(arquivo_base: str, arquivo_novo: str, limiar: float = 1.2) -> int:
+    """
+    Razão novo/base do tempo total, de cada fase e do pico de memória por caso
+
+    Returns:
+        Número de regressões (razão acima de `limiar` no tempo total ou na memória)
+    """
+    base, novo = (json.loads(Path(a).read_text(encoding='utf-8')) for a in (arquivo_base, arquivo_novo))
+    casos_base = {c['caso']: c for c in base['casos']}
+
+    print(f"\n{'='*108}\n🔍 COMPARAÇÃO {base['versao_codigo']} ({base.get('commit') or '-'}) → "
+          f"{novo['versao_codigo']} ({novo.get('commit') or '-'})\n{'='*108}")
+    if base['backend'] != novo['backend']:
+        print(f"   ⚠️  Backends diferentes: {base['backend']} x {novo['backend']}")
+    print(f"{'Caso':<58} | {'Base (s)':>9} | {'Novo (s)':>9} | {'Razão':>6} | {'Mem.':>6} | Fases (razão)")
+    print('-' * 108)
+
+    def razao(a, b):
+        return b / a if a and b is not None else np.nan
+
+    regressoes = 0
+    for c in novo['casos']:
+        b = casos_base.get(c['caso'])
+        if b is None:
+            print(f"{c['caso']:<58} | {'-':>9} | {c['tempo_s']:>9.3f} | {'novo':>6} |")
+            continue
+        r_total = razao(b['tempo_s'], c['tempo_s'])
+        r_mem = razao(b['pico_rss_mb'], c['pico_rss_mb'])
+        fases = ' '.join(f"{f}={razao(b['fases'].get(f), t):.2f}" for f, t in c['fases'].items()
+                         if b['fases'].get(f))
+        regressao = r_total > limiar or r_mem > limiar
+        regressoes += regressao
+        print(f"{c['caso']:<58} | {b['tempo_s']:>9.3f} | {c['tempo_s']:>9.3f} | {r_total:>6.2f} | "
+              f"{r_mem:>6.2f} | {fases}{' ⚠️' if regressao else ''}")
+        if (b['objetivo'] is None) != (c['objetivo'] is None) or (
+                b['objetivo'] is not None and abs(b['objetivo'] - c['objetivo']) > 1e-6 * max(1.0, abs(b['objetivo']))):
+            print(f"   ⚠️  Objetivo mudou: {b['objetivo']} → {c['objetivo']}")
+    print('=' * 108)
+    print(f"{'✅ Sem regressões' if not regressoes else f'❌ {regressoes} regressão(ões)'} (limiar {limiar:.2f}x)")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de escala dos modelos')
+    parser.add_argument('--links', nargs='+', type=int, default=[15, 100, 500, 1000])
+    parser.add_argument('--periodos', nargs='+', type=int, default=[24, 96])
+    parser.add_argument('--nos', nargs='+', type=int, default=[15, 100, 500])
+    parser.add_argument('--backend', default='highs', choices=BACKENDS)
+    parser.add_argument('--time-limit', type=float, default=120)
+    parser.add_argument('--repeticoes', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sem-cache', action='store_true', help='Carga do FCSA a partir dos CSVs')
+    parser.add_argument('--sem-fcsa', action='store_true', help='Apenas os modelos de eletropostos')
+    parser.add_argument('--saida', help=f'Arquivo JSON (padrão: {PASTA_RESULTADOS}/<versão>_<data>.json)')
+    parser.add_argument('--comparar', nargs=2, metavar=('BASE', 'NOVO'), help='Compara dois resultados')
+    parser.add_argument('--limiar', type=float, default=1.2, help='Razão considerada regressão')
+    args = parser.parse_args()
+
+    if args.comparar:
+        return 1 if comparar(*args.comparar, limiar=args.limiar) else 0
+
+    print(f"\n🚀 Benchmark de escala (backend: {args.backend})")
+    resultado = executar_suite(args)
+    imprimir_resultados(resultado)
+
+    saida = Path(args.saida) if args.saida else (
+        PASTA_RESULTADOS / f"{resultado['versao_codigo']}_{datetime.now():%Y%m%d%H%M%S}.json")
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False, default=str), encoding='utf-8')
+    print(f"💾 Resultados: {saida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark da heurística do FCSA (gulosa e gulosa + LP) contra o método exato
+Para cada instância, compara tempo (resolver(), incluindo a construção do MILP no
+exato), f e custo (Cin + Cop) de:
+    - heurística gulosa (resolver(metodo='heuristico'))
+    - heurística com arredondamento da relaxação linear (resolver_heuristico(True))
+    - método lexicográfico exato, com o MIP start padrão e com inicio_passo2='heuristica'
+Δf e Δcusto são relativos ao exato (MIP start padrão).
+
+Instâncias: as pastas informadas e pastas geradas por dados/gerador_instancias.py
+para cada |L| (em diretório temporário).
+
+Uso:
+    python benchmarks/benchmark_heuristica.py
+    python benchmarks/benchmark_heuristica.py --links 100 1000 5000 --periodos 96 --backend cplex
+    python benchmarks/benchmark_heuristica.py --problemas dados/problema1 --links --saida heuristica.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar diretório raiz ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dados.gerador_instancias import gerar_problema
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.solvers import BACKENDS
+
+METODOS = ('gulosa', 'gulosa+LP', 'exato', 'exato+início heur.')
+
+
+def _resolver(pasta: str, metodo: str, backend: str, time_limit: float) -> dict:
+    """Resolve a instância com o método indicado; retorna tempo, f, custo e erro (se houver)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        modelo = FCSA_MILP(pasta)
+    modelo.time_limit, modelo.log_output = time_limit, False
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if metodo == 'gulosa':
+                ok = modelo.resolver(metodo='heuristico')
+            elif metodo == 'gulosa+LP':
+                ok = modelo.resolver_heuristico(relaxacao_lp=True)
+            else:
+                inicio = 'heuristica' if metodo == 'exato+início heur.' else 'passo1'
+                ok = modelo.resolver(backend=backend, inicio_passo2=inicio)
+        erro = None if ok else 'sem solução'
+    except Exception as e:
+        ok, erro = False, f'{type(e).__name__}: {str(e).splitlines()[0][:60]}'
+    s = modelo.solucao if ok else {}
+    return {'tempo_s': time.perf_counter() - t0, 'f': s.get('f_otimo'), 'custo': s.get('custo_total'),
+            'estacoes': s.get('num_estacoes'), 'carports': len(s.get('carports_instalados', {})) if ok else None,
+            'erro': erro}
+
+
+def _delta(valor, referencia):
+    if valor is None or referencia is None:
+        return None
+    return 100 * (valor - referencia) / max(abs(referencia), 1e-10)
+
+
+def executar(args) -> list:
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        instancias = [(os.path.basename(os.path.normpath(p)), p) for p in args.problemas]
+        for L in args.links:
+            pasta = gerar_problema(Path(tmp) / f'L{L}_T{args.periodos}', L, num_periodos=args.periodos,
+                                   seed=args.seed)
+            instancias.append((f'|L|={L} |T|={args.periodos}', str(pasta)))
+
+        for nome, pasta in instancias:
+            print(f"   ▶️  {nome}")
+            casos = {m: _resolver(pasta, m, args.backend, args.time_limit) for m in METODOS}
+            referencia = casos['exato']
+            for metodo, r in casos.items():
+                r.update(caso=nome, metodo=metodo, delta_f_pct=_delta(r['f'], referencia['f']),
+                         delta_custo_pct=_delta(r['custo'], referencia['custo']))
+                resultados.append(r)
+    return resultados
+
+
+def imprimir_resultados(resultados: list, backend: str):
+    print(f"\n{'='*112}\n⚡ HEURÍSTICA x EXATO (backend do exato: {backend})\n{'='*112}")
+    print(f"{'Caso':<20} | {'Método':<18} | {'Tempo (s)':>9} | {'f':>10} | {'Δf':>7} | "
+          f"{'Custo (R$)':>16} | {'Δcusto':>7} | {'Est.':>4} | {'PV':>3} | Obs.")
+    print('-' * 112)
+    for r in resultados:
+        def num(chave, fmt, largura):
+            return format(r[chave], fmt).rjust(largura) if r[chave] is not None else '-'.rjust(largura)
+        print(f"{r['caso']:<20} | {r['metodo']:<18} | {r['tempo_s']:>9.3f} | {num('f', ',.2f', 10)} | "
+              f"{num('delta_f_pct', '.2f', 6)}% | {num('custo', ',.2f', 16)} | {num('delta_custo_pct', '.2f', 6)}% | "
+              f"{num('estacoes', 'd', 4)} | {num('carports', 'd', 3)} | {r['erro'] or ''}")
+    print('=' * 112)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da heurística do FCSA contra o método exato')
+    parser.add_argument('--problemas', nargs='*', default=['dados/problema0', 'dados/problema1'])
+    parser.add_argument('--links', nargs='*', type=int, default=[100, 400, 1000])
+    parser.add_argument('--periodos', type=int, default=24)
+    parser.add_argument('--backend', default='highs', choices=BACKENDS)
+    parser.add_argument('--time-limit', type=float, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--saida', help='Arquivo JSON com os resultados (opcional)')
+    args = parser.parse_args()
+
+    print(f"\n🚀 Benchmark da heurística (exato: {args.backend})")
+    resultados = executar(args)
+    imprimir_resultados(resultados, args.backend)
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 Resultados: {args.saida}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
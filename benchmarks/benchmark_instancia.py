@@ -0,0 +1,102 @@
+"""
+Benchmark da representação dos dados do FCSA (dicionários x FCSAInstance)
+Para cada |L|, compara o tempo e a memória Python de:
+    - dicionários: leitura dos CSVs com pandas + set_index(...).to_dict() (inclusive os
+      dicionários com chave (link, período) de E_d e sh) e conversão para arrays
+    - FCSAInstance (CSV): primeira carga, compilando e gravando o cache da pasta
+    - FCSAInstance (cache): cargas seguintes, com os arrays mapeados em memória
+A memória retida é medida com tracemalloc após a carga (objetos vivos); o pico inclui
+os temporários do parse.
+
+Uso:
+    python benchmarks/benchmark_instancia.py
+    python benchmarks/benchmark_instancia.py --links 1000 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar diretório raiz ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_construcao import PASTA_BASE, replicar_problema
+from modelos.instancia import FCSAInstance
+
+
+def carregar_dicionarios(pasta: Path) -> dict:
+    """Carga com dicionários Python, como FCSA_MILP._carregar_dados fazia antes de FCSAInstance"""
+    custos_est = pd.read_csv(pasta / 'custos_estacoes.csv')
+    custos_pv = pd.read_csv(pasta / 'custos_carports_pv.csv')
+    tarifas = pd.read_csv(pasta / 'tarifas_energia.csv')
+    demanda = pd.read_csv(pasta / 'demanda_energia.csv')
+    irradiacao = pd.read_csv(pasta / 'irradiacao_solar.csv')
+    transporte = pd.read_csv(pasta / 'parametros_transporte.csv')
+    areas = pd.read_csv(pasta / 'areas_disponiveis.csv')
+    links = pd.read_csv(pasta / 'links.csv')
+
+    d = {
+        'L': [int(x) for x in links['link_id'].tolist()],
+        'T': list(range(24)),
+        'c_CS': custos_est.set_index('link_id')['custo_instalacao_reais'].to_dict(),
+        'c_PV': custos_pv.set_index('tipo_pv')['custo_instalacao_reais'].to_dict(),
+        'c_e': tarifas.set_index('periodo')['tarifa_reais_kwh'].to_dict(),
+        'cp': areas.set_index('link_id')['area_disponivel_m2'].to_dict(),
+        'rho': transporte.set_index('link_id')['fluxo_agregado_veiculos_dia'].to_dict(),
+        'beta': transporte.set_index('link_id')['fator_beneficio'].to_dict(),
+        'E_d': demanda.set_index(['link_id', 'periodo'])['demanda_kwh'].to_dict(),
+        'sh': irradiacao.set_index(['link_id', 'periodo'])['irradiacao_normalizada'].to_dict(),
+    }
+    d['E_d_mat'] = np.array([[d['E_d'].get((l, t), 0) for t in d['T']] for l in d['L']], dtype=float)
+    d['sh_mat'] = np.array([[d['sh'].get((l, t), 0) for t in d['T']] for l in d['L']], dtype=float)
+    return d
+
+
+def carregar_instancia(pasta: Path) -> FCSAInstance:
+    inst = FCSAInstance.de_pasta(pasta)
+    inst.vetor('E_d'), inst.vetor('sh')
+    return inst
+
+
+def medir(funcao, pasta: Path) -> dict:
+    """Tempo, memória retida e pico de memória Python de funcao(pasta)"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    resultado = funcao(pasta)
+    tempo = time.perf_counter() - t0
+    retida, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return {'tempo_s': tempo, 'retida_mb': retida / 1e6, 'pico_mb': pico / 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dicionários x FCSAInstance')
+    parser.add_argument('--links', type=int, nargs='+', default=[1000])
+    args = parser.parse_args()
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.links:
+            pasta = replicar_problema(PASTA_BASE, n, Path(tmp) / f'L{n}')
+            resultados.append({'links': n, 'repr': 'dicionários', **medir(carregar_dicionarios, pasta)})
+            resultados.append({'links': n, 'repr': 'FCSAInstance (CSV)', **medir(carregar_instancia, pasta)})
+            resultados.append({'links': n, 'repr': 'FCSAInstance (cache)', **medir(carregar_instancia, pasta)})
+
+    print(f"\n{'='*75}\n📦 REPRESENTAÇÃO DOS DADOS: DICIONÁRIOS x FCSAInstance\n{'='*75}")
+    print(f"{'|L|':>6} | {'Representação':<22} | {'Tempo (s)':>9} | {'Retida (MB)':>11} | {'Pico (MB)':>9}")
+    print('-' * 75)
+    for r in resultados:
+        print(f"{r['links']:>6} | {r['repr']:<22} | {r['tempo_s']:>9.3f} | {r['retida_mb']:>11.2f} | {r['pico_mb']:>9.2f}")
+    print('=' * 75)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark comparativo de solvers (CPLEX x HiGHS)
+Resolve os mesmos modelos com cada backend e imprime tempos e objetivos lado a lado
+
+Modelos comparados:
+    - FCSA_MILP (método lexicográfico) nas pastas de problema informadas
+    - ModeloEletropostos (dados de teste grande)
+    - ModeloEletropostosMultiObjetivo (dados de Campinas, três tipos de objetivo)
+
+Uso:
+    python benchmarks/benchmark_solvers.py
+    python benchmarks/benchmark_solvers.py --solvers cplex highs --problemas dados/problema0
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+# Adicionar diretório raiz ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dados.dados_campinas import obter_dados_campinas, obter_coordenadas_simples
+from dados.dados_exemplo import obter_dados_teste_grande
+from modelos.modelo_basico import ModeloEletropostos
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.modelo_multi_objetivo import ModeloEletropostosMultiObjetivo
+from modelos.solvers import BACKENDS
+
+
+def _executar(funcao) -> dict:
+    """Executa funcao() silenciando a saída; retorna objetivo, tempo e erro (se houver)"""
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            objetivo = funcao()
+        erro = None if objetivo is not None else 'sem solução'
+    except Exception as e:
+        objetivo, erro = None, f'{type(e).__name__}: {str(e).splitlines()[0][:60]}'
+    return {'objetivo': objetivo, 'tempo_s': time.perf_counter() - t0, 'erro': erro}
+
+
+def caso_fcsa(pasta: str, solver: str):
+    modelo = FCSA_MILP(pasta)
+    modelo.log_output = False
+    return modelo.solucao['valor_objetivo'] if modelo.resolver(backend=solver) else None
+
+
+def caso_basico(solver: str):
+    d = obter_dados_teste_grande()
+    modelo = ModeloEletropostos(d['coordenadas'], d['demandas'], d['capacidades_eletropostos'],
+                                d['custos_instalacao'], d['max_distancia'], solver=solver)
+    return modelo.costo_total if modelo.resolver() else None
+
+
+def caso_multi_objetivo(tipo: str, solver: str):
+    d = obter_dados_campinas()
+    modelo = ModeloEletropostosMultiObjetivo(
+        obter_coordenadas_simples(), d['demandas'], d['capacidades_eletropostos'],
+        d['custos_instalacao'], d['max_distancia'], tipo_objetivo=tipo,
+        orcamento_maximo=800000, pesos=(0.7, 0.3), solver=solver
+    )
+    return modelo.valor_objetivo if modelo.resolver() else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark comparativo de solvers')
+    parser.add_argument('--solvers', nargs='+', default=['cplex', 'highs'], choices=BACKENDS)
+    parser.add_argument('--problemas', nargs='+', default=['dados/problema0', 'dados/problema1'])
+    args = parser.parse_args()
+
+    casos = [(f'FCSA {os.path.basename(p)}', lambda s, p=p: caso_fcsa(p, s)) for p in args.problemas]
+    casos.append(('Básico (20 nós)', caso_basico))
+    for tipo in ['minimizar_custo', 'maximizar_cobertura', 'multi_objetivo']:
+        casos.append((f'Multi {tipo}', lambda s, tipo=tipo: caso_multi_objetivo(tipo, s)))
+
+    resultados = []
+    for nome, caso in casos:
+        for solver in args.solvers:
+            r = _executar(lambda: caso(solver))
+            resultados.append({'caso': nome, 'solver': solver, **r})
+
+    print(f"\n{'='*80}\n⏱️  COMPARAÇÃO DE SOLVERS\n{'='*80}")
+    print(f"{'Caso':<28} | {'Solver':>8} | {'Tempo (s)':>9} | {'Objetivo':>16} | Obs.")
+    print('-' * 80)
+    for r in resultados:
+        objetivo = f"{r['objetivo']:>16,.4f}" if r['objetivo'] is not None else f"{'-':>16}"
+        print(f"{r['caso']:<28} | {r['solver']:>8} | {r['tempo_s']:>9.3f} | {objetivo} | {r['erro'] or ''}")
+    print('=' * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""
+Gerador de instâncias sintéticas do FCSA em pastas de problema
+Escreve uma pasta completa (links.csv, custos, áreas, transporte, tarifas, demanda,
+irradiação e config_geral.yaml) no mesmo formato de dados/problema0, parametrizada por:
+    - |L| (até dezenas de milhares de links)
+    - |T|: 24 (horário, um dia), 96 (15 min, um dia) ou 8760 (horário, um ano); outros
+      valores até 96 dividem um dia, múltiplos de 24 acima disso são dias horários
+    - |K| tipos de carport PV
+    - densidade espacial (links por km²) em torno de Campinas
+    - mistura de perfis de demanda (comercial, residencial, industrial, shopping,
+      universitaria)
+    - seed (mesma seed e parâmetros → mesmos arquivos)
+
+A geração é vetorizada e os CSVs por (link, período) são gravados em blocos de
+LINKS_POR_BLOCO links, sem montar a tabela inteira em memória. Por período, a demanda
+é a energia (kWh) e a irradiação normalizada é escalada pela duração do período, de
+modo que E_pv = P_k·sh continue em kWh.
+
+Uso:
+    python dados/gerador_instancias.py dados/problema2 --links 1000
+    python dados/gerador_instancias.py --proximo --links 20000 --periodos 8760 --seed 7
+    python dados/gerador_instancias.py dados/problema3 --links 500 --mix comercial=0.6 industrial=0.4
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+
+LINKS_POR_BLOCO = 256
+ENERGIA_POR_VEICULO_KWH = 22.5
+CENTRO = (-22.9035, -47.0616)  # Campinas (centro)
+KM_POR_GRAU_LAT = 111.32
+
+# Veículos por hora ao longo do dia (0h..23h) e características de cada perfil
+PERFIS = {
+    'comercial': {
+        'veiculos': [2, 2, 1, 1, 3, 7, 13, 17, 15, 11, 10, 10, 11, 13, 15, 17, 20, 23, 20, 15, 11, 7, 4, 3],
+        'zona': 'comercial', 'via': 'arterial_principal', 'estacionamento': 'comercial_privado',
+        'fim_de_semana': 0.8, 'fluxo': (300, 450), 'beneficio': (1.6, 2.0), 'complexidade': 'alta',
+    },
+    'residencial': {
+        'veiculos': [3, 2, 2, 2, 2, 4, 6, 5, 4, 3, 3, 3, 3, 3, 4, 5, 7, 10, 12, 12, 10, 8, 6, 4],
+        'zona': 'residencial_comercial', 'via': 'via_residencial_alto', 'estacionamento': 'condominio_alto',
+        'fim_de_semana': 1.1, 'fluxo': (180, 300), 'beneficio': (1.2, 1.5), 'complexidade': 'baixa',
+    },
+    'industrial': {
+        'veiculos': [2, 2, 2, 2, 3, 6, 10, 12, 12, 11, 11, 10, 11, 11, 11, 10, 8, 5, 3, 3, 2, 2, 2, 2],
+        'zona': 'industrial', 'via': 'via_industrial', 'estacionamento': 'industrial',
+        'fim_de_semana': 0.5, 'fluxo': (220, 300), 'beneficio': (1.3, 1.5), 'complexidade': 'media',
+    },
+    'shopping': {
+        'veiculos': [1, 1, 1, 1, 1, 1, 2, 3, 6, 9, 12, 14, 16, 16, 15, 15, 16, 18, 18, 16, 12, 6, 2, 1],
+        'zona': 'lazer_comercial', 'via': 'via_shopping', 'estacionamento': 'shopping',
+        'fim_de_semana': 1.3, 'fluxo': (350, 450), 'beneficio': (1.8, 2.0), 'complexidade': 'media',
+    },
+    'universitaria': {
+        'veiculos': [1, 1, 1, 1, 1, 2, 6, 12, 14, 12, 10, 9, 9, 11, 12, 10, 9, 8, 8, 6, 4, 2, 1, 1],
+        'zona': 'universitaria', 'via': 'via_universitaria', 'estacionamento': 'universitario',
+        'fim_de_semana': 0.4, 'fluxo': (220, 320), 'beneficio': (1.3, 1.6), 'complexidade': 'media',
+    },
+}
+MIX_PADRAO = {'comercial': 0.35, 'residencial': 0.3, 'industrial': 0.15, 'shopping': 0.1, 'universitaria': 0.1}
+
+# Irradiação normalizada por hora (0h..23h) de um dia típico
+IRRADIACAO_HORARIA = [0, 0, 0, 0, 0, 0, 0.08, 0.24, 0.40, 0.56, 0.71, 0.87, 1.00, 0.95, 0.79, 0.63,
+                      0.48, 0.32, 0.16, 0, 0, 0, 0, 0]
+# Tarifa (R$/kWh) e posto tarifário por hora
+TARIFA_HORARIA = [0.30, 0.30, 0.30, 0.30, 0.30, 0.35, 0.50, 0.75, 0.75, 0.60, 0.40, 0.40, 0.40, 0.60,
+                  1.00, 2.00, 3.50, 5.00, 5.00, 3.50, 2.00, 1.00, 0.50, 0.35]
+POSTO_HORARIO = (['fora_pico'] * 6 + ['intermediario'] * 4 + ['fora_pico'] * 3 + ['intermediario'] * 2
+                 + ['pre_pico'] + ['pico'] * 4 + ['intermediario'] * 2 + ['fora_pico'] * 2)
+COMPLEXIDADE_CUSTO = {'alta': (200000, 220000), 'media': (170000, 195000), 'baixa': (145000, 165000)}
+
+
+def _grade_temporal(num_periodos: int):
+    """(hora do dia contínua, dia, duração em horas) de cada período"""
+    if num_periodos <= 96:
+        duracao = 24.0 / num_periodos
+        hora = np.arange(num_periodos) * duracao
+        dia = np.zeros(num_periodos, dtype=int)
+    elif num_periodos % 24 == 0:
+        duracao = 1.0
+        hora = np.tile(np.arange(24.0), num_periodos // 24)
+        dia = np.repeat(np.arange(num_periodos // 24), 24)
+    else:
+        raise ValueError(f"num_periodos inválido: {num_periodos} (até 96 ou múltiplo de 24)")
+    return hora, dia, duracao
+
+
+def _por_hora(valores_horarios, hora: np.ndarray) -> np.ndarray:
+    """Interpola um perfil de 24 valores horários (cíclico) nas horas contínuas"""
+    v = np.asarray(valores_horarios, dtype=float)
+    return np.interp(hora, np.arange(25), np.append(v, v[0]))
+
+
+def _normalizar_mix(mix: Optional[Dict[str, float]]) -> Dict[str, float]:
+    mix = dict(MIX_PADRAO if not mix else mix)
+    invalidos = set(mix) - set(PERFIS)
+    if invalidos:
+        raise ValueError(f"Perfis inválidos: {sorted(invalidos)} (opções: {', '.join(PERFIS)})")
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("A mistura de perfis precisa de pesos positivos")
+    return {p: w / total for p, w in mix.items()}
+
+
+def proxima_pasta(base='dados') -> Path:
+    """Próxima pasta problemaN livre em base"""
+    base = Path(base)
+    usados = [int(m.group(1)) for p in base.glob('problema*') if (m := re.fullmatch(r'problema(\d+)', p.name))]
+    return base / f'problema{max(usados, default=-1) + 1}'
+
+
+def gerar_problema(destino, num_links: int, num_periodos: int = 24, num_tipos_pv: int = 3,
+                   densidade_km2: float = 0.25, mix_perfis: Optional[Dict[str, float]] = None,
+                   seed: int = 0, raio_cobertura_km: float = 5.0, sobrescrever: bool = False) -> Path:
+    """
+    Gera uma pasta de problema FCSA completa
+
+    Args:
+        destino: Pasta a criar (ex.: dados/problema2)
+        num_links: |L|
+        num_periodos: |T| (24, 96, 8760, ...; ver _grade_temporal)
+        num_tipos_pv: |K| (carports de 50, 100, 150, ... kW)
+        densidade_km2: Links por km² (área quadrada centrada em Campinas)
+        mix_perfis: {perfil: peso} (padrão MIX_PADRAO)
+        seed: Semente (reprodutibilidade)
+        raio_cobertura_km: Raio de cobertura gravado no config
+        sobrescrever: Permitir gravar sobre uma pasta existente
+    """
+    destino = Path(destino)
+    if destino.exists() and any(destino.iterdir()) and not sobrescrever:
+        raise FileExistsError(f"Pasta já existe: {destino} (use sobrescrever=True)")
+    if num_links < 1 or num_tipos_pv < 1 or densidade_km2 <= 0:
+        raise ValueError("num_links, num_tipos_pv e densidade_km2 devem ser positivos")
+    mix = _normalizar_mix(mix_perfis)
+    hora, dia, duracao = _grade_temporal(num_periodos)
+    destino.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+
+    # ==================== LINKS ====================
+    nomes_perfis = list(mix)
+    perfil = rng.choice(len(nomes_perfis), size=num_links, p=list(mix.values()))
+    lado_km = np.sqrt(num_links / densidade_km2)
+    lat = CENTRO[0] + (rng.random(num_links) - 0.5) * lado_km / KM_POR_GRAU_LAT
+    km_por_grau_lon = KM_POR_GRAU_LAT * np.cos(np.radians(CENTRO[0]))
+    lon = CENTRO[1] + (rng.random(num_links) - 0.5) * lado_km / km_por_grau_lon
+    link_id = np.arange(num_links)
+    atributo = {chave: np.array([PERFIS[nomes_perfis[p]][chave] for p in range(len(nomes_perfis))],
+                                dtype=object)[perfil]
+                for chave in ('zona', 'via', 'estacionamento', 'complexidade')}
+    nome_perfil = np.array(nomes_perfis, dtype=object)[perfil]
+
+    pd.DataFrame({
+        'link_id': link_id,
+        'nome': [f'Link_{i}' for i in link_id],
+        'latitude': lat.round(6),
+        'longitude': lon.round(6),
+        'tipo_zona': atributo['zona'],
+        'descricao': nome_perfil,
+    }).to_csv(destino / 'links.csv', index=False)
+
+    # ==================== CUSTOS, ÁREAS E TRANSPORTE ====================
+    faixa = np.array([COMPLEXIDADE_CUSTO[c] for c in atributo['complexidade']], dtype=float)
+    custo = np.round((faixa[:, 0] + rng.random(num_links) * (faixa[:, 1] - faixa[:, 0])) / 1000) * 1000
+    pd.DataFrame({
+        'link_id': link_id,
+        'custo_instalacao_reais': custo.astype(int),
+        'complexidade_infra': atributo['complexidade'],
+        'observacoes': nome_perfil,
+    }).to_csv(destino / 'custos_estacoes.csv', index=False)
+
+    area = np.round(rng.uniform(300, 1800, num_links) / 50) * 50
+    pd.DataFrame({
+        'link_id': link_id,
+        'area_disponivel_m2': area.astype(int),
+        'tipo_estacionamento': atributo['estacionamento'],
+        'observacoes': nome_perfil,
+    }).to_csv(destino / 'areas_disponiveis.csv', index=False)
+
+    fluxo_faixa = np.array([PERFIS[p]['fluxo'] for p in nomes_perfis], dtype=float)[perfil]
+    benef_faixa = np.array([PERFIS[p]['beneficio'] for p in nomes_perfis], dtype=float)[perfil]
+    fluxo = np.round(rng.uniform(fluxo_faixa[:, 0], fluxo_faixa[:, 1]) / 10) * 10
+    beneficio = np.round(rng.uniform(benef_faixa[:, 0], benef_faixa[:, 1]), 1)
+    pd.DataFrame({
+        'link_id': link_id,
+        'fluxo_agregado_veiculos_dia': fluxo.astype(int),
+        'fator_beneficio': beneficio,
+        'beneficio_total': (fluxo * beneficio).round(1),
+        'tipo_via': atributo['via'],
+        'observacoes': nome_perfil,
+    }).to_csv(destino / 'parametros_transporte.csv', index=False)
+
+    k = np.arange(num_tipos_pv)
+    potencia = 50 * (k + 1)
+    pd.DataFrame({
+        'tipo_pv': k,
+        'potencia_kw': potencia,
+        'area_m2': 5 * potencia,
+        # Economia de escala: R$ 1500/kW no menor carport, -5% por tamanho
+        'custo_instalacao_reais': (np.round(1500 * potencia * 0.95 ** k / 1000) * 1000).astype(int),
+        'num_vagas': 6 * (k + 1),
+        'descricao': [f'Carport {p} kW' for p in potencia],
+    }).to_csv(destino / 'custos_carports_pv.csv', index=False)
+
+    # ==================== TARIFAS ====================
+    hora_int = np.floor(hora).astype(int) % 24
+    pd.DataFrame({
+        'periodo': np.arange(num_periodos),
+        'tarifa_reais_kwh': np.array(TARIFA_HORARIA)[hora_int],
+        'tipo_tarifa': np.array(POSTO_HORARIO, dtype=object)[hora_int],
+        'descricao': [f'{h:02d}h' for h in hora_int],
+    }).to_csv(destino / 'tarifas_energia.csv', index=False)
+
+    # ==================== DEMANDA E IRRADIAÇÃO (por blocos de links) ====================
+    veiculos_perfil = np.stack([_por_hora(PERFIS[p]['veiculos'], hora) for p in nomes_perfis])
+    fim_de_semana = (dia % 7) >= 5
+    fator_fds = np.array([PERFIS[p]['fim_de_semana'] for p in nomes_perfis])
+    # (perfil, período): veículos por hora × fator de fim de semana
+    veiculos_perfil = veiculos_perfil * np.where(fim_de_semana[None, :], fator_fds[:, None], 1.0)
+    escala_link = rng.lognormal(0.0, 0.3, num_links)
+    # Sazonalidade (hemisfério sul: máximo perto do solstício de dezembro) e sombreamento por link
+    irradiacao = _por_hora(IRRADIACAO_HORARIA, hora) * (0.85 + 0.15 * np.cos(2 * np.pi * (dia + 10) / 365))
+    sombreamento = rng.uniform(0.75, 1.0, num_links)
+
+    periodo = np.arange(num_periodos)
+    with open(destino / 'demanda_energia.csv', 'w', encoding='utf-8', newline='') as f_dem, \
+         open(destino / 'irradiacao_solar.csv', 'w', encoding='utf-8', newline='') as f_irr:
+        for bloco, inicio in enumerate(range(0, num_links, LINKS_POR_BLOCO)):
+            ids = link_id[inicio:inicio + LINKS_POR_BLOCO]
+            rng_bloco = np.random.default_rng([seed, bloco])
+            ruido = rng_bloco.lognormal(0.0, 0.1, (len(ids), num_periodos))
+            veiculos = veiculos_perfil[perfil[ids]] * escala_link[ids, None] * ruido * duracao
+            demanda = (veiculos * ENERGIA_POR_VEICULO_KWH).round(1)
+            sh = (irradiacao[None, :] * sombreamento[ids, None] * duracao).round(4)
+
+            col_l = np.repeat(ids, num_periodos)
+            col_t = np.tile(periodo, len(ids))
+            pd.DataFrame({
+                'link_id': col_l, 'periodo': col_t, 'demanda_kwh': demanda.ravel(),
+                'num_veiculos': np.round(veiculos).astype(int).ravel(),
+                'perfil': np.repeat(nome_perfil[ids], num_periodos),
+            }).to_csv(f_dem, index=False, header=(bloco == 0))
+            pd.DataFrame({
+                'link_id': col_l, 'periodo': col_t, 'irradiacao_normalizada': sh.ravel(),
+            }).to_csv(f_irr, index=False, header=(bloco == 0))
+
+    # ==================== CONFIG ====================
+    config = {
+        'problema': {
+            'nome': f'{destino.name} - Sintético gerado',
+            'descricao': f'{num_links} links, {num_periodos} períodos, {num_tipos_pv} tipos PV',
+            'cidade': 'Campinas', 'estado': 'SP', 'pais': 'Brasil',
+        },
+        'dimensoes': {'num_links': num_links, 'num_periodos': num_periodos, 'num_tipos_pv': num_tipos_pv},
+        'parametros_financeiros': {'alpha': 0.10, 'Delta_h': 15, 'h': 1, 'moeda': 'BRL'},
+        'parametros_otimizacao': {'min_estacoes': 0, 'BIG_M': None, 'raio_cobertura_km': raio_cobertura_km},
+        'parametros_area': {'a': 1.0},
+        'solver': {'time_limit': 900, 'mip_gap': 0.02, 'log_output': True},
+        'gerador': {
+            'seed': seed, 'densidade_km2': densidade_km2, 'duracao_periodo_h': duracao,
+            'mix_perfis': {p: round(w, 6) for p, w in mix.items()},
+        },
+    }
+    with open(destino / 'config_geral.yaml', 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False, allow_unicode=True)
+
+    print(f"✅ {destino}: {num_links} links × {num_periodos} períodos × {num_tipos_pv} tipos PV "
+          f"({time.perf_counter() - t0:.1f}s)")
+    return destino
+
+
+def _ler_mix(itens) -> Optional[Dict[str, float]]:
+    if not itens:
+        return None
+    mix = {}
+    for item in itens:
+        nome, _, peso = item.partition('=')
+        mix[nome] = float(peso or 1.0)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerador de pastas de problema FCSA sintéticas')
+    parser.add_argument('destino', nargs='?', help='Pasta de destino (ex.: dados/problema2)')
+    parser.add_argument('--proximo', action='store_true', help='Usar a próxima pasta dados/problemaN livre')
+    parser.add_argument('--links', type=int, default=100)
+    parser.add_argument('--periodos', type=int, default=24)
+    parser.add_argument('--tipos-pv', type=int, default=3)
+    parser.add_argument('--densidade', type=float, default=0.25, help='Links por km²')
+    parser.add_argument('--mix', nargs='+', metavar='PERFIL=PESO',
+                        help=f"Mistura de perfis ({', '.join(PERFIS)})")
+    parser.add_argument('--raio', type=float, default=5.0, help='Raio de cobertura (km)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sobrescrever', action='store_true')
+    args = parser.parse_args()
+
+    if args.proximo:
+        destino = proxima_pasta(Path(__file__).resolve().parent)
+    elif args.destino:
+        destino = Path(args.destino)
+    else:
+        parser.error('informe o destino ou --proximo')
+
+    gerar_problema(destino, args.links, args.periodos, args.tipos_pv, args.densidade, _ler_mix(args.mix),
+                   args.seed, args.raio, args.sobrescrever)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
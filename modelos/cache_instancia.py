@@ -0,0 +1,277 @@
+"""
+Cache compilado das pastas de problema do FCSA
+Na primeira carga, os CSVs e o YAML de uma pasta são convertidos em arrays densos
+(alinhados aos links L, tipos K e períodos T) e gravados num único arquivo binário
+em <pasta>/.cache/instancia.bin; nas cargas seguintes os arrays são mapeados em
+memória (np.memmap), sem parse de CSV.
+
+Formato do arquivo:
+    MAGICO (8 bytes) | tamanho do cabeçalho (uint64 LE) | cabeçalho JSON | arrays
+O cabeçalho guarda a assinatura das fontes (mtime, tamanho e SHA-256 de cada
+arquivo), o config YAML e, para cada array, dtype, forma e deslocamento.
+
+Invalidação: o cache vale se mtime e tamanho de todas as fontes coincidem; se
+apenas o mtime mudou (ex.: checkout), o SHA-256 decide e, se coincidir, o cabeçalho é
+regravado com os novos mtimes (as cargas seguintes voltam a dispensar o SHA-256).
+
+Instâncias sem pasta de origem (ex.: montadas a partir de dicionários) usam o mesmo
+formato via gravar_arquivo/carregar_arquivo.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+MAGICO = b'FCSAINS1'
+ALINHAMENTO = 64
+ARQUIVO_CACHE = Path('.cache') / 'instancia.bin'
+# Alterar ao mudar o conteúdo ou o layout dos arrays
+VERSAO_FORMATO = 1
+
+FONTES = ('config_geral.yaml', 'links.csv', 'custos_estacoes.csv', 'custos_carports_pv.csv',
+          'tarifas_energia.csv', 'demanda_energia.csv', 'irradiacao_solar.csv',
+          'parametros_transporte.csv', 'areas_disponiveis.csv')
+# Períodos quando o config não informa dimensoes.num_periodos
+NUM_PERIODOS = 24
+
+
+def _sha256(caminho: Path) -> str:
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def assinatura_fontes(pasta: Path) -> Dict[str, list]:
+    """{arquivo: [mtime_ns, tamanho, sha256]} das fontes da pasta"""
+    assinatura = {}
+    for nome in FONTES:
+        st = (pasta / nome).stat()
+        assinatura[nome] = [st.st_mtime_ns, st.st_size, _sha256(pasta / nome)]
+    return assinatura
+
+
+def _fontes_validas(pasta: Path, gravadas: Dict[str, list]) -> Optional[Dict[str, list]]:
+    """Assinatura atual (mtimes atualizados) se as fontes coincidem com as gravadas; senão None"""
+    if sorted(gravadas) != sorted(FONTES):
+        return None
+    atual = {}
+    for nome, (mtime, tamanho, sha) in gravadas.items():
+        st = (pasta / nome).stat()
+        if st.st_size != tamanho:
+            return None
+        if st.st_mtime_ns != mtime and _sha256(pasta / nome) != sha:
+            return None
+        atual[nome] = [st.st_mtime_ns, tamanho, sha]
+    return atual
+
+
+def _amostra(itens, n: int = 10) -> str:
+    """Até n itens para mensagens de erro (com o total se houver mais)"""
+    itens = list(itens)
+    texto = ', '.join(map(str, itens[:n]))
+    return texto if len(itens) <= n else f"{texto}, ... ({len(itens)} no total)"
+
+
+def ler_pasta(pasta: Path) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Lê config e CSVs da pasta e monta os arrays densos
+
+    Returns:
+        (config, arrays): config YAML e arrays alinhados a L (links.csv), K
+        (custos_carports_pv.csv) e T = 0..n-1, com n = dimensoes.num_periodos do
+        config (padrão NUM_PERIODOS)
+
+    Raises:
+        ValueError: link sem linha nos CSVs por link, ou (link, período) de L × T
+                    ausente, repetido ou desconhecido nos CSVs por link e período
+    """
+    with open(pasta / 'config_geral.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    links = pd.read_csv(pasta / 'links.csv')
+    custos_est = pd.read_csv(pasta / 'custos_estacoes.csv')
+    custos_pv = pd.read_csv(pasta / 'custos_carports_pv.csv')
+    tarifas = pd.read_csv(pasta / 'tarifas_energia.csv')
+    demanda = pd.read_csv(pasta / 'demanda_energia.csv')
+    irradiacao = pd.read_csv(pasta / 'irradiacao_solar.csv')
+    transporte = pd.read_csv(pasta / 'parametros_transporte.csv')
+    areas = pd.read_csv(pasta / 'areas_disponiveis.csv')
+
+    L = links['link_id'].to_numpy()
+    K = custos_pv['tipo_pv'].to_numpy()
+    num_periodos = int((config.get('dimensoes') or {}).get('num_periodos') or NUM_PERIODOS)
+    T = np.arange(num_periodos)
+
+    def por_link(df: pd.DataFrame, coluna: str, arquivo: str) -> np.ndarray:
+        ausentes = L[~pd.Index(L).isin(df['link_id'])]
+        if len(ausentes):
+            raise ValueError(f"{arquivo}: link_id ausentes: {_amostra(ausentes)}")
+        return df.set_index('link_id')[coluna].reindex(L).to_numpy()
+
+    def por_link_periodo(df: pd.DataFrame, coluna: str, arquivo: str) -> np.ndarray:
+        # Cada (l, t) de L × T deve aparecer exatamente uma vez
+        pos_l = pd.Index(L).get_indexer(df['link_id'])
+        t = df['periodo'].to_numpy()
+        if (pos_l < 0).any():
+            raise ValueError(f"{arquivo}: link_id fora de links.csv: {_amostra(df['link_id'][pos_l < 0].unique())}")
+        fora = (t < 0) | (t >= num_periodos)
+        if fora.any():
+            raise ValueError(f"{arquivo}: períodos fora de 0..{num_periodos - 1}: {_amostra(np.unique(t[fora]))}")
+        contagem = np.zeros((len(L), num_periodos), dtype=int)
+        np.add.at(contagem, (pos_l, t), 1)
+        for condicao, descricao in ((contagem == 0, 'ausentes'), (contagem > 1, 'repetidos')):
+            if condicao.any():
+                l, p = np.nonzero(condicao)
+                raise ValueError(f"{arquivo}: (link_id, periodo) {descricao}: "
+                                 f"{_amostra(list(zip(L[l].tolist(), p.tolist())))}")
+        mat = np.zeros((len(L), num_periodos))
+        mat[pos_l, t] = df[coluna].to_numpy(dtype=float)
+        return mat
+
+    arrays = {
+        'L': L, 'K': K, 'T': T,
+        'c_CS': por_link(custos_est, 'custo_instalacao_reais', 'custos_estacoes.csv'),
+        'cp': por_link(areas, 'area_disponivel_m2', 'areas_disponiveis.csv'),
+        'rho': por_link(transporte, 'fluxo_agregado_veiculos_dia', 'parametros_transporte.csv'),
+        'beta': por_link(transporte, 'fator_beneficio', 'parametros_transporte.csv'),
+        'c_PV': custos_pv['custo_instalacao_reais'].to_numpy(),
+        'P_k': custos_pv['potencia_kw'].to_numpy(),
+        'a_k': custos_pv['area_m2'].to_numpy(),
+        'periodos_tarifa': tarifas['periodo'].to_numpy(),
+        'c_e': tarifas['tarifa_reais_kwh'].to_numpy(),
+        'E_d': por_link_periodo(demanda, 'demanda_kwh', 'demanda_energia.csv'),
+        'sh': por_link_periodo(irradiacao, 'irradiacao_normalizada', 'irradiacao_solar.csv'),
+    }
+    # Colunas de links.csv (as textuais como unicode de largura fixa, mapeáveis)
+    for coluna in links.columns:
+        valores = links[coluna].to_numpy()
+        arrays[f'links.{coluna}'] = valores.astype(str) if valores.dtype == object else valores
+    return config, arrays
+
+
+def _gravar(caminho: Path, assinatura: Dict, config: Dict, arrays: Dict[str, np.ndarray]):
+    """Grava o cache de forma atômica (arquivo temporário + os.replace)"""
+    meta, deslocamento = {}, 0
+    for nome, v in arrays.items():
+        meta[nome] = {'dtype': v.dtype.str, 'forma': list(v.shape), 'deslocamento': deslocamento}
+        deslocamento += -(-v.nbytes // ALINHAMENTO) * ALINHAMENTO
+    cabecalho = json.dumps({'versao': VERSAO_FORMATO, 'fontes': assinatura, 'config': config,
+                            'arrays': meta}, default=str).encode('utf-8')
+    inicio = -(-(len(MAGICO) + 8 + len(cabecalho)) // ALINHAMENTO) * ALINHAMENTO
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=caminho.parent, suffix='.bin', delete=False) as f:
+        try:
+            f.write(MAGICO + struct.pack('<Q', len(cabecalho)) + cabecalho)
+            for nome, v in arrays.items():
+                f.seek(inicio + meta[nome]['deslocamento'])
+                f.write(np.ascontiguousarray(v).tobytes())
+            f.truncate(inicio + deslocamento)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, caminho)
+
+
+def _ler_cabecalho(caminho: Path) -> Optional[Tuple[Dict, int]]:
+    try:
+        with open(caminho, 'rb') as f:
+            if f.read(len(MAGICO)) != MAGICO:
+                return None
+            (tamanho,) = struct.unpack('<Q', f.read(8))
+            cabecalho = json.loads(f.read(tamanho).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+    inicio = -(-(len(MAGICO) + 8 + tamanho) // ALINHAMENTO) * ALINHAMENTO
+    return cabecalho, inicio
+
+
+def _mapear(caminho: Path, cabecalho: Dict, inicio: int) -> Dict[str, np.ndarray]:
+    """Arrays do cache como visões somente leitura de um único np.memmap do arquivo"""
+    dados = np.memmap(caminho, dtype=np.uint8, mode='r')
+    arrays = {}
+    for nome, m in cabecalho['arrays'].items():
+        dtype, forma = np.dtype(m['dtype']), tuple(m['forma'])
+        ini = inicio + m['deslocamento']
+        arrays[nome] = dados[ini:ini + dtype.itemsize * int(np.prod(forma))].view(dtype).reshape(forma)
+    return arrays
+
+
+def gravar_arquivo(caminho, config: Dict, arrays: Dict[str, np.ndarray]) -> Path:
+    """Grava uma instância compilada avulsa (sem pasta de origem) no formato do cache"""
+    caminho = Path(caminho)
+    _gravar(caminho, {}, config, arrays)
+    return caminho
+
+
+def carregar_arquivo(caminho) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Config e arrays (mapeados em memória) de um arquivo de instância compilada
+
+    Raises:
+        ValueError: arquivo inexistente, de outro formato ou de outra versão
+    """
+    caminho = Path(caminho)
+    lido = _ler_cabecalho(caminho)
+    if lido is None or lido[0].get('versao') != VERSAO_FORMATO:
+        raise ValueError(f"Arquivo de instância inválido: {caminho}")
+    cabecalho, inicio = lido
+    return cabecalho['config'], _mapear(caminho, cabecalho, inicio)
+
+
+def carregar_pasta(pasta, usar_cache: bool = True) -> Tuple[Dict, Dict[str, np.ndarray], str]:
+    """
+    Config e arrays densos de uma pasta de problema, usando o cache compilado
+
+    Args:
+        pasta: Pasta do problema
+        usar_cache: Se False, sempre lê os CSVs (e não grava cache)
+
+    Returns:
+        (config, arrays, origem): origem é 'cache' (arrays mapeados em memória),
+        'csv' (cache criado/atualizado) ou 'csv (sem cache)' (gravação impossível
+        ou cache desativado)
+    """
+    pasta = Path(pasta)
+    caminho = pasta / ARQUIVO_CACHE
+    if usar_cache and caminho.exists():
+        lido = _ler_cabecalho(caminho)
+        if lido is not None:
+            cabecalho, inicio = lido
+            try:
+                fontes = _fontes_validas(pasta, cabecalho['fontes']) \
+                    if cabecalho.get('versao') == VERSAO_FORMATO else None
+                if fontes is not None:
+                    arrays = _mapear(caminho, cabecalho, inicio)
+                    if fontes != cabecalho['fontes']:
+                        # Só mtimes mudaram (SHA-256 igual): regravar evita o re-hash a cada carga
+                        try:
+                            _gravar(caminho, fontes, cabecalho['config'], arrays)
+                        except OSError:
+                            pass
+                    return cabecalho['config'], arrays, 'cache'
+            except (OSError, KeyError, ValueError):
+                pass
+
+    if not usar_cache:
+        config, arrays = ler_pasta(pasta)
+        return config, arrays, 'csv (sem cache)'
+    # Assinatura antes da leitura: uma fonte alterada durante o parse invalida o cache
+    assinatura = assinatura_fontes(pasta)
+    config, arrays = ler_pasta(pasta)
+    try:
+        _gravar(caminho, assinatura, config, arrays)
+    except OSError:
+        return config, arrays, 'csv (sem cache)'
+    return config, arrays, 'csv'
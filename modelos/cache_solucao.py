@@ -0,0 +1,214 @@
+"""
+Cache de soluções do FCSA endereçado por conteúdo
+A chave é o SHA-256 de (assinatura da instância compilada, parâmetros do solver,
+versão do código): o mesmo problema resolvido com os mesmos parâmetros pela mesma
+versão dos modelos devolve a solução gravada, sem construir nem resolver o MILP.
+
+Cada entrada ocupa dois arquivos na pasta do cache:
+    <chave>.npz   vetor completo de valores e arrays por família (x, w, E, ... por (l,t))
+    <chave>.json  metadados (instância, parâmetros, versão) e o dict solucao sem arrays
+O .json é gravado por último (ambos de forma atômica) e marca a entrada como completa.
+
+Despejo LRU por tamanho: cada acerto atualiza o mtime da entrada; ao gravar, as
+entradas menos usadas recentemente são removidas até o total caber em tamanho_max_mb.
+
+Uso:
+    cache = CacheSolucoes()                   # .cache/solucoes na raiz do repositório
+    modelo.cache_solucoes = cache             # FCSA_MILP consulta/grava em resolver()
+    cache.invalidar(instancia='dados/problema1')
+    cache.limpar()
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modelos.telemetria import versao_codigo
+
+PASTA_PADRAO = Path(__file__).resolve().parent.parent / '.cache' / 'solucoes'
+# Alterar ao mudar o layout das entradas
+VERSAO_FORMATO = 1
+
+
+def chave_solucao(assinatura_instancia: str, parametros: Dict, versao: Optional[str] = None) -> str:
+    """SHA-256 de (instância, parâmetros do solver, versão do código e do formato)"""
+    conteudo = {
+        'instancia': assinatura_instancia,
+        'parametros': parametros,
+        'versao_codigo': versao or versao_codigo(),
+        'formato': VERSAO_FORMATO,
+    }
+    return hashlib.sha256(json.dumps(conteudo, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _para_json(v):
+    """Escalares NumPy → Python (json.dumps default)"""
+    if isinstance(v, np.generic):
+        return v.item()
+    raise TypeError(f"Tipo não serializável: {type(v).__name__}")
+
+
+def _gravar_atomico(caminho: Path, escrever):
+    with tempfile.NamedTemporaryFile(dir=caminho.parent, suffix=caminho.suffix, delete=False) as f:
+        try:
+            escrever(f)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, caminho)
+
+
+class CacheSolucoes:
+    """Soluções do FCSA em disco, com despejo LRU por tamanho"""
+
+    def __init__(self, pasta=None, tamanho_max_mb: float = 1024):
+        """
+        Args:
+            pasta: Pasta do cache (padrão: .cache/solucoes na raiz do repositório)
+            tamanho_max_mb: Tamanho máximo do cache; excedido, as entradas menos usadas
+                            recentemente são removidas
+        """
+        self.pasta = Path(pasta) if pasta is not None else PASTA_PADRAO
+        self.tamanho_max_mb = tamanho_max_mb
+
+    def _arquivos(self, chave: str) -> Tuple[Path, Path]:
+        return self.pasta / f'{chave}.json', self.pasta / f'{chave}.npz'
+
+    def obter(self, chave: str) -> Optional[Tuple[Dict, np.ndarray]]:
+        """
+        (solucao, valores) da entrada `chave`, ou None se ausente ou incompleta
+
+        solucao['arrays'] e valores são arrays somente leitura, como em FCSA_MILP.
+        """
+        meta, npz = self._arquivos(chave)
+        try:
+            with open(meta, 'r', encoding='utf-8') as f:
+                entrada = json.load(f)
+            with np.load(npz) as dados:
+                arrays = {nome: dados[nome] for nome in dados.files}
+        except (OSError, ValueError, KeyError):
+            return None
+        if entrada.get('formato') != VERSAO_FORMATO:
+            return None
+
+        for v in arrays.values():
+            v.flags.writeable = False
+        valores = arrays.pop('valores')
+        solucao = dict(entrada['solucao'])
+        solucao['carports_instalados'] = {l: k for l, k in solucao['carports_instalados']}
+        solucao['arrays'] = {nome[len('arrays.'):]: v for nome, v in arrays.items()}
+        # LRU: o acesso conta como uso recente
+        for caminho in (meta, npz):
+            try:
+                os.utime(caminho)
+            except OSError:
+                pass
+        return solucao, valores
+
+    def gravar(self, chave: str, solucao: Dict, valores: np.ndarray, instancia: Optional[str] = None,
+               parametros: Optional[Dict] = None) -> Path:
+        """
+        Grava a solução `chave` e aplica o despejo LRU
+
+        Args:
+            solucao: Dict solucao de FCSA_MILP (com 'arrays')
+            valores: Vetor completo de valores do solver
+            instancia: Rótulo da instância (ex.: pasta do problema), usado por invalidar
+            parametros: Parâmetros do solver que compõem a chave (apenas informativo)
+        """
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        meta, npz = self._arquivos(chave)
+
+        arrays = {f'arrays.{nome}': np.asarray(v) for nome, v in solucao.get('arrays', {}).items()}
+        _gravar_atomico(npz, lambda f: np.savez(f, valores=np.asarray(valores), **arrays))
+
+        sem_arrays = {k: v for k, v in solucao.items() if k != 'arrays'}
+        sem_arrays['carports_instalados'] = [[l, k] for l, k in solucao['carports_instalados'].items()]
+        entrada = {
+            'formato': VERSAO_FORMATO,
+            'chave': chave,
+            'data_hora': datetime.now().isoformat(timespec='seconds'),
+            'versao_codigo': versao_codigo(),
+            'instancia': instancia,
+            'parametros': parametros,
+            'solucao': sem_arrays,
+        }
+        texto = json.dumps(entrada, ensure_ascii=False, default=_para_json).encode('utf-8')
+        _gravar_atomico(meta, lambda f: f.write(texto))
+
+        self.despejar()
+        return meta
+
+    def entradas(self) -> List[Dict]:
+        """Entradas completas: chave, instancia, data_hora, tamanho_bytes e ultimo_uso (mtime)"""
+        if not self.pasta.exists():
+            return []
+        resultado = []
+        for meta in self.pasta.glob('*.json'):
+            npz = meta.with_suffix('.npz')
+            try:
+                with open(meta, 'r', encoding='utf-8') as f:
+                    entrada = json.load(f)
+                tamanho = meta.stat().st_size + npz.stat().st_size
+                ultimo_uso = meta.stat().st_mtime
+            except (OSError, ValueError):
+                continue
+            resultado.append({'chave': meta.stem, 'instancia': entrada.get('instancia'),
+                              'data_hora': entrada.get('data_hora'), 'tamanho_bytes': tamanho,
+                              'ultimo_uso': ultimo_uso})
+        return resultado
+
+    def tamanho_mb(self) -> float:
+        return sum(e['tamanho_bytes'] for e in self.entradas()) / 1e6
+
+    def despejar(self) -> int:
+        """Remove as entradas menos usadas recentemente até caber em tamanho_max_mb; retorna quantas"""
+        entradas = sorted(self.entradas(), key=lambda e: e['ultimo_uso'])
+        total = sum(e['tamanho_bytes'] for e in entradas)
+        removidas = 0
+        for e in entradas:
+            if total <= self.tamanho_max_mb * 1e6:
+                break
+            self._remover(e['chave'])
+            total -= e['tamanho_bytes']
+            removidas += 1
+        return removidas
+
+    def _remover(self, chave: str):
+        for caminho in self._arquivos(chave):
+            try:
+                caminho.unlink()
+            except FileNotFoundError:
+                pass
+
+    def invalidar(self, chave: Optional[str] = None, instancia: Optional[str] = None) -> int:
+        """
+        Remove a entrada `chave` e/ou todas as entradas da `instancia` (rótulo gravado)
+
+        Returns:
+            Número de entradas removidas
+        """
+        if chave is None and instancia is None:
+            raise ValueError("Informe chave ou instancia (ou use limpar)")
+        rotulos = {str(instancia), str(Path(instancia).resolve())} if instancia is not None else set()
+        alvo = [e['chave'] for e in self.entradas() if e['chave'] == chave or e['instancia'] in rotulos]
+        for c in alvo:
+            self._remover(c)
+        return len(alvo)
+
+    def limpar(self) -> int:
+        """Remove todas as entradas (e arquivos temporários órfãos)"""
+        entradas = self.entradas()
+        for e in entradas:
+            self._remover(e['chave'])
+        if self.pasta.exists():
+            for orfao in self.pasta.glob('tmp*'):
+                orfao.unlink(missing_ok=True)
+        return len(entradas)
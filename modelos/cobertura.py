@@ -0,0 +1,265 @@
+"""
+Subconjuntos de cobertura espacial (L_i) para o modelo FCSA
+Distâncias de Haversine vetorizadas e consulta por raio com índice de grade lat/lon,
+sem laço Python por par de links.
+
+L_i é representado como adjacência CSR sobre as posições dos links:
+    cobertores de i = indices[indptr[i]:indptr[i+1]], distâncias em distancias[...]
+com o próprio i primeiro (auto-cobertura) e os demais na ordem dos links.
+
+IndiceVizinhos guarda os vizinhos de cada link ordenados por distância, de modo que
+L_i para qualquer raio (até o do índice) sai por busca binária; o índice é persistido
+por problema, identificado pelo hash das coordenadas de links.csv.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+RAIO_TERRA_KM = 6371.0
+# Raio do índice de vizinhos persistido, relativo ao primeiro raio pedido
+FATOR_RAIO_INDICE = 2.0
+# Índices mantidos em memória (por hash das coordenadas) para reuso no mesmo processo
+MAX_INDICES_MEMORIA = 8
+
+_indices_memoria: 'OrderedDict[str, IndiceVizinhos]' = OrderedDict()
+_trava_memoria = threading.Lock()
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Distância de Haversine (km) entre arrays de coordenadas em graus (com broadcasting)"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _pares_grade(lat: np.ndarray, lon: np.ndarray, raio_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pares candidatos (i, j), i != j, em células vizinhas de uma grade lat/lon
+
+    A célula tem Δlat = raio/R e Δlon = 2·asin(sin(raio/2R)/cos φmax), limites exatos
+    da Haversine para pontos a até raio_km (φmax = maior |latitude|); assim todo par
+    dentro do raio está na mesma célula ou numa das 8 vizinhas. A grade não trata
+    o antimeridiano (±180°).
+    """
+    raio = max(raio_km, 1e-9) / RAIO_TERRA_KM
+    phi, lam = np.radians(lat), np.radians(lon)
+    cos_max = np.cos(np.abs(phi).max())
+    razao = np.sin(raio / 2) / cos_max if cos_max > 0 else np.inf
+    passo_lon = 2 * np.arcsin(razao) if razao < 1 else 2 * np.pi
+
+    celula_lat = np.floor(phi / raio).astype(np.int64)
+    celula_lon = np.floor(lam / passo_lon).astype(np.int64)
+    celula_lat -= celula_lat.min()
+    celula_lon -= celula_lon.min()
+    largura = int(celula_lon.max()) + 3
+
+    # Pontos ordenados por célula; cada célula vira uma faixa contígua
+    chave = celula_lat * largura + celula_lon
+    ordem = np.argsort(chave, kind='stable')
+    chave_ord = chave[ordem]
+
+    origens, destinos = [], []
+    for d_lat in (-1, 0, 1):
+        for d_lon in (-1, 0, 1):
+            alvo = chave + d_lat * largura + d_lon
+            ini = np.searchsorted(chave_ord, alvo, side='left')
+            fim = np.searchsorted(chave_ord, alvo, side='right')
+            tamanhos = fim - ini
+            i = np.repeat(np.arange(len(lat)), tamanhos)
+            deslocamento = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+            origens.append(i)
+            destinos.append(ordem[np.repeat(ini, tamanhos) + deslocamento])
+
+    i, j = np.concatenate(origens), np.concatenate(destinos)
+    fora = i != j
+    return i[fora], j[fora]
+
+
+class IndiceVizinhos:
+    """
+    Vizinhos de cada link ordenados por distância, até raio_max_km
+
+    Para qualquer raio <= raio_max_km, L_i é o prefixo de cada linha (busca binária
+    vetorizada), sem recalcular distâncias. O índice é identificado pela chave
+    (hash das coordenadas, ver chave_coordenadas) e pode ser persistido em NPZ.
+
+    Atributos (CSR sobre as posições dos links; o próprio link primeiro, depois
+    os vizinhos em ordem crescente de distância):
+        indptr, vizinhos, distancias
+    """
+
+    def __init__(self, chave: str, raio_max_km: float, indptr: np.ndarray,
+                 vizinhos: np.ndarray, distancias: np.ndarray):
+        self.chave = chave
+        self.raio_max_km = float(raio_max_km)
+        self.indptr = indptr
+        self.vizinhos = vizinhos
+        self.distancias = distancias
+        self._subconjuntos = {}
+
+    @classmethod
+    def construir(cls, lat: np.ndarray, lon: np.ndarray, raio_max_km: float, chave: str = '') -> 'IndiceVizinhos':
+        """Calcula os vizinhos até raio_max_km (grade lat/lon + Haversine vetorizada)"""
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        n = len(lat)
+
+        i, j = _pares_grade(lat, lon, raio_max_km)
+        dist = haversine_km(lat[i], lon[i], lat[j], lon[j])
+        dentro = dist <= raio_max_km
+        i = np.concatenate([np.arange(n), i[dentro]])
+        j = np.concatenate([np.arange(n), j[dentro]])
+        dist = np.concatenate([np.zeros(n), dist[dentro]])
+
+        # Próprio link primeiro (chave -1), depois distância crescente e posição
+        ordem = np.lexsort((j, np.where(i == j, -1.0, dist), i))
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(i, minlength=n))))
+        return cls(chave, raio_max_km, indptr, j[ordem], dist[ordem])
+
+    def subconjuntos(self, raio_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        L_i para raio_km <= raio_max_km como CSR (indptr, indices, distancias),
+        com auto-cobertura primeiro e os demais na ordem dos links
+        """
+        if raio_km > self.raio_max_km:
+            raise ValueError(f"Raio {raio_km} km maior que o do índice ({self.raio_max_km} km)")
+        if raio_km not in self._subconjuntos:
+            self._subconjuntos[raio_km] = self._calcular_subconjuntos(raio_km)
+        return self._subconjuntos[raio_km]
+
+    def _calcular_subconjuntos(self, raio_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+
+        # Busca binária simultânea em todas as linhas: primeiro vizinho com distância > raio
+        inicio = self.indptr[:-1]
+        lo, hi = inicio + 1, self.indptr[1:].copy()
+        ativo = lo < hi
+        while ativo.any():
+            meio = (lo + hi) // 2
+            cabe = np.zeros(len(lo), dtype=bool)
+            cabe[ativo] = self.distancias[meio[ativo]] <= raio_km
+            lo = np.where(ativo & cabe, meio + 1, lo)
+            hi = np.where(ativo & ~cabe, meio, hi)
+            ativo = lo < hi
+
+        tamanhos = lo - inicio
+        linhas = np.repeat(np.arange(len(tamanhos)), tamanhos)
+        deslocamento = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+        pos = np.repeat(inicio, tamanhos) + deslocamento
+        j = self.vizinhos[pos]
+        ordem = np.lexsort((j, j != linhas, linhas))
+        indptr = np.concatenate(([0], np.cumsum(tamanhos)))
+        resultado = (indptr, j[ordem], self.distancias[pos][ordem])
+        for v in resultado:
+            v.setflags(write=False)  # compartilhados entre modelos pelo cache em memória
+        return resultado
+
+    def salvar(self, caminho: Path):
+        """Grava o índice em NPZ de forma atômica (arquivo temporário + os.replace)"""
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=caminho.parent, suffix='.npz', delete=False) as f:
+            try:
+                np.savez(f, chave=np.array(self.chave), raio_max_km=np.array(self.raio_max_km),
+                         indptr=self.indptr, vizinhos=self.vizinhos, distancias=self.distancias)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, caminho)
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> Optional['IndiceVizinhos']:
+        """Lê um índice gravado por salvar(); None se ausente ou ilegível"""
+        try:
+            with np.load(caminho) as d:
+                return cls(str(d['chave']), float(d['raio_max_km']), d['indptr'], d['vizinhos'], d['distancias'])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+
+def chave_coordenadas(ids, lat, lon) -> str:
+    """Hash (SHA-256) dos ids e coordenadas dos links, na ordem dada"""
+    h = hashlib.sha256()
+    for v in (np.asarray(ids, dtype=np.int64), np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)):
+        h.update(np.ascontiguousarray(v).tobytes())
+    return h.hexdigest()
+
+
+def obter_indice_vizinhos(pasta_cache: Optional[Path], ids, lat, lon,
+                          raio_km: float) -> Tuple[IndiceVizinhos, str]:
+    """
+    Índice de vizinhos que atende raio_km, reutilizando o já calculado
+
+    O índice é identificado pelo hash das coordenadas, logo serve a qualquer raio até
+    o seu raio_max_km. A busca é feita primeiro em memória (últimos MAX_INDICES_MEMORIA
+    índices do processo, com os L_i já extraídos por raio) e depois em pasta_cache.
+    Se não existir (ou o raio for maior), é recalculado com
+    raio_max_km = FATOR_RAIO_INDICE·raio_km e regravado (substituindo índices de
+    coordenadas antigas); falhas de gravação (ex.: pasta somente leitura) são
+    ignoradas e o índice fica só em memória.
+
+    Returns:
+        (índice, origem): origem é 'memória', 'disco' ou 'calculado'
+    """
+    chave = chave_coordenadas(ids, lat, lon)
+    with _trava_memoria:
+        anterior = _indices_memoria.get(chave)
+        if anterior is not None:
+            _indices_memoria.move_to_end(chave)
+            if anterior.raio_max_km >= raio_km:
+                return anterior, 'memória'
+
+    caminho = Path(pasta_cache) / f'vizinhos_{chave[:16]}.npz' if pasta_cache else None
+    if anterior is None and caminho and caminho.exists():
+        anterior = IndiceVizinhos.carregar(caminho)
+        if anterior is not None and anterior.chave != chave:
+            anterior = None
+        if anterior is not None and anterior.raio_max_km >= raio_km:
+            _guardar_em_memoria(anterior)
+            return anterior, 'disco'
+
+    raio_max = max(raio_km * FATOR_RAIO_INDICE, anterior.raio_max_km if anterior else 0.0)
+    indice = IndiceVizinhos.construir(lat, lon, raio_max, chave)
+    _guardar_em_memoria(indice)
+    if caminho:
+        try:
+            indice.salvar(caminho)
+            # Índices de coordenadas antigas da mesma pasta não serão mais usados
+            for antigo in caminho.parent.glob('vizinhos_*.npz'):
+                if antigo != caminho:
+                    antigo.unlink(missing_ok=True)
+        except OSError:
+            pass
+    return indice, 'calculado'
+
+
+def _guardar_em_memoria(indice: IndiceVizinhos):
+    with _trava_memoria:
+        _indices_memoria[indice.chave] = indice
+        _indices_memoria.move_to_end(indice.chave)
+        while len(_indices_memoria) > MAX_INDICES_MEMORIA:
+            _indices_memoria.popitem(last=False)
+
+
+def subconjuntos_cobertura(lat: np.ndarray, lon: np.ndarray,
+                           raio_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    L_i de todos os links como CSR: j cobre i se haversine(i, j) <= raio_km
+
+    Args:
+        lat, lon: Coordenadas dos links (graus), na ordem dos links
+        raio_km: Raio de cobertura
+
+    Returns:
+        (indptr, indices, distancias): adjacência CSR sobre as posições dos links,
+        com auto-cobertura primeiro e distâncias em km
+    """
+    return IndiceVizinhos.construir(lat, lon, raio_km).subconjuntos(raio_km)
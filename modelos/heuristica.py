@@ -0,0 +1,210 @@
+"""
+Heurística construtiva do FCSA (gulosa + arredondamento de LP), sem solver MIP
+Gera em milissegundos um plano viável no modelo completo (R0-R12), usado como modo
+de solução independente (FCSA_MILP.resolver(metodo='heuristico')) ou como MIP start
+(inicio_passo2='heuristica', FCSA_MILP.valores_heuristicos):
+    1. Estações: set cover ponderado guloso sobre L_i (razão links descobertos / ρβ),
+       opcionalmente guiado pela relaxação linear, seguido da remoção de redundantes
+    2. Carports: por link, o tipo que cabe na área com maior índice de retorno
+       (economia em VP / custo do carport), se > 1, avaliado em lote para todos (l, k)
+    3. Operação: com x e w fixos, despacho de custo mínimo em forma fechada
+       (excedente PV exportado, créditos NM alocados aos períodos de maior tarifa)
+
+As funções operam sobre os arrays de parâmetros do FCSA_MILP (E_d, sh, P_k, ...) e
+sobre a adjacência de cobertura em CSR (indptr, indices), sem dependência do modelo.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def _transpor(indptr: np.ndarray, indices: np.ndarray, n: int):
+    """CSR transposto: para cada cobertor j, as linhas (links) i com j ∈ L_i"""
+    linhas = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    ordem = np.argsort(indices, kind='stable')
+    col_ptr = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=n))))
+    return linhas, col_ptr, linhas[ordem]
+
+
+def _posicoes(indptr: np.ndarray, linhas: np.ndarray) -> np.ndarray:
+    """Posições em indices das entradas das linhas informadas (concatenadas)"""
+    inicio = indptr[linhas]
+    tamanhos = indptr[linhas + 1] - inicio
+    deslocamento = np.repeat(inicio - np.concatenate(([0], np.cumsum(tamanhos)[:-1])), tamanhos)
+    return deslocamento + np.arange(tamanhos.sum())
+
+
+def cobertura_gulosa(indptr: np.ndarray, indices: np.ndarray, custos: np.ndarray,
+                     min_estacoes: int = 0, inicial: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Set cover ponderado guloso: Σ_{j ∈ L_i} x_j >= 1 para toda linha i, Σ x >= min_estacoes
+
+    A cada passo instala o cobertor com maior razão (linhas ainda descobertas que cobre)
+    / custo; os ganhos são atualizados incrementalmente pelas linhas recém-cobertas, de
+    modo que o custo total é O(nnz + passos·n). Linhas sem cobertor ficam descobertas.
+
+    Args:
+        indptr, indices: Adjacência L_i em CSR (linha i → cobertores j)
+        custos: Custo de cada cobertor (ρβ no passo 1)
+        min_estacoes: Mínimo de estações (completado com os de menor custo)
+        inicial: Seleção de partida (ex.: arredondamento do LP); None = vazia
+
+    Returns:
+        Vetor booleano x
+    """
+    n = len(custos)
+    linhas, col_ptr, col_linhas = _transpor(indptr, indices, n)
+    x = np.zeros(n, dtype=bool) if inicial is None else inicial.astype(bool).copy()
+    coberta = np.bincount(linhas, weights=x[indices], minlength=len(indptr) - 1) > 0
+    ganho = np.bincount(indices, weights=~coberta[linhas], minlength=n)
+    custo = np.maximum(custos, 1e-12)
+
+    while True:
+        j = int(np.argmax(ganho / custo))
+        if ganho[j] <= 0:
+            break
+        x[j] = True
+        novas = col_linhas[col_ptr[j]:col_ptr[j + 1]]
+        novas = novas[~coberta[novas]]
+        coberta[novas] = True
+        ganho -= np.bincount(indices[_posicoes(indptr, novas)], minlength=n)
+
+    faltam = min_estacoes - int(x.sum())
+    if faltam > 0:
+        livres = np.flatnonzero(~x)
+        x[livres[np.argsort(custos[livres], kind='stable')[:faltam]]] = True
+    return x
+
+
+def remover_redundantes(x: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                        ordem: np.ndarray, min_estacoes: int = 0) -> np.ndarray:
+    """
+    Retira, na ordem dada, as estações cujas linhas continuam cobertas sem elas
+
+    Args:
+        x: Seleção viável (booleana)
+        ordem: Cobertores na ordem de tentativa de remoção (ex.: custo decrescente)
+
+    Returns:
+        Nova seleção (cada linha coberta por pelo menos um cobertor, Σ x >= min_estacoes)
+    """
+    n = len(x)
+    linhas, col_ptr, col_linhas = _transpor(indptr, indices, n)
+    x = x.astype(bool).copy()
+    contagem = np.bincount(linhas, weights=x[indices], minlength=len(indptr) - 1)
+    total = int(x.sum())
+    for j in ordem:
+        if total <= min_estacoes:
+            break
+        if not x[j]:
+            continue
+        cobertas = col_linhas[col_ptr[j]:col_ptr[j + 1]]
+        if (contagem[cobertas] >= 2).all():
+            x[j] = False
+            contagem[cobertas] -= 1
+            total -= 1
+    return x
+
+
+def arredondar_lp(x_lp: np.ndarray, indptr: np.ndarray, indices: np.ndarray, custos: np.ndarray,
+                  min_estacoes: int = 0) -> np.ndarray:
+    """
+    Arredondamento da relaxação linear do set cover
+
+    Instala os cobertores com x_lp >= 1/2, completa a cobertura com a gulosa e remove
+    redundantes começando pelos de menor x_lp (e, em empate, maior custo).
+    """
+    x = cobertura_gulosa(indptr, indices, custos, min_estacoes, inicial=x_lp >= 0.5 - 1e-9)
+    ordem = np.lexsort((-custos, x_lp))
+    return remover_redundantes(x, indptr, indices, ordem, min_estacoes)
+
+
+def escolher_carports(x: np.ndarray, E_d: np.ndarray, sh: np.ndarray, P_k: np.ndarray, a_k: np.ndarray,
+                      c_PV: np.ndarray, area: np.ndarray, c_e: np.ndarray, fator_vp: float,
+                      valor_excedente: float = 0.0) -> np.ndarray:
+    """
+    Um carport por link com estação: o tipo de maior índice de retorno, se maior que 1
+
+    Para cada (l, k) com a_k <= área_l, a energia PV P_k·sh[l,t] abate a demanda do
+    próprio período (autoconsumo, valorado pela tarifa c_e[t]) e o excedente vale
+    valor_excedente por kWh (créditos NM); retorno = fator_vp·economia / c_PV[k].
+    Entre os tipos com retorno > 1 (benefício líquido positivo), escolhe o de maior
+    retorno por real investido, e não o de maior benefício absoluto.
+
+    Returns:
+        Matriz booleana w (|L|, |K|), com no máximo um tipo por link e só onde x = 1
+    """
+    nL, nK = len(x), len(P_k)
+    w = np.zeros((nL, nK), dtype=bool)
+    sel = np.flatnonzero(x)
+    if len(sel) == 0 or nK == 0:
+        return w
+    E_pv = sh[sel, :, None] * P_k[None, None, :]
+    auto = np.minimum(E_pv, E_d[sel, :, None])
+    economia = np.einsum('ltk,t->lk', auto, c_e) + valor_excedente * (E_pv - auto).sum(axis=1)
+    valor = fator_vp * economia
+    custo = np.broadcast_to(c_PV[None, :], valor.shape)
+    retorno = np.divide(valor, custo, out=np.where(valor > 0, np.inf, 0.0), where=custo > 0)
+    retorno[a_k[None, :] > area[sel, None]] = -np.inf
+    k = retorno.argmax(axis=1)
+    instalar = retorno[np.arange(len(sel)), k] > 1
+    w[sel[instalar], k[instalar]] = True
+    return w
+
+
+def alocar_creditos(exportado: np.ndarray, falta: np.ndarray, c_e: np.ndarray) -> np.ndarray:
+    """
+    Importação NM ótima por período dada a exportação e a demanda líquida
+
+    Crédito exportado em r só pode ser usado em t > r (R6): Σ_{r<=s} uso[r] <=
+    Σ_{r<s} exportado[r] para todo s, com 0 <= uso[t] <= falta[t]. As restrições sobre
+    prefixos formam um polimatroide, logo alocar o máximo possível aos períodos em
+    ordem decrescente de tarifa maximiza Σ c_e·uso.
+    """
+    uso = np.zeros(len(falta))
+    if not (exportado > 0).any():
+        return uso
+    folga = np.concatenate(([0.0], np.cumsum(exportado)[:-1]))
+    for t in np.argsort(-c_e, kind='stable'):
+        if falta[t] <= 0:
+            continue
+        q = min(falta[t], folga[t:].min())
+        if q > 0:
+            uso[t] = q
+            folga[t:] -= q
+    return uso
+
+
+def despachar(x: np.ndarray, w: np.ndarray, E_d: np.ndarray, sh: np.ndarray, P_k: np.ndarray,
+              c_e: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Operação de custo mínimo com estações x e carports w fixos
+
+    Com E >= 0 no balanço R4 e E_plus_nm <= E_lot (R9), todo excedente PV é exportado;
+    nos links em déficit, a importação NM (alocar_creditos) é repartida em proporção ao
+    déficit e o restante é comprado da rede.
+
+    Returns:
+        Arrays por família com as formas de FCSA_MILP._idx (exceto x e w)
+    """
+    E_d_eff = E_d * x[:, None]
+    E_pv = sh * (w.astype(float) @ P_k)[:, None]
+    saldo = E_pv - E_d_eff
+    E_lot = np.maximum(saldo, 0.0)
+    deficit = np.maximum(-saldo, 0.0)
+    exportado = E_lot.sum(axis=0)
+    falta = deficit.sum(axis=0)
+    uso = alocar_creditos(exportado, falta, c_e)
+    fracao = np.divide(uso, falta, out=np.zeros_like(uso), where=falta > 0)
+    E_minus_nm = deficit * fracao[None, :]
+    return {
+        'E': deficit - E_minus_nm,
+        'E_pv': E_pv,
+        'E_minus_nm': E_minus_nm,
+        'E_plus_nm': E_lot,
+        'E_lot': E_lot,
+        'E_nm': np.cumsum(exportado - uso),
+        'E_d_eff': E_d_eff,
+        'x_aux': (saldo > 0).astype(float),
+    }
@@ -0,0 +1,210 @@
+"""
+Instância compilada do problema FCSA
+Parâmetros em arrays NumPy densos alinhados aos conjuntos L (links), T (períodos) e
+K (tipos de carport), com mapas id ↔ posição e visões compatíveis com dicionário
+(ex.: instancia.visao('E_d')[(l, t)]) para o código que usa a API de dicionários.
+
+Carregadores (todos produzem o mesmo conjunto de arrays e o mesmo config):
+    FCSAInstance.de_pasta(pasta)         CSVs + YAML de uma pasta de problema (com cache)
+    FCSAInstance.de_dict(L, T, K, params) estrutura de dicionários de dados/dados_fcsa_sintetico.py
+    FCSAInstance.de_arquivo(caminho)     arquivo compilado gravado por FCSAInstance.salvar
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modelos.cache_instancia import carregar_arquivo, carregar_pasta, gravar_arquivo
+
+
+class VisaoDict(Mapping):
+    """
+    Dicionário somente leitura sobre um array denso
+
+    Chaves são ids (arrays 1D) ou tuplas de ids (arrays 2D, ex. (link, período));
+    valores são escalares Python (int/float conforme o dtype do array).
+    """
+
+    def __init__(self, valores: np.ndarray, chaves: Sequence[Sequence], posicoes: Sequence[Dict]):
+        self._valores = valores
+        self._chaves = chaves
+        self._posicoes = posicoes
+
+    def _indice(self, chave):
+        if len(self._posicoes) == 1:
+            return self._posicoes[0][chave]
+        if not isinstance(chave, tuple) or len(chave) != len(self._posicoes):
+            raise KeyError(chave)
+        return tuple(pos[c] for pos, c in zip(self._posicoes, chave))
+
+    def __getitem__(self, chave):
+        try:
+            indice = self._indice(chave)
+        except (KeyError, TypeError):
+            raise KeyError(chave) from None
+        return self._valores[indice].item()
+
+    def __iter__(self) -> Iterator:
+        if len(self._chaves) == 1:
+            return iter(self._chaves[0])
+        return ((a, b) for a in self._chaves[0] for b in self._chaves[1])
+
+    def __len__(self) -> int:
+        return int(np.prod([len(c) for c in self._chaves]))
+
+    def values(self):
+        return self._valores.ravel().tolist()
+
+    def __repr__(self) -> str:
+        return f"VisaoDict({len(self)} itens)"
+
+
+class FCSAInstance:
+    """
+    Dados de um problema FCSA em arrays densos
+
+    Atributos:
+        L, T, K:          Ids de links, períodos e tipos de carport (listas)
+        pos_L, pos_T, pos_K: Mapas id → posição nos arrays
+        arrays:           {nome: array} - por link (c_CS, cp, rho, beta), por tipo (c_PV,
+                          P_k, a_k), por (link, período) (E_d, sh) e tarifas (c_e sobre
+                          periodos_tarifa)
+        config:           Configuração YAML da pasta
+        df_links:         Tabela de links (id, nome, coordenadas, ...)
+        origem:           'cache', 'csv' ou 'csv (sem cache)' (ver carregar_pasta),
+                          'dicionários' ou 'arquivo'
+    """
+
+    # Nome do array → conjuntos que indexam seus eixos
+    EIXOS = {
+        'c_CS': ('L',), 'cp': ('L',), 'rho': ('L',), 'beta': ('L',),
+        'c_PV': ('K',), 'P_k': ('K',), 'a_k': ('K',),
+        'c_e': ('periodos_tarifa',),
+        'E_d': ('L', 'T'), 'sh': ('L', 'T'),
+    }
+
+    def __init__(self, config: Dict, arrays: Dict[str, np.ndarray], origem: str = ''):
+        self.config = config
+        self.arrays = arrays
+        self.origem = origem
+        self._assinatura = None
+
+        self.L: List[int] = arrays['L'].tolist()
+        self.T: List[int] = arrays['T'].tolist()
+        self.K: List[int] = arrays['K'].tolist()
+        self._conjuntos = {'L': self.L, 'T': self.T, 'K': self.K,
+                           'periodos_tarifa': arrays['periodos_tarifa'].tolist()}
+        self._posicoes = {nome: {v: p for p, v in enumerate(ids)} for nome, ids in self._conjuntos.items()}
+        self.pos_L, self.pos_T, self.pos_K = (self._posicoes[c] for c in ('L', 'T', 'K'))
+
+        self.df_links = pd.DataFrame({c[len('links.'):]: v for c, v in arrays.items() if c.startswith('links.')})
+
+    @classmethod
+    def de_pasta(cls, pasta, usar_cache: bool = True) -> 'FCSAInstance':
+        """Instância a partir de uma pasta de problema (via cache compilado, ver cache_instancia)"""
+        config, arrays, origem = carregar_pasta(Path(pasta), usar_cache=usar_cache)
+        return cls(config, arrays, origem)
+
+    @classmethod
+    def de_arquivo(cls, caminho) -> 'FCSAInstance':
+        """Instância a partir de um arquivo compilado (ver salvar), com os arrays mapeados em memória"""
+        config, arrays = carregar_arquivo(caminho)
+        return cls(config, arrays, 'arquivo')
+
+    @classmethod
+    def de_dict(cls, L: List[int], T: List[int], K: List[int], parametros: Dict) -> 'FCSAInstance':
+        """
+        Instância a partir da estrutura de dicionários de dados/dados_fcsa_sintetico.py
+
+        Args:
+            L, T, K: Ids de links, períodos e tipos de carport
+            parametros: {'c_CS_l', 'c_PV_k', 'c_e_t', 'P_k', 'sh_lt', 'a_k', 'cp_l', 'E_d_lt',
+                         'rho_l', 'beta_l', 'alpha', 'Delta_h', 'gamma', ...}; opcionais:
+                         'a' (1.0), 'h' (1), 'min_estacoes' (1), 'BIG_M' (None = calculado),
+                         'coordenadas_l' ({link: {'latitude', 'longitude'}}) e
+                         'raio_cobertura_km' (3.0). Sem coordenadas não há restrição de cobertura.
+        """
+        p = parametros
+        coordenadas = p.get('coordenadas_l')
+        config = {
+            'parametros_financeiros': {'alpha': p['alpha'], 'Delta_h': p['Delta_h'], 'h': p.get('h', 1)},
+            'parametros_otimizacao': {
+                'min_estacoes': p.get('min_estacoes', 1),
+                'BIG_M': p.get('BIG_M'),
+                'gamma': p['gamma'],
+                'raio_cobertura_km': p.get('raio_cobertura_km', 3.0) if coordenadas else None,
+            },
+            'parametros_area': {'a': p.get('a', 1.0)},
+            'solver': {'time_limit': 600, 'mip_gap': 0.01, 'log_output': True},
+        }
+
+        def por_id(d: Dict, ids: List) -> np.ndarray:
+            return np.array([d[i] for i in ids], dtype=float)
+
+        def por_link_periodo(d: Dict) -> np.ndarray:
+            return np.array([[d.get((l, t), 0) for t in T] for l in L], dtype=float).reshape(len(L), len(T))
+
+        arrays = {
+            'L': np.asarray(L), 'K': np.asarray(K), 'T': np.asarray(T),
+            'c_CS': por_id(p['c_CS_l'], L),
+            'cp': por_id(p['cp_l'], L),
+            'rho': por_id(p['rho_l'], L),
+            'beta': por_id(p['beta_l'], L),
+            'c_PV': por_id(p['c_PV_k'], K),
+            'P_k': por_id(p['P_k'], K),
+            'a_k': por_id(p['a_k'], K),
+            'periodos_tarifa': np.asarray(T),
+            'c_e': por_id(p['c_e_t'], T),
+            'E_d': por_link_periodo(p['E_d_lt']),
+            'sh': por_link_periodo(p['sh_lt']),
+            'links.link_id': np.asarray(L),
+        }
+        if coordenadas:
+            arrays['links.latitude'] = np.array([coordenadas[l]['latitude'] for l in L], dtype=float)
+            arrays['links.longitude'] = np.array([coordenadas[l]['longitude'] for l in L], dtype=float)
+        return cls(config, arrays, 'dicionários')
+
+    def salvar(self, caminho) -> Path:
+        """Grava a instância no formato compilado do cache (recarregável com de_arquivo)"""
+        return gravar_arquivo(caminho, self.config, self.arrays)
+
+    def assinatura(self) -> str:
+        """
+        SHA-256 do conteúdo da instância (config e arrays: nome, dtype, forma e bytes)
+
+        Independe da origem (pasta, cache, arquivo ou dicionários); a seção
+        'telemetria' do config, que não altera o problema, fica de fora.
+        """
+        if self._assinatura is None:
+            h = hashlib.sha256()
+            config = {k: v for k, v in self.config.items() if k != 'telemetria'}
+            h.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+            for nome in sorted(self.arrays):
+                v = np.ascontiguousarray(self.arrays[nome])
+                h.update(f'{nome}|{v.dtype.str}|{v.shape}'.encode('utf-8'))
+                h.update(v.reshape(-1).view(np.uint8))
+            self._assinatura = h.hexdigest()
+        return self._assinatura
+
+    @property
+    def tem_coordenadas(self) -> bool:
+        return 'links.latitude' in self.arrays and 'links.longitude' in self.arrays
+
+    def visao(self, nome: str) -> VisaoDict:
+        """Visão de dicionário do array `nome` (chaves: ids, ou tuplas de ids em 2D)"""
+        eixos = self.EIXOS[nome]
+        return VisaoDict(self.arrays[nome], [self._conjuntos[e] for e in eixos],
+                         [self._posicoes[e] for e in eixos])
+
+    def vetor(self, nome: str) -> np.ndarray:
+        """Array `nome` em float64 (visão do array do cache quando já é float64)"""
+        return np.asarray(self.arrays[nome], dtype=float)
+
+    def coordenadas(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(latitude, longitude) dos links na ordem de L"""
+        return self.vetor('links.latitude'), self.vetor('links.longitude')
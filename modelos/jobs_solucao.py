@@ -0,0 +1,472 @@
+"""
+Execução de otimizações FCSA em segundo plano
+Cada solicitação (pasta do problema + parâmetros do solver) vira um job com id
+próprio, executado num processo separado (multiprocessing 'spawn'), com no máximo
+max_processos jobs simultâneos; os demais aguardam na fila. Um processo por job
+permite cancelar um job em execução (terminate) sem afetar os outros.
+
+Licença e núcleos: max_cplex limita os jobs simultâneos com backend CPLEX (docplex ou
+cplex), que podem ser menos que max_processos (jobs HiGHS passam à frente na fila);
+cada job recebe threads = núcleos / max_processos, salvo se a solicitação informar.
+Solicitações idênticas (mesma pasta e parâmetros) a um job na fila ou em execução
+são unidas a ele (deduplicação), em vez de resolver o mesmo problema duas vezes.
+
+Estado, log e resultado de cada job ficam em <pasta>/<job_id>/:
+    estado.json     status, fase atual, incumbente/limitante/gap do solve corrente, tempos
+    log.txt         saída (print) do FCSA_MILP
+    progresso.jsonl andamento do solver (modelos.progresso), um registro por linha
+    resultado.pkl   {'solucao', 'valores', 'alternativas'} quando concluído
+parada_gap/parada_apos_s definem uma regra de parada antecipada (RegraParada).
+O processo filho atualiza estado.json a cada fase (observador de Telemetria) e a cada
+registro de progresso do solver, de modo
+que quem consulta (ex.: o dashboard Streamlit a cada rerun) vê o progresso sem
+bloquear. A fila avança quando o gerenciador é consultado (estado, listar, atualizar).
+
+Dashboard e serviço (servico_jobs.py) leem a mesma configuração (configuracao_jobs);
+com o serviço no ar, ClienteServicoJobs envia as solicitações a ele, de modo que há
+uma única fila e um único limite de processos e licenças CPLEX.
+
+Uso:
+    jobs = GerenciadorJobs(max_processos=2)
+    job_id = jobs.submeter('dados/problema1', backend='cplex', time_limit=900)
+    jobs.estado(job_id)            # {'status': 'executando', 'fase': 'passo2', ...}
+    jobs.cancelar(job_id)
+    modelo = jobs.modelo(job_id)   # FCSA_MILP com .solucao, quando 'concluido'
+"""
+
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from modelos.progresso import MonitorProgresso, RegraParada, ler_jsonl
+
+PASTA_PADRAO = Path(__file__).resolve().parent.parent / '.cache' / 'jobs'
+PORTA_PADRAO = 8765
+ESTADOS_FINAIS = ('concluido', 'falhou', 'cancelado')
+# Parâmetros aceitos por submeter (atributos do FCSA_MILP ou argumentos de resolver)
+PARAMETROS = ('backend', 'metodo', 'passo1', 'inicio_passo2', 'time_limit', 'mip_gap', 'threads', 'usar_cache',
+              'parada_gap', 'parada_apos_s', 'n_alternativas')
+# Backends que consomem licença CPLEX (o padrão de FCSA_MILP.resolver é 'docplex')
+BACKENDS_CPLEX = ('docplex', 'cplex')
+
+
+def configuracao_jobs() -> Dict:
+    """
+    Configuração comum ao serviço (servico_jobs.py) e ao dashboard, por variáveis de ambiente
+
+        FCSA_JOBS_PASTA     pasta dos jobs (padrão PASTA_PADRAO)
+        FCSA_MAX_PROCESSOS  jobs simultâneos (padrão 1)
+        FCSA_MAX_CPLEX      jobs CPLEX simultâneos (padrão = FCSA_MAX_PROCESSOS)
+        FCSA_THREADS_TOTAL  núcleos divididos entre os jobs (padrão os.cpu_count())
+        FCSA_JOBS_PORTA     porta do serviço HTTP (padrão PORTA_PADRAO)
+    """
+    def inteiro(nome: str, padrao: Optional[int] = None) -> Optional[int]:
+        valor = os.environ.get(nome)
+        return int(valor) if valor else padrao
+
+    return {
+        'pasta': Path(os.environ.get('FCSA_JOBS_PASTA') or PASTA_PADRAO),
+        'max_processos': inteiro('FCSA_MAX_PROCESSOS', 1),
+        'max_cplex': inteiro('FCSA_MAX_CPLEX'),
+        'threads_total': inteiro('FCSA_THREADS_TOTAL'),
+        'porta': inteiro('FCSA_JOBS_PORTA', PORTA_PADRAO),
+    }
+
+
+def _processo_vivo(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _agora() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _gravar_json(caminho: Path, dados: Dict):
+    """Gravação atômica (leitores nunca veem um arquivo pela metade)"""
+    with tempfile.NamedTemporaryFile('w', dir=caminho.parent, suffix='.json', delete=False,
+                                     encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, default=str)
+    os.replace(f.name, caminho)
+
+
+def _ler_json(caminho: Path) -> Optional[Dict]:
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def executar_job(pasta_job: str, pasta_problema: str, parametros: Dict):
+    """
+    Corpo do processo filho: resolve o problema e grava estado, log e resultado
+
+    Args:
+        pasta_job: Pasta do job (estado.json já criado pelo gerenciador)
+        pasta_problema: Pasta do problema FCSA
+        parametros: Ver PARAMETROS (ausentes = padrão do config/resolver)
+    """
+    from modelos.cache_solucao import CacheSolucoes
+    from modelos.modelo_Caio import FCSA_MILP
+
+    pasta_job = Path(pasta_job)
+    estado = _ler_json(pasta_job / 'estado.json') or {}
+
+    def atualizar(**campos):
+        estado.update(campos, atualizado=_agora())
+        _gravar_json(pasta_job / 'estado.json', estado)
+
+    def observar(evento: str, registro: Dict):
+        if evento == 'inicio':
+            atualizar(fase=registro['fase'])
+        elif registro.get('objetivo') is not None:
+            atualizar(fase_solver=registro['fase'], objetivo=registro['objetivo'], gap=registro.get('gap'))
+
+    def acompanhar(registro: Dict):
+        if registro['incumbente'] is not None:
+            atualizar(fase_solver=registro['fase'], objetivo=registro['incumbente'], gap=registro['gap'],
+                      limitante=registro['limitante'], nos=registro['nos'])
+
+    atualizar(status='executando', pid=os.getpid(), inicio=_agora(), fase='carga')
+    with open(pasta_job / 'log.txt', 'w', encoding='utf-8', buffering=1) as log:
+        # Processo dedicado: redireciona também os descritores 1 e 2 (log nativo do solver)
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        sys.stdout = sys.stderr = log
+        try:
+            modelo = FCSA_MILP(pasta_problema)
+            modelo.telemetria.observadores.append(observar)
+            for nome in ('time_limit', 'mip_gap', 'threads'):
+                if parametros.get(nome) is not None:
+                    setattr(modelo, nome, parametros[nome])
+            if parametros.get('usar_cache', True):
+                modelo.cache_solucoes = CacheSolucoes()
+            regras = ([RegraParada(parametros['parada_gap'], parametros.get('parada_apos_s') or 0.0)]
+                      if parametros.get('parada_gap') is not None else [])
+            modelo.progresso = MonitorProgresso([acompanhar], pasta_job / 'progresso.jsonl', regras)
+            argumentos = {nome: parametros[nome]
+                          for nome in ('backend', 'metodo', 'passo1', 'inicio_passo2', 'n_alternativas')
+                          if nome in parametros}
+            ok = modelo.resolver(**argumentos)
+        except Exception as e:
+            traceback.print_exc(file=log)
+            atualizar(status='falhou', fim=_agora(), erro=f'{type(e).__name__}: {e}')
+            return
+        if not ok:
+            atualizar(status='falhou', fim=_agora(), erro='sem solução viável')
+            return
+        with open(pasta_job / 'resultado.pkl', 'wb') as f:
+            pickle.dump({'solucao': modelo.solucao, 'valores': modelo._valores,
+                         'alternativas': modelo.alternativas}, f)
+        gap = modelo.solucao['gap_%'] / 100
+        atualizar(status='concluido', fim=_agora(), objetivo=modelo.solucao['valor_objetivo'],
+                  gap=gap if math.isfinite(gap) else None)
+
+
+class GerenciadorJobs:
+    """Fila de jobs de otimização executados em processos separados"""
+
+    def __init__(self, pasta=None, max_processos: int = 1, max_cplex: Optional[int] = None,
+                 threads_total: Optional[int] = None):
+        """
+        Args:
+            pasta: Pasta dos jobs (padrão: .cache/jobs na raiz do repositório)
+            max_processos: Máximo de jobs executando ao mesmo tempo
+            max_cplex: Máximo de jobs CPLEX simultâneos (licenças); None = max_processos
+            threads_total: Núcleos divididos entre os jobs (padrão: os.cpu_count())
+        """
+        self.pasta = Path(pasta) if pasta is not None else PASTA_PADRAO
+        self.max_processos = max_processos
+        self.max_cplex = max_processos if max_cplex is None else max_cplex
+        self.threads_por_job = max(1, (threads_total or os.cpu_count() or 1) // max_processos)
+        # job_id → (identidade, backend) dos jobs na fila ou em execução
+        self._ativos: Dict[str, tuple] = {}
+        # Solicitações unidas a cada job ativo (gravadas em estado.json quando o job termina)
+        self._submissoes: Dict[str, int] = {}
+        self._fila = deque()
+        self._processos: Dict[str, multiprocessing.Process] = {}
+        self._contexto = multiprocessing.get_context('spawn')
+        # Sessões Streamlit rodam em threads diferentes do mesmo processo
+        self._trava = threading.RLock()
+
+    def _estado_arquivo(self, job_id: str) -> Path:
+        return self.pasta / job_id / 'estado.json'
+
+    @staticmethod
+    def identidade(pasta_problema: str, **parametros) -> str:
+        """Chave de deduplicação: pasta (caminho absoluto) e parâmetros, exceto threads"""
+        conteudo = {'problema': str(Path(pasta_problema).resolve()),
+                    'parametros': {k: v for k, v in parametros.items() if k != 'threads'}}
+        return hashlib.sha256(json.dumps(conteudo, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def encontrar_ativo(self, pasta_problema: str, **parametros) -> Optional[str]:
+        """Id do job na fila ou em execução idêntico à solicitação (None se não houver)"""
+        identidade = self.identidade(pasta_problema, **parametros)
+        with self._trava:
+            return next((j for j, (ident, _) in self._ativos.items() if ident == identidade), None)
+
+    def submeter(self, pasta_problema: str, deduplicar: bool = True, **parametros) -> str:
+        """
+        Enfileira a otimização de `pasta_problema`; retorna o id do job
+
+        Com deduplicar=True, uma solicitação idêntica a um job na fila ou em execução
+        retorna o id desse job (estado['submissoes'] conta as solicitações unidas).
+        estado['problema'] guarda o caminho absoluto da pasta, como o serviço.
+        """
+        pasta_problema = str(Path(pasta_problema).resolve())
+        invalidos = set(parametros) - set(PARAMETROS)
+        if invalidos:
+            raise ValueError(f"Parâmetros inválidos: {', '.join(sorted(invalidos))} "
+                             f"(opções: {', '.join(PARAMETROS)})")
+        with self._trava:
+            existente = self.encontrar_ativo(pasta_problema, **parametros) if deduplicar else None
+            if existente is not None:
+                self._submissoes[existente] += 1
+                return existente
+
+            parametros.setdefault('threads', self.threads_por_job)
+            job_id = f"{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+            (self.pasta / job_id).mkdir(parents=True)
+            _gravar_json(self._estado_arquivo(job_id), {
+                'job_id': job_id, 'status': 'na_fila', 'problema': pasta_problema,
+                'parametros': parametros, 'submetido': _agora(), 'atualizado': _agora(), 'submissoes': 1,
+                'gerenciador': os.getpid(),
+            })
+            self._fila.append((job_id, pasta_problema, parametros))
+            self._submissoes[job_id] = 1
+            # A heurística não usa solver MIP nem licença CPLEX
+            licenca = None if parametros.get('metodo') == 'heuristico' else parametros.get('backend', 'docplex')
+            self._ativos[job_id] = (self.identidade(pasta_problema, **parametros), licenca)
+        self.atualizar()
+        return job_id
+
+    def _pode_iniciar(self, job_id: str) -> bool:
+        """Respeita max_cplex para jobs que consomem licença CPLEX"""
+        if self._ativos[job_id][1] not in BACKENDS_CPLEX:
+            return True
+        cplex = sum(self._ativos[j][1] in BACKENDS_CPLEX for j in self._processos)
+        return cplex < self.max_cplex
+
+    def atualizar(self):
+        """Recolhe processos encerrados e inicia jobs da fila até max_processos"""
+        with self._trava:
+            for job_id, processo in list(self._processos.items()):
+                if processo.is_alive():
+                    continue
+                processo.join()
+                del self._processos[job_id]
+                self._ativos.pop(job_id, None)
+                estado = _ler_json(self._estado_arquivo(job_id)) or {}
+                estado['submissoes'] = self._submissoes.pop(job_id, 1)
+                if estado.get('status') not in ESTADOS_FINAIS:
+                    # Processo morreu sem gravar o estado final (ex.: falta de memória)
+                    estado.update(status='falhou', fim=_agora(), atualizado=_agora(),
+                                  erro=f'processo encerrado (código {processo.exitcode})')
+                _gravar_json(self._estado_arquivo(job_id), estado)
+
+            for item in list(self._fila):
+                if len(self._processos) >= self.max_processos:
+                    break
+                job_id, pasta_problema, parametros = item
+                if not self._pode_iniciar(job_id):
+                    continue
+                self._fila.remove(item)
+                estado = _ler_json(self._estado_arquivo(job_id)) or {}
+                estado.update(status='executando', fase='inicio', atualizado=_agora())
+                _gravar_json(self._estado_arquivo(job_id), estado)
+                processo = self._contexto.Process(target=executar_job, daemon=True, name=f'fcsa-{job_id}',
+                                                  args=(str(self.pasta / job_id), pasta_problema, parametros))
+                processo.start()
+                self._processos[job_id] = processo
+
+    def estado(self, job_id: str) -> Optional[Dict]:
+        """Estado atual do job (None se desconhecido); inclui posicao_fila quando na fila"""
+        self.atualizar()
+        estado = _ler_json(self._estado_arquivo(job_id))
+        if estado is None:
+            return None
+        with self._trava:
+            ids = [j for j, _, _ in self._fila]
+            if job_id in self._submissoes:
+                estado['submissoes'] = self._submissoes[job_id]
+        if estado['status'] == 'na_fila' and job_id in ids:
+            estado['posicao_fila'] = ids.index(job_id) + 1
+        return estado
+
+    def listar(self) -> List[Dict]:
+        """Estados de todos os jobs da pasta, do mais recente ao mais antigo"""
+        self.atualizar()
+        if not self.pasta.exists():
+            return []
+        estados = [_ler_json(p / 'estado.json') for p in self.pasta.iterdir() if p.is_dir()]
+        return sorted((e for e in estados if e), key=lambda e: e['submetido'], reverse=True)
+
+    def cancelar(self, job_id: str) -> bool:
+        """Cancela um job na fila ou em execução; False se já finalizado ou desconhecido"""
+        with self._trava:
+            na_fila = [item for item in self._fila if item[0] == job_id]
+            for item in na_fila:
+                self._fila.remove(item)
+            processo = self._processos.pop(job_id, None)
+            if not na_fila and processo is None:
+                return False
+            self._ativos.pop(job_id, None)
+            submissoes = self._submissoes.pop(job_id, 1)
+            if processo is not None:
+                processo.terminate()
+                processo.join(timeout=10)
+            estado = _ler_json(self._estado_arquivo(job_id)) or {}
+            estado.update(status='cancelado', fim=_agora(), atualizado=_agora(), submissoes=submissoes)
+            _gravar_json(self._estado_arquivo(job_id), estado)
+        self.atualizar()
+        return True
+
+    def marcar_interrompidos(self) -> int:
+        """
+        Jobs da pasta não finalizados e sem processo neste gerenciador (ex.: de uma
+        execução anterior do serviço) passam a 'falhou'; retorna quantos. Jobs de outro
+        gerenciador ainda ativo na mesma pasta (ex.: o dashboard) são mantidos.
+        """
+        interrompidos = 0
+        for estado in self.listar():
+            with self._trava:
+                proprio = estado['job_id'] in self._ativos
+            outro = estado.get('gerenciador') not in (None, os.getpid()) and _processo_vivo(estado['gerenciador'])
+            if estado['status'] not in ESTADOS_FINAIS and not proprio and not outro:
+                estado.update(status='falhou', fim=_agora(), atualizado=_agora(),
+                              erro='interrompido (gerenciador reiniciado)')
+                _gravar_json(self._estado_arquivo(estado['job_id']), estado)
+                interrompidos += 1
+        return interrompidos
+
+    def resultado(self, job_id: str) -> Optional[Dict]:
+        """{'solucao', 'valores', 'alternativas'} de um job concluído (None caso contrário)"""
+        try:
+            with open(self.pasta / job_id / 'resultado.pkl', 'rb') as f:
+                return pickle.load(f)
+        except OSError:
+            return None
+
+    def modelo(self, job_id: str):
+        """FCSA_MILP do problema do job com a solução do job (sem resolver de novo)"""
+        from modelos.modelo_Caio import FCSA_MILP
+
+        estado, resultado = _ler_json(self._estado_arquivo(job_id)), self.resultado(job_id)
+        if estado is None or resultado is None:
+            return None
+        modelo = FCSA_MILP(estado['problema'])
+        modelo.solucao, modelo._valores = resultado['solucao'], resultado['valores']
+        modelo.alternativas = resultado.get('alternativas', [])
+        return modelo
+
+    def log(self, job_id: str, linhas: int = 20) -> str:
+        """Últimas linhas do log do job"""
+        try:
+            with open(self.pasta / job_id / 'log.txt', 'r', encoding='utf-8', errors='replace') as f:
+                return ''.join(deque(f, maxlen=linhas))
+        except OSError:
+            return ''
+
+    def progresso(self, job_id: str) -> List[Dict]:
+        """Registros de progresso do solver (incumbente, limitante, gap, nós) do job"""
+        return ler_jsonl(self.pasta / job_id / 'progresso.jsonl')
+
+    def aguardar(self, job_id: str, intervalo_s: float = 0.5, timeout_s: Optional[float] = None) -> Dict:
+        """Bloqueia até o job terminar (scripts e testes); retorna o estado final"""
+        inicio = time.monotonic()
+        while True:
+            estado = self.estado(job_id)
+            if estado is None or estado['status'] in ESTADOS_FINAIS:
+                return estado
+            if timeout_s is not None and time.monotonic() - inicio > timeout_s:
+                return estado
+            time.sleep(intervalo_s)
+
+    def limpar(self) -> int:
+        """Remove as pastas dos jobs finalizados; retorna quantas"""
+        removidos = 0
+        for estado in self.listar():
+            if estado['status'] in ESTADOS_FINAIS:
+                shutil.rmtree(self.pasta / estado['job_id'], ignore_errors=True)
+                removidos += 1
+        return removidos
+
+
+class ClienteServicoJobs(GerenciadorJobs):
+    """
+    Interface do GerenciadorJobs sobre o serviço HTTP (servico_jobs.py), com a fila do serviço
+
+    Submissão, estado, listagem e cancelamento vão ao serviço (limites de processos,
+    licenças CPLEX e núcleos aplicados numa fila única); log, progresso e resultado são
+    lidos da pasta de jobs do serviço (GET /config), sem transferir arrays por HTTP.
+    """
+
+    def __init__(self, porta: int = PORTA_PADRAO, timeout_s: float = 10.0):
+        self.url = f'http://127.0.0.1:{porta}'
+        self.timeout_s = timeout_s
+        _, config = self._requisitar('GET', '/config')
+        super().__init__(config['pasta'], max_processos=config['max_processos'], max_cplex=config['max_cplex'])
+
+    @staticmethod
+    def disponivel(porta: int = PORTA_PADRAO) -> bool:
+        """True se há um serviço de jobs respondendo na porta"""
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{porta}/config', timeout=0.5) as resposta:
+                return resposta.status == 200
+        except (OSError, ValueError):
+            return False
+
+    def _requisitar(self, metodo: str, rota: str, corpo=None):
+        """(código, resposta JSON); erros HTTP retornam o código e o corpo de erro"""
+        dados = json.dumps(corpo).encode('utf-8') if corpo is not None else None
+        pedido = urllib.request.Request(self.url + rota, data=dados, method=metodo,
+                                        headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(pedido, timeout=self.timeout_s) as resposta:
+                return resposta.status, json.loads(resposta.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read() or b'{}')
+
+    def atualizar(self):
+        """A fila avança no próprio serviço"""
+
+    def submeter(self, pasta_problema: str, deduplicar: bool = True, **parametros) -> str:
+        """Submete ao serviço (que sempre deduplica solicitações idênticas)"""
+        codigo, r = self._requisitar('POST', '/jobs', dict(parametros, problema=str(Path(pasta_problema).resolve())))
+        if codigo >= 400:
+            raise ValueError(r.get('erro', f'HTTP {codigo}'))
+        return r['job_id']
+
+    def estado(self, job_id: str) -> Optional[Dict]:
+        codigo, r = self._requisitar('GET', f'/jobs/{job_id}')
+        return r if codigo == 200 else None
+
+    def listar(self) -> List[Dict]:
+        return self._requisitar('GET', '/jobs')[1]
+
+    def cancelar(self, job_id: str) -> bool:
+        return self._requisitar('DELETE', f'/jobs/{job_id}')[0] == 200
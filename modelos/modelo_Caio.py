@@ -3,40 +3,119 @@ Modelo FCSA MILP
 Baseado na tese de Caio dos Santos
 """
 
+import math
+import os
+import tempfile
 import pandas as pd
-import yaml
 import numpy as np
 from pathlib import Path
 from docplex.mp.model import Model
+
+from modelos.cache_solucao import CacheSolucoes, chave_solucao
+from modelos.cobertura import obter_indice_vizinhos
+from modelos.heuristica import (arredondar_lp, cobertura_gulosa, despachar, escolher_carports,
+                                remover_redundantes)
+from modelos.instancia import FCSAInstance
+from modelos.presolve import Presolve, SolverReduzido
+from modelos.progresso import MonitorProgresso
+from modelos.solvers import BACKENDS, MatrizMILP, SolverDocplex, criar_solver
+from modelos.telemetria import Telemetria, medir_fase
 import time
-from typing import Dict, List, Tuple
-from math import radians, cos, sin, asin, sqrt
+from typing import Dict, List, Optional, Tuple
 
 
 class FCSA_MILP:
     """Modelo FCSA MILP para alocação de estações de recarga rápida com PV"""
     
-    def __init__(self, pasta_problema: str):
+    BACKENDS = BACKENDS
+    BINARIAS = ('x', 'w', 'x_aux')
+    INICIOS_PASSO2 = ('passo1', 'reparado', 'heuristica', None)
+    METODOS = ('lexicografico', 'ponderado', 'heuristico')
+    PASSOS1 = ('cobertura', 'completo')
+    # Linhas que apenas definem colunas eliminadas no presolve estrutural
+    DEFINICOES = ('R1a_demanda', 'R1b_demanda', 'R1c_demanda', 'R5_pv', 'R6_import_inicial', 'R8_lot')
+    # Linhas por (l,t) que se tornam triviais quando sh[l,t] = 0
+    LINHAS_NOITE = ('R5_pv', 'R8a_lin', 'R8b_lin', 'R8c_lin', 'R8_lot', 'R9_export')
+    TIPOS_BIG_M = ('local', 'global')
+    # Backends com pool de soluções (resolver com n_alternativas > 1)
+    BACKENDS_POOL = ('docplex', 'cplex')
+    FORMULACOES_R8 = ('big_m', 'sem_binarias')
+    # Subpasta (dentro da pasta do problema) para artefatos derivados reutilizáveis
+    PASTA_CACHE = '.cache'
+    
+    def __init__(self, pasta_problema: Optional[str] = None, salvar_matriz_cobertura: bool = False,
+                 usar_cache: bool = True, instancia: Optional[FCSAInstance] = None):
         """
         Inicializa modelo carregando dados da pasta do problema
         
         Args:
             pasta_problema: Caminho para pasta com arquivos do problema
                            Ex: 'dados/problema0'
+            salvar_matriz_cobertura: Exportar matriz_cobertura_calculada.csv na pasta do
+                                     problema (ver exportar_matriz_cobertura)
+            usar_cache: Usar o cache compilado da pasta (ver _carregar_dados)
+            instancia: Instância já carregada (ver de_instancia/de_dict); se informada,
+                       a pasta é usada apenas para os caches derivados
+        
+        Cada etapa é medida em self.telemetria (modelos.telemetria); a seção opcional
+        'telemetria' do config ({'json': arquivo, 'csv': log}) define onde resolver()
+        grava o relatório.
         """
-        self.pasta = Path(pasta_problema)
+        if pasta_problema is None and instancia is None:
+            raise ValueError("Informe pasta_problema ou instancia")
+        self.pasta = Path(pasta_problema) if pasta_problema is not None else None
+        self.usar_cache = usar_cache
+        self.instancia = instancia
+        self.telemetria = Telemetria({'instancia': str(self.pasta) if self.pasta else None})
         self._carregar_dados()
-        self._calcular_fator_vp()
+        with self.telemetria.fase('parametros'):
+            self._calcular_matrizes_parametros()
+            self._calcular_fator_vp()
         self._calcular_subconjuntos_cobertura()
         self._calcular_big_m()
+        if salvar_matriz_cobertura:
+            self.exportar_matriz_cobertura()
         self.modelo = None
+        self.backend = None
         self.solucao = {}
-        
+        self._valores = None
+        self.tipo_big_m = 'local'
+        self.formulacao_r8 = 'big_m'
+        # Cache de soluções (modelos.cache_solucao); None = sempre resolve
+        self.cache_solucoes: Optional[CacheSolucoes] = None
+        # Progresso dos solves MIP em tempo real e paradas antecipadas (modelos.progresso)
+        self.progresso: Optional[MonitorProgresso] = None
+        # Planos distintos do pool de soluções, o ótimo primeiro (resolver com n_alternativas > 1)
+        self.alternativas: List[Dict] = []
+        
+    @classmethod
+    def de_instancia(cls, instancia: FCSAInstance, pasta_problema: Optional[str] = None) -> 'FCSA_MILP':
+        """Modelo sobre uma instância já compilada (de pasta, de dicionários ou de arquivo)"""
+        return cls(pasta_problema, instancia=instancia)
+        
+    @classmethod
+    def de_dict(cls, L: List[int], T: List[int], K: List[int], parametros: Dict) -> 'FCSA_MILP':
+        """Modelo a partir da estrutura de dicionários de dados/dados_fcsa_sintetico.py (ver FCSAInstance.de_dict)"""
+        return cls.de_instancia(FCSAInstance.de_dict(L, T, K, parametros))
+        
+    @medir_fase('carga')
     def _carregar_dados(self):
-        """Carrega todos os arquivos de dados"""
-        # Config geral
-        with open(self.pasta / 'config_geral.yaml', 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        """
+        Carrega todos os arquivos de dados
+        
+        Os CSVs e o YAML são compilados em arrays densos (self.instancia, ver
+        modelos.instancia) e mantidos no cache da pasta; nas cargas seguintes os
+        arrays são mapeados em memória. Os parâmetros indexados (c_CS, E_d, sh, ...)
+        são visões de dicionário sobre esses arrays, sem cópia. Uma instância passada
+        ao construtor (ex.: de dicionários) é usada diretamente.
+        """
+        if self.instancia is None:
+            self.instancia = FCSAInstance.de_pasta(self.pasta, usar_cache=self.usar_cache)
+            print(f"\n📂 Dados carregados de {self.pasta} (origem: {self.instancia.origem})")
+        else:
+            print(f"\n📂 Instância: {len(self.instancia.L)} links (origem: {self.instancia.origem})")
+        inst = self.instancia
+        config = inst.config
         
         self.alpha = config['parametros_financeiros']['alpha']
         self.Delta_h = config['parametros_financeiros']['Delta_h']
@@ -46,117 +125,124 @@ class FCSA_MILP:
         self.time_limit = config['solver']['time_limit']
         self.mip_gap = config['solver']['mip_gap']
         self.log_output = config['solver']['log_output']
+        # Threads do solver (0 = todos os núcleos); serviços com vários jobs dividem os núcleos
+        self.threads = config['solver'].get('threads', 0)
+        # Gap relativo máximo das soluções alternativas em relação à melhor (pool de soluções)
+        self.gap_alternativas = config['solver'].get('gap_alternativas', 0.05)
+        
+        # Peso dos benefícios de transporte no método ponderado e Big-M fixo (opcionais)
+        self.gamma = config['parametros_otimizacao'].get('gamma', 1.0)
+        self._big_m_fixo = config['parametros_otimizacao'].get('BIG_M')
         
-        # Raio de cobertura
+        # Raio de cobertura (None: sem restrição de cobertura)
         self.raio_cobertura_km = config['parametros_otimizacao'].get('raio_cobertura_km', 3.0)
         
-        # CSVs
-        links = pd.read_csv(self.pasta / 'links.csv')
-        custos_est = pd.read_csv(self.pasta / 'custos_estacoes.csv')
-        custos_pv = pd.read_csv(self.pasta / 'custos_carports_pv.csv')
-        tarifas = pd.read_csv(self.pasta / 'tarifas_energia.csv')
-        demanda = pd.read_csv(self.pasta / 'demanda_energia.csv')
-        irradiacao = pd.read_csv(self.pasta / 'irradiacao_solar.csv')
-        transporte = pd.read_csv(self.pasta / 'parametros_transporte.csv')
-        areas = pd.read_csv(self.pasta / 'areas_disponiveis.csv')
+        # Saídas opcionais da telemetria
+        saidas = config.get('telemetria') or {}
+        self.arquivo_telemetria = saidas.get('json')
+        self.log_execucoes_csv = saidas.get('csv')
         
         # Conjuntos
-        self.L = [int(x) for x in links['link_id'].tolist()]
-        self.T = list(range(24))
-        self.K = [int(x) for x in custos_pv['tipo_pv'].tolist()]
+        self.L, self.T, self.K = inst.L, inst.T, inst.K
+        self.telemetria.contexto.update(origem=inst.origem, links=len(self.L), periodos=len(self.T))
         
         # Parâmetros
-        self.c_CS = custos_est.set_index('link_id')['custo_instalacao_reais'].to_dict()
-        self.c_PV = custos_pv.set_index('tipo_pv')['custo_instalacao_reais'].to_dict()
-        self.P_k = custos_pv.set_index('tipo_pv')['potencia_kw'].to_dict()
-        self.a_k = custos_pv.set_index('tipo_pv')['area_m2'].to_dict()
-        self.c_e = tarifas.set_index('periodo')['tarifa_reais_kwh'].to_dict()
-        self.cp = areas.set_index('link_id')['area_disponivel_m2'].to_dict()
-        self.rho = transporte.set_index('link_id')['fluxo_agregado_veiculos_dia'].to_dict()
-        self.beta = transporte.set_index('link_id')['fator_beneficio'].to_dict()
+        self.c_CS = inst.visao('c_CS')
+        self.c_PV = inst.visao('c_PV')
+        self.P_k = inst.visao('P_k')
+        self.a_k = inst.visao('a_k')
+        self.c_e = inst.visao('c_e')
+        self.cp = inst.visao('cp')
+        self.rho = inst.visao('rho')
+        self.beta = inst.visao('beta')
         
         # Demanda original (não agregada)
-        self.E_d = demanda.set_index(['link_id', 'periodo'])['demanda_kwh'].to_dict()
-        self.sh = irradiacao.set_index(['link_id', 'periodo'])['irradiacao_normalizada'].to_dict()
+        self.E_d = inst.visao('E_d')
+        self.sh = inst.visao('sh')
         
         # Coordenadas geográficas
-        self.df_links = links
-        self.coordenadas = links.set_index('link_id')[['latitude', 'longitude']].to_dict('index')
-        
-    def _haversine(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calcula distância entre dois pontos geográficos (fórmula de Haversine)"""
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371  # Raio da Terra em km
-        return c * r
-    
+        self.df_links = inst.df_links
+        self.coordenadas = (self.df_links.set_index('link_id')[['latitude', 'longitude']].to_dict('index')
+                            if inst.tem_coordenadas else {})
+        
+    @medir_fase('cobertura')
     def _calcular_subconjuntos_cobertura(self):
         """
         Calcula subconjuntos L_i baseados em distância geográfica
         
         L_i: Links que podem COBRIR o link i (para restrição 10)
         
+        A adjacência é obtida em CSR (self._cob_indptr, self._cob_indices sobre
+        posições de self.L, self._cob_dist em km) do índice de vizinhos ordenados
+        por distância (modelos.cobertura), mantido em memória e em PASTA_CACHE e
+        reutilizado para qualquer raio enquanto as coordenadas de links.csv não
+        mudarem; self.L_i é a visão em dicionário {link: [links cobertores]}.
+        
+        Sem coordenadas (ou com raio None) não há restrição de cobertura: self.L_i
+        e a adjacência ficam None e R10 é omitida.
+        
         IMPORTANTE: Cobertura não significa atendimento de demanda.
         Cada estação atende APENAS sua própria demanda.
         """
-        print(f"\n🗺️  Calculando subconjuntos de cobertura (raio: {self.raio_cobertura_km} km)...")
+        if self.raio_cobertura_km is None or not self.instancia.tem_coordenadas:
+            self.L_i = self._cob_indptr = self._cob_indices = self._cob_dist = None
+            print(f"\n🗺️  Sem coordenadas/raio de cobertura: restrição R10 omitida")
+            return
         
-        self.L_i = {i: [] for i in self.L}
+        print(f"\n🗺️  Calculando subconjuntos de cobertura (raio: {self.raio_cobertura_km} km)...")
         
-        # Auto-cobertura garantida
-        for i in self.L:
-            self.L_i[i].append(i)
+        lat, lon = self.instancia.coordenadas()
+        pasta_cache = self.pasta / self.PASTA_CACHE if self.pasta is not None else None
+        indice, origem = obter_indice_vizinhos(pasta_cache, self.L, lat, lon, self.raio_cobertura_km)
+        self._cob_indptr, self._cob_indices, self._cob_dist = indice.subconjuntos(self.raio_cobertura_km)
+        print(f"   ✓ Índice de vizinhos: {origem} (raio máx. {indice.raio_max_km:g} km)")
         
-        # Adicionar vizinhos dentro do raio
-        for i in self.L:
-            lat_i = self.coordenadas[i]['latitude']
-            lon_i = self.coordenadas[i]['longitude']
-            
-            for j in self.L:
-                if i == j:
-                    continue
-                    
-                lat_j = self.coordenadas[j]['latitude']
-                lon_j = self.coordenadas[j]['longitude']
-                
-                dist_km = self._haversine(lat_i, lon_i, lat_j, lon_j)
-                
-                if dist_km <= self.raio_cobertura_km:
-                    self.L_i[i].append(j)
+        cobertores = np.array(self.L)[self._cob_indices].tolist()
+        ptr = self._cob_indptr.tolist()
+        self.L_i = {i: cobertores[ptr[p]:ptr[p + 1]] for p, i in enumerate(self.L)}
         
         # Estatísticas
-        avg_cobertores = np.mean([len(self.L_i[i]) for i in self.L])
+        avg_cobertores = np.diff(self._cob_indptr).mean()
         
         print(f"   ✓ Média de estações que podem cobrir cada link: {avg_cobertores:.1f}")
         print(f"   ℹ️  NOTA: Cobertura ≠ Atendimento de demanda")
         print(f"   ℹ️  Cada estação atende APENAS sua própria demanda")
         
-        # Salvar matriz
-        self._salvar_matriz_cobertura()
-        
-    def _salvar_matriz_cobertura(self):
-        """Salva matriz de cobertura para análise"""
-        dados_cobertura = []
-        for i in self.L:
-            for j in self.L_i[i]:
-                lat_i = self.coordenadas[i]['latitude']
-                lon_i = self.coordenadas[i]['longitude']
-                lat_j = self.coordenadas[j]['latitude']
-                lon_j = self.coordenadas[j]['longitude']
-                dist = self._haversine(lat_i, lon_i, lat_j, lon_j)
-                
-                dados_cobertura.append({
-                    'link_destino': i,
-                    'link_cobertor': j,
-                    'distancia_km': round(dist, 2)
-                })
-        
-        df_cob = pd.DataFrame(dados_cobertura)
-        df_cob.to_csv(self.pasta / 'matriz_cobertura_calculada.csv', index=False)
-        print(f"   ✓ Matriz salva: {self.pasta / 'matriz_cobertura_calculada.csv'}")
+    def matriz_cobertura(self) -> pd.DataFrame:
+        """Matriz de cobertura (link_destino, link_cobertor, distancia_km) a partir da adjacência CSR"""
+        L = np.array(self.L)
+        return pd.DataFrame({
+            'link_destino': np.repeat(L, np.diff(self._cob_indptr)),
+            'link_cobertor': L[self._cob_indices],
+            'distancia_km': self._cob_dist.round(2),
+        })
+        
+    def exportar_matriz_cobertura(self, caminho: Optional[str] = None) -> Path:
+        """
+        Salva a matriz de cobertura em CSV para análise (sob demanda)
+        
+        A escrita é atômica (arquivo temporário + os.replace), de modo que execuções
+        paralelas sobre a mesma pasta nunca leem um CSV parcial.
+        
+        Args:
+            caminho: Arquivo de destino (padrão: matriz_cobertura_calculada.csv na pasta do problema)
+        """
+        if self._cob_indptr is None:
+            raise ValueError("Modelo sem restrição de cobertura (instância sem coordenadas)")
+        if caminho is None and self.pasta is None:
+            raise ValueError("Informe o caminho (modelo sem pasta de problema)")
+        caminho = Path(caminho) if caminho else self.pasta / 'matriz_cobertura_calculada.csv'
+        with tempfile.NamedTemporaryFile('w', dir=caminho.parent, suffix='.csv', delete=False,
+                                         encoding='utf-8', newline='') as f:
+            try:
+                self.matriz_cobertura().to_csv(f, index=False)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, caminho)
+        print(f"   ✓ Matriz salva: {caminho}")
+        return caminho
     
     def _calcular_fator_vp(self):
         """Calcula fator de valor presente"""
@@ -164,189 +250,562 @@ class FCSA_MILP:
         den = self.alpha * (1 + self.alpha)**self.h * (1 + self.alpha)**self.Delta_h
         self.fator_vp = num / den
         
+    @medir_fase('big_m')
     def _calcular_big_m(self):
         """Calcula Big-M baseado em DEMANDA ORIGINAL (não agregada)"""
         # Máxima geração PV possível
-        max_pv = max(self.P_k[k] * self.sh.get((l, t), 0) 
-                     for l in self.L for t in self.T for k in self.K)
+        max_pv = float((self._sh_mat[:, :, None] * self._P_k_vec[None, None, :]).max())
         
         # Demanda original (cada estação atende apenas sua demanda)
-        max_dem = max(self.E_d.values())
+        max_dem = float(self._E_d_mat.max())
+        
+        self.BIG_M = max(max_pv, max_dem) * 1.5 if self._big_m_fixo is None else float(self._big_m_fixo)
         
-        self.BIG_M = max(max_pv, max_dem) * 1.5
+        # Big-M por (l,t) para R8 (E_lot = max{0, E_pv - E_d_eff}):
+        # R12 permite no máximo um tipo de carport por link e R11 exclui os tipos que
+        # não cabem na área, logo E_lot <= E_pv <= max_k P_k·sh[l,t] (0 à noite) em R8b;
+        # com x_aux = 0, R8c exige M >= E_d_eff - E_pv, cujo máximo é E_d[l,t]
+        cabe = self._a_k_vec[None, :] <= self._cp_vec[:, None] * self.a
+        P_cabe = np.where(cabe, self._P_k_vec[None, :], 0.0)
+        self._M_pv = self._sh_mat * P_cabe.max(axis=1)[:, None]
+        self._M_dem = self._E_d_mat.copy()
         
         print(f"\n🔢 Parâmetros derivados:")
         print(f"   ✓ Fator VP ({self.Delta_h} anos): {self.fator_vp:.4f}")
         print(f"   ✓ Máx PV possível: {max_pv:,.0f} kWh")
         print(f"   ✓ Máx demanda (original): {max_dem:,.0f} kWh")
         print(f"   ✓ Big-M calculado: {self.BIG_M:,.0f} kWh")
+        print(f"   ✓ Big-M por (l,t): R8b médio {self._M_pv.mean():,.1f} kWh "
+              f"({(self._M_pv == 0).mean() * 100:.0f}% nulos), R8c médio {self._M_dem.mean():,.1f} kWh")
+        
+    def _calcular_matrizes_parametros(self):
+        """Arrays NumPy densos dos parâmetros indexados por link/período (vindos de _carregar_dados)"""
+        inst = self.instancia
+        self._pos_L = inst.pos_L
+        
+        self._E_d_mat = inst.vetor('E_d')
+        self._sh_mat = inst.vetor('sh')
+        self._c_CS_vec = inst.vetor('c_CS')
+        self._cp_vec = inst.vetor('cp')
+        self._rho_beta_vec = inst.vetor('rho') * inst.vetor('beta')
+        self._c_PV_vec = inst.vetor('c_PV')
+        self._P_k_vec = inst.vetor('P_k')
+        self._a_k_vec = inst.vetor('a_k')
+        self._c_e_vec = np.array([self.c_e[t] for t in self.T], dtype=float)
+        
+    def _indexar_variaveis(self):
+        """
+        Define a coluna de cada variável do modelo
         
-    def construir(self):
+        self._idx[familia] é um array de inteiros com a forma da família:
+        (|L|,) para x, (|L|,|K|) para w, (|L|,|T|) para as energias e (|T|,) para E_nm.
         """
-        Constrói modelo MILP conforme tese de Caio
+        nL, nT, nK = len(self.L), len(self.T), len(self.K)
+        familias = [
+            ('x', (nL,)), ('w', (nL, nK)),
+            ('E', (nL, nT)), ('E_pv', (nL, nT)), ('E_minus_nm', (nL, nT)),
+            ('E_plus_nm', (nL, nT)), ('E_lot', (nL, nT)), ('E_nm', (nT,)),
+            ('E_d_eff', (nL, nT)), ('x_aux', (nL, nT)),
+        ]
+        self._idx = {}
+        inicio = 0
+        for nome, forma in familias:
+            n = int(np.prod(forma))
+            self._idx[nome] = np.arange(inicio, inicio + n).reshape(forma)
+            inicio += n
+        self._num_colunas = inicio
+        
+    def _bloco_cobertura(self, col_x: np.ndarray, com_nomes: bool = True) -> Dict:
+        """Bloco R10 (Σ_{j ∈ L_i} x_j >= 1) sobre as colunas col_x de x"""
+        return {
+            'nome': 'R10_cobertura',
+            'sentido': 'G',
+            'indptr': self._cob_indptr,
+            'indices': col_x[self._cob_indices],
+            'data': np.ones(len(self._cob_indices)),
+            'rhs': np.ones(len(self.L)),
+            'nomes': [f'R10_cobertura_{i}' for i in self.L] if com_nomes else None,
+        }
         
-        Restrições numeradas conforme Capítulo 4 da tese
+    @staticmethod
+    def _bloco(nome: str, colunas: np.ndarray, coefs: np.ndarray, sentido: str,
+               rhs: np.ndarray, rotulos: Optional[List[str]]) -> Dict:
         """
-        print(f"\n{'='*80}\n🔧 CONSTRUINDO MODELO FCSA MILP\n{'='*80}")
+        Monta um bloco de restrições (uma família) em formato CSR
         
-        m = Model('FCSA_MILP_Exato_Caio')
+        Args:
+            nome: Prefixo do nome das restrições
+            colunas: (n, k) colunas das variáveis de cada linha
+            coefs: (n, k) coeficientes (zeros são descartados)
+            sentido: 'L' (<=), 'E' (==) ou 'G' (>=)
+            rhs: (n,) lado direito
+            rotulos: sufixo do nome de cada linha (None = linhas sem nome)
+        """
+        rhs = np.asarray(rhs, dtype=float).reshape(-1)
+        colunas = np.asarray(colunas).reshape(len(rhs), -1)
+        coefs = np.asarray(coefs, dtype=float)
+        if coefs.size == colunas.size:
+            coefs = coefs.reshape(colunas.shape)
+        coefs = np.broadcast_to(coefs, colunas.shape)
+        mascara = coefs != 0
+        indptr = np.concatenate(([0], np.cumsum(mascara.sum(axis=1))))
+        return {
+            'nome': nome,
+            'sentido': sentido,
+            'indptr': indptr,
+            'indices': colunas[mascara],
+            'data': coefs[mascara],
+            'rhs': rhs,
+            'nomes': [f'{nome}_{r}' for r in rotulos] if rotulos is not None else None,
+        }
         
-        # === VARIÁVEIS ===
-        x = m.binary_var_dict(self.L, name='x')
-        w = {(l,k): m.binary_var(name=f'w_{l}_{k}') for l in self.L for k in self.K}
-        E = m.continuous_var_dict([(l,t) for l in self.L for t in self.T], lb=0, name='E')
-        E_pv = m.continuous_var_dict([(l,t) for l in self.L for t in self.T], lb=0, name='E_pv')
-        E_minus_nm = m.continuous_var_dict([(l,t) for l in self.L for t in self.T], lb=0, name='E_minus_nm')
-        E_plus_nm = m.continuous_var_dict([(l,t) for l in self.L for t in self.T], lb=0, name='E_plus_nm')
-        E_lot = m.continuous_var_dict([(l,t) for l in self.L for t in self.T], lb=0, name='E_lot')
-        E_nm = m.continuous_var_dict(self.T, lb=0, name='E_nm')
-        E_d_eff = m.continuous_var_dict([(l,t) for l in self.L for t in self.T], lb=0, name='E_d_eff')
-        x_aux = m.binary_var_dict([(l,t) for l in self.L for t in self.T], name='x_aux')
+    def _blocos_restricoes(self, com_nomes: bool = True) -> List[Dict]:
+        """
+        Gera todas as famílias de restrições como arrays de coeficientes
         
-        print(f"✅ Variáveis: {m.number_of_variables}")
+        Restrições numeradas conforme Capítulo 4 da tese
         
-        # === COMPONENTES DA FUNÇÃO OBJETIVO ===
-        self._C_in = m.sum(self.c_CS[l]*x[l] for l in self.L) + \
-                     m.sum(self.c_PV[k]*w[l,k] for l in self.L for k in self.K)
+        Args:
+            com_nomes: Gerar nomes das restrições (desnecessário no backend matricial)
+        """
+        idx = self._idx
+        nL, nT, nK = len(self.L), len(self.T), len(self.K)
+        nLT = nL * nT
+        rot_lt = [f'{l}_{t}' for l in self.L for t in self.T] if com_nomes else None
+        
+        x_lt = np.broadcast_to(idx['x'][:, None], (nL, nT))
+        E_d = self._E_d_mat
+        E_d_max = E_d.max()
+        if self.tipo_big_m == 'local':
+            M_pv, M_dem = self._M_pv, self._M_dem
+        else:
+            M_pv = M_dem = np.full((nL, nT), self.BIG_M)
+        
+        def pilha(*arrays):
+            return np.stack([np.broadcast_to(a, (nL, nT)) for a in arrays], axis=-1)
+        
+        blocos = []
+        
+        # (0) Número mínimo de estações: Σ x_l >= min_estacoes
+        if self.min_estacoes > 0:
+            blocos.append(self._bloco('R0_min_estacoes', idx['x'][None, :], 1.0, 'G',
+                                      [self.min_estacoes], ['total']))
+        
+        # (1) Demanda efetiva (Linearização: E_d_eff = x_l * E_d)
+        blocos.append(self._bloco('R1a_demanda', pilha(idx['E_d_eff'], x_lt), [1.0, -E_d_max],
+                                  'L', np.zeros(nLT), rot_lt))
+        blocos.append(self._bloco('R1b_demanda', idx['E_d_eff'], 1.0, 'L', E_d, rot_lt))
+        blocos.append(self._bloco('R1c_demanda', pilha(idx['E_d_eff'], x_lt), [1.0, -E_d_max],
+                                  'G', E_d - E_d_max, rot_lt))
+        
+        # (4) Balanço energético: E_pv + E_minus_nm + E - E_d_eff - E_plus_nm = 0
+        blocos.append(self._bloco('R4_balanco',
+                                  pilha(idx['E_pv'], idx['E_minus_nm'], idx['E'], idx['E_d_eff'], idx['E_plus_nm']),
+                                  [1.0, 1.0, 1.0, -1.0, -1.0], 'E', np.zeros(nLT), rot_lt))
+        
+        # (5) Geração PV: E_pv - Σ_k P_k·sh·w_k = 0
+        col_w = np.broadcast_to(idx['w'][:, None, :], (nL, nT, nK))
+        coef_w = -self._sh_mat[:, :, None] * self._P_k_vec[None, None, :]
+        blocos.append(self._bloco('R5_pv',
+                                  np.concatenate([idx['E_pv'][:, :, None], col_w], axis=-1),
+                                  np.concatenate([np.ones((nL, nT, 1)), coef_w], axis=-1),
+                                  'E', np.zeros(nLT), rot_lt))
+        
+        # (6) Limite importação NM: E_minus_nm[l,t] <= E_nm[t-1]  (E_minus_nm[l,0] = 0)
+        blocos.append(self._bloco('R6_import_inicial', idx['E_minus_nm'][:, :1], 1.0, 'E', np.zeros(nL),
+                                  [f'{l}_{self.T[0]}' for l in self.L]))
+        col_prev = np.broadcast_to(idx['E_nm'][None, :-1], (nL, nT - 1))
+        blocos.append(self._bloco('R6_import', np.stack([idx['E_minus_nm'][:, 1:], col_prev], axis=-1),
+                                  [1.0, -1.0], 'L', np.zeros(nL * (nT - 1)),
+                                  [f'{l}_{t}' for l in self.L for t in self.T[1:]] if com_nomes else None))
+        
+        # (7) Balanço acumulativo créditos NM: E_nm[t] - E_nm[t-1] - Σ_l (E_plus_nm - E_minus_nm) = 0
+        col_ant = np.concatenate(([idx['E_nm'][0]], idx['E_nm'][:-1]))
+        coef_ant = np.where(np.arange(nT) > 0, -1.0, 0.0)
+        colunas_r7 = np.column_stack([idx['E_nm'], col_ant, idx['E_plus_nm'].T, idx['E_minus_nm'].T])
+        coefs_r7 = np.column_stack([np.ones(nT), coef_ant, -np.ones((nT, nL)), np.ones((nT, nL))])
+        blocos.append(self._bloco('R7_nm_inicial', colunas_r7[:1], coefs_r7[:1], 'E', np.zeros(1),
+                                  [str(self.T[0])]))
+        blocos.append(self._bloco('R7_nm_acum', colunas_r7[1:], coefs_r7[1:], 'E', np.zeros(nT - 1),
+                                  [str(t) for t in self.T[1:]]))
+        
+        # (8) Linearização E_lot = max{0, E_pv - E_d_eff}
+        if self.formulacao_r8 == 'big_m':
+            blocos.append(self._bloco('R8a_lin', pilha(idx['E_lot'], idx['E_pv'], idx['E_d_eff']),
+                                      [1.0, -1.0, 1.0], 'G', np.zeros(nLT), rot_lt))
+            coef_r8b = np.stack([np.ones((nL, nT)), -M_pv], axis=-1)
+            blocos.append(self._bloco('R8b_lin', pilha(idx['E_lot'], idx['x_aux']), coef_r8b,
+                                      'L', np.zeros(nLT), rot_lt))
+            coef_r8c = np.stack([np.ones((nL, nT)), -np.ones((nL, nT)), np.ones((nL, nT)), M_dem], axis=-1)
+            blocos.append(self._bloco('R8c_lin', pilha(idx['E_lot'], idx['E_pv'], idx['E_d_eff'], idx['x_aux']),
+                                      coef_r8c, 'L', M_dem, rot_lt))
+        else:
+            # Sem binárias: E_lot - Σ_k max{0, P_k·sh - E_d}·w_k = 0 (ver _excedente_por_tipo)
+            blocos.append(self._bloco('R8_lot',
+                                      np.concatenate([idx['E_lot'][:, :, None], col_w], axis=-1),
+                                      np.concatenate([np.ones((nL, nT, 1)), -self._excedente_por_tipo()],
+                                                     axis=-1),
+                                      'E', np.zeros(nLT), rot_lt))
+        
+        # (9) Limite exportação NM: E_plus_nm <= E_lot
+        blocos.append(self._bloco('R9_export', pilha(idx['E_plus_nm'], idx['E_lot']), [1.0, -1.0],
+                                  'L', np.zeros(nLT), rot_lt))
+        
+        # (10) Cobertura espacial: Σ_{j ∈ L_i} x_j >= 1  (linhas de tamanho variável)
+        if self._cob_indptr is not None:
+            blocos.append(self._bloco_cobertura(idx['x'], com_nomes))
+        
+        # (11) Área carport: Σ_k a_k·w_lk <= cp_l·a
+        blocos.append(self._bloco('R11_area', idx['w'], self._a_k_vec[None, :], 'L',
+                                  self._cp_vec * self.a, [str(l) for l in self.L]))
+        
+        # (12) Carport requer estação: Σ_k w_lk - x_l <= 0
+        blocos.append(self._bloco('R12_carport', np.column_stack([idx['w'], idx['x']]),
+                                  np.concatenate([np.ones(nK), [-1.0]])[None, :], 'L',
+                                  np.zeros(nL), [str(l) for l in self.L]))
+        
+        if not com_nomes:
+            for bloco in blocos:
+                bloco['nomes'] = None
+        
+        return blocos
+        
+    def _excedente_por_tipo(self) -> np.ndarray:
+        """
+        Excedente PV da estação com carport do tipo k: G[l,t,k] = max{0, P_k·sh[l,t] - E_d[l,t]}
         
-        self._C_op = self.fator_vp * m.sum(self.c_e[t]*E[l,t] for l in self.L for t in self.T)
+        Por R12 (Σ_k w_lk <= x_l) há no máximo um carport por link e só onde x_l = 1;
+        então E_pv - E_d_eff vale P_k·sh - E_d com w_lk = 1, -E_d com x_l = 1 sem carport
+        e 0 com x_l = 0, e max{0, E_pv - E_d_eff} = Σ_k G[l,t,k]·w_lk exatamente.
+        """
+        return np.maximum(0.0, self._sh_mat[:, :, None] * self._P_k_vec[None, None, :]
+                          - self._E_d_mat[:, :, None])
         
-        self._f_trans = m.sum(x[l]*self.rho[l]*self.beta[l] for l in self.L)
+    def _binarias(self) -> Tuple[str, ...]:
+        """Famílias binárias da formulação ativa (x_aux só existe na formulação big-M de R8)"""
+        return self.BINARIAS if self.formulacao_r8 == 'big_m' else ('x', 'w')
         
-        # === RESTRIÇÕES (numeradas conforme tese) ===
+    def _vetores_objetivo(self):
+        """
+        Vetores de custo (por coluna) dos dois objetivos lexicográficos
         
-        print(f"\n📋 Adicionando restrições (numeração da tese):")             
+        self._c_f:     f = Σ(xl·ρl·βl)
+        self._c_custo: Cin + Cop = Σ c_CS·x + Σ c_PV·w + fator_vp·Σ c_e·E
+        """
+        idx = self._idx
+        self._c_f = np.zeros(self._num_colunas)
+        self._c_f[idx['x']] = self._rho_beta_vec
+        
+        self._c_custo = np.zeros(self._num_colunas)
+        self._c_custo[idx['x']] = self._c_CS_vec
+        self._c_custo[idx['w']] = self._c_PV_vec[None, :]
+        self._c_custo[idx['E']] = self.fator_vp * self._c_e_vec[None, :]
+        
+    def _limites_variaveis(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Limites (lb, ub) e tipos ('B'/'C') de todas as colunas"""
+        lb = np.zeros(self._num_colunas)
+        ub = np.full(self._num_colunas, np.inf)
+        tipos = np.full(self._num_colunas, 'C')
+        for nome in self._binarias():
+            ub[self._idx[nome]] = 1.0
+            tipos[self._idx[nome]] = 'B'
+        if self.formulacao_r8 != 'big_m':
+            ub[self._idx['x_aux']] = 0.0
+        return lb, ub, tipos
+        
+    @medir_fase('construcao')
+    def construir(self, backend: str = 'docplex', presolve: bool = True, big_m: Optional[str] = None,
+                  formulacao_r8: Optional[str] = None):
+        """
+        Constrói modelo MILP conforme tese de Caio
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # DEMANDA EFETIVA (Linearização: E_d_eff = x_l * E_d)
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        E_d_max = max(self.E_d.values())
-        for l in self.L:
-            for t in self.T:
-                Ed = self.E_d.get((l,t), 0)
-                m.add_constraint(E_d_eff[l,t] <= E_d_max * x[l], ctname=f'R1a_demanda_{l}_{t}')
-                m.add_constraint(E_d_eff[l,t] <= Ed, ctname=f'R1b_demanda_{l}_{t}')
-                m.add_constraint(E_d_eff[l,t] >= Ed - E_d_max*(1-x[l]), ctname=f'R1c_demanda_{l}_{t}')
-        print(f"   ✓ (1) Demanda efetiva (original): {3*len(self.L)*len(self.T)} restrições")
+        Cada família de restrições é gerada a partir de arrays NumPy de
+        coeficientes (_blocos_restricoes) e enviada em lote ao backend.
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (4) BALANÇO ENERGÉTICO
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            for t in self.T:
-                m.add_constraint(
-                    E_pv[l,t] + E_minus_nm[l,t] + E[l,t] == E_d_eff[l,t] + E_plus_nm[l,t],
-                    ctname=f'R4_balanco_{l}_{t}'
-                )
-        print(f"   ✓ (4) Balanço energético: {len(self.L)*len(self.T)} restrições")
+        Args:
+            backend: 'docplex' (modelo com nomes, objetos docplex),
+                     'cplex' (matriz CSR enviada à API de baixo nível cplex.Cplex) ou
+                     'highs' (matriz CSR enviada ao HiGHS, sem necessidade de licença)
+            presolve: Eliminar E_d_eff, E_pv e E_minus_nm[:, 0] por substituição exata e
+                      omitir E_lot/E_plus_nm/x_aux e R8/R9 onde sh = 0 (ver _presolve_estrutural).
+                      As soluções continuam no espaço completo.
+            big_m: 'local' (M por (l,t) em R8, ver _calcular_big_m) ou 'global' (BIG_M único).
+                   Se None, mantém self.tipo_big_m.
+            formulacao_r8: 'big_m' (R8a/R8b/R8c com as binárias x_aux, como na tese) ou
+                           'sem_binarias' (E_lot = Σ_k G·w, ver _excedente_por_tipo; x_aux = 0).
+                           Se None, mantém self.formulacao_r8.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend inválido: {backend} (opções: {', '.join(self.BACKENDS)})")
+        if big_m is not None:
+            if big_m not in self.TIPOS_BIG_M:
+                raise ValueError(f"big_m inválido: {big_m} (opções: {', '.join(self.TIPOS_BIG_M)})")
+            self.tipo_big_m = big_m
+        if formulacao_r8 is not None:
+            if formulacao_r8 not in self.FORMULACOES_R8:
+                raise ValueError(f"formulacao_r8 inválida: {formulacao_r8} "
+                                 f"(opções: {', '.join(self.FORMULACOES_R8)})")
+            self.formulacao_r8 = formulacao_r8
+        
+        print(f"\n{'='*80}\n🔧 CONSTRUINDO MODELO FCSA MILP (backend: {backend}, R8: {self.formulacao_r8})\n{'='*80}")
+        
+        self._indexar_variaveis()
+        self._vetores_objetivo()
+        print(f"✅ Variáveis: {self._num_colunas}")
+        
+        print(f"\n📋 Adicionando restrições (numeração da tese):")
+        blocos = self._blocos_restricoes(com_nomes=(backend == 'docplex'))
+        
+        self._presolve = None
+        if presolve:
+            self._construir_presolve(blocos, backend)
+        elif backend == 'docplex':
+            self._construir_docplex(blocos)
+        else:
+            self._construir_matriz(blocos, backend)
+        
+        for bloco in blocos:
+            eliminada = ' → eliminadas (presolve)' if presolve and bloco['nome'] in self.DEFINICOES else ''
+            print(f"   ✓ {bloco['nome']}: {len(bloco['rhs'])} restrições{eliminada}")
+        if presolve:
+            omit = self._omitidos_noite
+            print(f"   🌙 Períodos sem irradiação (sh = 0): {omit['periodos']} (l,t) → "
+                  f"{omit['colunas']} variáveis E_pv/E_lot/E_plus_nm/x_aux e "
+                  f"{omit['linhas']} restrições R5/R8/R9 omitidas")
+            self._presolve.imprimir_reducao()
+        
+        print(f"\n✅ TOTAL: {self._solver.num_linhas} restrições")
+        print(f"{'='*80}")
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (5) GERAÇÃO PV
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            for t in self.T:
-                m.add_constraint(
-                    E_pv[l,t] == m.sum(self.P_k[k]*self.sh.get((l,t),0)*w[l,k] for k in self.K),
-                    ctname=f'R5_pv_{l}_{t}'
-                )
-        print(f"   ✓ (5) Geração PV: {len(self.L)*len(self.T)} restrições")
+        self.backend = backend
+        if self._presolve:
+            nnz, tipos = self._presolve.matriz.nnz, self._presolve.matriz.tipos
+        else:
+            nnz, tipos = sum(len(b['indices']) for b in blocos), self._limites_variaveis()[2]
+        self.telemetria.contexto['backend'] = backend
+        self.telemetria.registrar_modelo(colunas=self._solver.num_colunas, linhas=self._solver.num_linhas,
+                                         nnz=int(nnz), binarias=int((tipos == 'B').sum()),
+                                         presolve=presolve, formulacao_r8=self.formulacao_r8)
+        
+    def _construir_docplex(self, blocos: List[Dict]):
+        """Cria o modelo docplex (variáveis nomeadas na ordem de self._idx)"""
+        m = Model('FCSA_MILP_Exato_Caio', checker='off')
+        
+        lt = [(l, t) for l in self.L for t in self.T]
+        lk = [(l, k) for l in self.L for k in self.K]
+        chaves = {'x': self.L, 'w': lk, 'E': lt, 'E_pv': lt, 'E_minus_nm': lt, 'E_plus_nm': lt,
+                  'E_lot': lt, 'E_nm': self.T, 'E_d_eff': lt, 'x_aux': lt}
+        colunas = []
+        binarias = self._binarias()
+        for nome in self._idx:
+            if nome in binarias:
+                colunas.extend(m.binary_var_list(chaves[nome], name=nome))
+            else:
+                ub = 0 if nome == 'x_aux' else None
+                colunas.extend(m.continuous_var_list(chaves[nome], lb=0, ub=ub, name=nome))
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (6) LIMITE IMPORTAÇÃO NET-METERING
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            for idx, t in enumerate(self.T):
-                if idx > 0:
-                    m.add_constraint(E_minus_nm[l,t] <= E_nm[self.T[idx-1]], ctname=f'R6_import_{l}_{t}')
-                else:
-                    m.add_constraint(E_minus_nm[l,t] == 0, ctname=f'R6_import_inicial_{l}_{t}')
-        print(f"   ✓ (6) Limite importação NM: {len(self.L)*len(self.T)} restrições")
+        for bloco in blocos:
+            SolverDocplex.adicionar_bloco(m, colunas, bloco)
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (7) BALANÇO ACUMULATIVO CRÉDITOS NET-METERING
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for idx, t in enumerate(self.T):
-            if idx == 0:
-                m.add_constraint(
-                    E_nm[t] == m.sum(E_plus_nm[l,t] - E_minus_nm[l,t] for l in self.L),
-                    ctname=f'R7_nm_inicial_{t}'
-                )
-            else:
-                m.add_constraint(
-                    E_nm[t] == E_nm[self.T[idx-1]] + m.sum(E_plus_nm[l,t] - E_minus_nm[l,t] for l in self.L),
-                    ctname=f'R7_nm_acum_{t}'
-                )
-        print(f"   ✓ (7) Balanço créditos NM: {len(self.T)} restrições")
+        self.modelo = m
+        self._solver = SolverDocplex(m, colunas)
+        
+    def _construir_matriz(self, blocos: List[Dict], backend: str):
+        """Monta a matriz CSR e carrega no solver matricial (cplex ou highs)"""
+        lb, ub, tipos = self._limites_variaveis()
+        matriz = MatrizMILP(lb, ub, tipos, blocos)
+        print(f"   ℹ️  Matriz: {matriz.num_linhas} × {matriz.num_colunas} ({matriz.nnz} não-nulos)")
+        
+        self._solver = criar_solver(matriz, backend)
+        self.modelo = self._solver.modelo
+        
+    def _construir_presolve(self, blocos: List[Dict], backend: str):
+        """Monta a matriz completa, aplica o presolve estrutural e carrega o modelo reduzido"""
+        lb, ub, tipos = self._limites_variaveis()
+        nomes_colunas = self._nomes_colunas() if backend == 'docplex' else None
+        matriz = MatrizMILP(lb, ub, tipos, blocos, nomes_colunas)
+        self._presolve = self._presolve_estrutural(matriz, blocos)
+        
+        solver = criar_solver(self._presolve.matriz, backend, nome='FCSA_MILP_Exato_Caio')
+        self._solver = SolverReduzido(solver, self._presolve)
+        self.modelo = solver.modelo
+        
+    def _nomes_colunas(self) -> List[str]:
+        """Nomes das colunas no padrão docplex (ex.: E_pv_3_12), na ordem de self._idx"""
+        sufixos = {
+            'x': [f'{l}' for l in self.L],
+            'w': [f'{l}_{k}' for l in self.L for k in self.K],
+            'E_nm': [f'{t}' for t in self.T],
+        }
+        lt = [f'{l}_{t}' for l in self.L for t in self.T]
+        return [f'{nome}_{s}' for nome in self._idx for s in sufixos.get(nome, lt)]
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (8) LINEARIZAÇÃO E_lot = max{0, E_pv - E_d_eff}
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            for t in self.T:
-                m.add_constraint(E_lot[l,t] >= E_pv[l,t] - E_d_eff[l,t], ctname=f'R8a_lin_{l}_{t}')
-                m.add_constraint(E_lot[l,t] <= self.BIG_M * x_aux[l,t], ctname=f'R8b_lin_{l}_{t}')
-                m.add_constraint(E_lot[l,t] <= E_pv[l,t] - E_d_eff[l,t] + self.BIG_M*(1-x_aux[l,t]), ctname=f'R8c_lin_{l}_{t}')
-        print(f"   ✓ (8) Linearização max: {3*len(self.L)*len(self.T)} restrições")
+    def _presolve_estrutural(self, matriz: MatrizMILP, blocos: List[Dict]) -> Presolve:
+        """
+        Substituições exatas do modelo FCSA
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (9) LIMITE EXPORTAÇÃO NET-METERING
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            for t in self.T:
-                m.add_constraint(E_plus_nm[l,t] <= E_lot[l,t], ctname=f'R9_export_{l}_{t}')
-        print(f"   ✓ (9) Limite exportação NM: {len(self.L)*len(self.T)} restrições")
-
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (10) COBERTURA ESPACIAL
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for i in self.L:
-            m.add_constraint(
-                m.sum(x[j] for j in self.L_i[i]) >= 1,
-                ctname=f'R10_cobertura_{i}'
-            )
-        print(f"   ✓ (10) Cobertura espacial: {len(self.L)} restrições")
+        E_d_eff[l,t] = E_d[l,t]·x[l]          (R1a/R1b/R1c apenas linearizam este produto)
+        E_pv[l,t]    = Σ_k P_k·sh[l,t]·w[l,k]  (R5)
+        E_minus_nm[l,0] = 0                    (R6 inicial)
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (11) ÁREA CARPORT
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            m.add_constraint(
-                m.sum(self.a_k[k]*w[l,k] for k in self.K) <= self.cp[l]*self.a,
-                ctname=f'R11_area_{l}'
-            )
-        print(f"   ✓ (11) Área carport: {len(self.L)} restrições")
+        Nos períodos sem irradiação (sh[l,t] = 0) tem-se E_pv = 0, logo
+        E_lot = max{0, -E_d_eff} = 0 e, por R9, E_plus_nm = 0; x_aux fica livre e
+        é fixado em 0. Essas colunas são eliminadas e as linhas R8a/R8b/R8c/R9
+        desses (l,t), agora triviais, removidas (contagem em self._omitidos_noite).
         
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        # (12) CARPORT REQUER ESTAÇÃO
-        # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        for l in self.L:
-            m.add_constraint(
-                m.sum(w[l,k] for k in self.K) <= x[l],
-                ctname=f'R12_carport_{l}'
-            )
-        print(f"   ✓ (12) Carport requer estação: {len(self.L)} restrições")
-        
-        print(f"\n✅ TOTAL: {m.number_of_constraints} restrições")
-        print(f"{'='*80}")
+        Na formulação 'sem_binarias', E_lot[l,t] = Σ_k G[l,t,k]·w[l,k] (R8_lot) e
+        x_aux = 0 são substituídos em todos os (l,t).
         
-        self.modelo = m
-        self._vars = {'x': x, 'w': w, 'E': E, 'E_pv': E_pv, 'E_minus_nm': E_minus_nm,
-                      'E_plus_nm': E_plus_nm, 'E_nm': E_nm, 'E_d_eff': E_d_eff}
+        As expressões são somas de termos não negativos, logo respeitam lb = 0
+        das colunas eliminadas; as linhas de definição (DEFINICOES) são removidas.
+        """
+        idx = self._idx
+        nL, nT, nK = len(self.L), len(self.T), len(self.K)
+        nLT = nL * nT
+        noite = self._sh_mat == 0
+        n_noite = int(noite.sum())
+        col_x = np.broadcast_to(idx['x'][:, None], (nL, nT)).ravel()
+        col_w = np.broadcast_to(idx['w'][:, None, :], (nL, nT, nK)).ravel()
+        
+        # (colunas eliminadas, termos por coluna, colunas e coeficientes das expressões)
+        substituicoes = [
+            (idx['E_d_eff'].ravel(), 1, col_x, self._E_d_mat.ravel()),
+            (idx['E_pv'].ravel(), nK, col_w, (self._sh_mat[:, :, None] * self._P_k_vec[None, None, :]).ravel()),
+            (idx['E_minus_nm'][:, 0], 0, [], []),
+            (idx['E_plus_nm'][noite], 0, [], []),
+        ]
+        if self.formulacao_r8 == 'big_m':
+            substituicoes += [(idx['E_lot'][noite], 0, [], []), (idx['x_aux'][noite], 0, [], [])]
+        else:
+            substituicoes += [(idx['E_lot'].ravel(), nK, col_w, self._excedente_por_tipo().ravel()),
+                              (idx['x_aux'].ravel(), 0, [], [])]
+        
+        eliminadas = np.concatenate([np.asarray(c, dtype=np.int64) for c, _, _, _ in substituicoes])
+        tamanhos = np.concatenate([np.full(len(c), n, dtype=np.int64) for c, n, _, _ in substituicoes])
+        indices = np.concatenate([np.asarray(i, dtype=np.int64) for _, _, i, _ in substituicoes])
+        dados = np.concatenate([np.asarray(d, dtype=float) for _, _, _, d in substituicoes])
+        
+        inicio = np.cumsum([0] + [len(b['rhs']) for b in blocos])
+        removidas = [np.arange(inicio[i], inicio[i + 1])
+                     for i, b in enumerate(blocos) if b['nome'] in self.DEFINICOES]
+        linhas_noite = np.flatnonzero(noite.ravel())
+        removidas += [inicio[i] + linhas_noite for i, b in enumerate(blocos)
+                      if b['nome'] in self.LINHAS_NOITE and b['nome'] not in self.DEFINICOES]
+        removidas = np.concatenate(removidas)
+        
+        self._omitidos_noite = {
+            'periodos': n_noite,
+            'colunas': 4 * n_noite,  # E_pv, E_lot, E_plus_nm, x_aux
+            'linhas': sum(b['nome'] in self.LINHAS_NOITE for b in blocos) * n_noite,
+        }
+        
+        return Presolve(matriz, eliminadas, np.concatenate(([0], np.cumsum(tamanhos))), indices, dados,
+                        np.zeros(len(eliminadas)), removidas)
         
-    def resolver(self):
+    def resolver(self, backend: Optional[str] = None, inicio_passo2: Optional[str] = 'passo1',
+                 passo1: str = 'cobertura', metodo: str = 'lexicografico', n_alternativas: int = 1):
         """
         Resolve modelo usando método lexicográfico (Algoritmo 1)
         
         Paso 1: min f = Σ(xl·ρl·βl)
         Paso 2: min (Cin + Cop) s.t. f = f*
-        """
-        if not self.modelo:
-            self.construir()
-        
-        self.modelo.parameters.mip.tolerances.mipgap = self.mip_gap
-        self.modelo.parameters.timelimit = self.time_limit
-        self.modelo.parameters.threads = 0
         
+        Com metodo='ponderado', resolve uma única vez min (Cin + Cop) - γ·f
+        (formulação de ModeloFCSA_MILP, ver _resolver_ponderado). Com metodo='heuristico',
+        não constrói o MILP: o plano vem da heurística gulosa (ver resolver_heuristico).
+
+        Args:
+            backend: 'docplex', 'cplex' ou 'highs'. Se None, usa o backend já construído
+                     (ou 'docplex' se o modelo ainda não foi construído).
+            inicio_passo2: MIP start do passo 2 - 'passo1' (solução do passo 1),
+                           'reparado' (LP operacional com x e w do passo 1 fixos),
+                           'heuristica' (x do passo 1, carports e operação da heurística,
+                           sem LP) ou None
+            passo1: 'cobertura' (set cover ponderado só com x, R0 e R10, verificado contra o
+                    modelo completo) ou 'completo' (MILP completo)
+            metodo: 'lexicografico' (Algoritmo 1), 'ponderado' ou 'heuristico'
+            n_alternativas: Com k > 1, o solve final (passo 2 ou ponderado) preenche o pool
+                            de soluções do CPLEX e self.alternativas recebe até k planos
+                            distintos de estações e carports, com seus custos, em um único
+                            solve (ver _gerar_alternativas). Requer backend 'docplex' ou
+                            'cplex' e não usa o cache de soluções.
+        """
+        if metodo not in self.METODOS:
+            raise ValueError(f"metodo inválido: {metodo} (opções: {', '.join(self.METODOS)})")
+        if passo1 not in self.PASSOS1:
+            raise ValueError(f"passo1 inválido: {passo1} (opções: {', '.join(self.PASSOS1)})")
+        if inicio_passo2 not in self.INICIOS_PASSO2:
+            raise ValueError(f"inicio_passo2 inválido: {inicio_passo2} "
+                             f"(opções: {', '.join(map(str, self.INICIOS_PASSO2))})")
+        
+        backend = backend or self.backend or 'docplex'
+        if n_alternativas > 1 and backend not in self.BACKENDS_POOL:
+            raise ValueError(f"n_alternativas requer o pool de soluções do CPLEX "
+                             f"(backends: {', '.join(self.BACKENDS_POOL)}), não {backend}")
+        self.alternativas = []
+        if metodo == 'heuristico':
+            if n_alternativas > 1:
+                raise ValueError("n_alternativas não se aplica ao metodo 'heuristico'")
+            ok = self.resolver_heuristico()
+            self._emitir_telemetria()
+            return ok
+        chave = None
+        if self.cache_solucoes is not None and n_alternativas <= 1:
+            with self.telemetria.fase('cache_solucao') as registro:
+                parametros = self.parametros_solucao(backend, metodo, passo1, inicio_passo2)
+                chave = chave_solucao(self.instancia.assinatura(), parametros)
+                entrada = self.cache_solucoes.obter(chave)
+                registro['status'] = 'acerto' if entrada is not None else 'falta'
+            if entrada is not None:
+                self.solucao, self._valores = entrada
+                print(f"\n♻️  Solução recuperada do cache ({chave[:12]})")
+                self._imprimir_resultados()
+                self._emitir_telemetria()
+                return True
+        
+        if not self.modelo or backend != self.backend:
+            self.construir(backend)
+        if self.progresso is not None and self.progresso.observar_fase not in self.telemetria.observadores:
+            self.telemetria.observadores.append(self.progresso.observar_fase)
+        
+        if metodo == 'ponderado':
+            ok = self._resolver_ponderado(n_alternativas)
+        else:
+            ok = self._resolver_lexicografico(inicio_passo2, passo1, n_alternativas)
+        if ok and chave is not None:
+            self.cache_solucoes.gravar(chave, self.solucao, self._valores, instancia=self._rotulo_instancia(),
+                                       parametros=parametros)
+        self._emitir_telemetria()
+        return ok
+    
+    def parametros_solucao(self, backend: str, metodo: str = 'lexicografico', passo1: str = 'cobertura',
+                           inicio_passo2: Optional[str] = 'passo1') -> Dict:
+        """
+        Parâmetros que, junto com a instância e a versão do código, determinam a solução
+        (chave do cache de soluções). Inclui os atributos ajustáveis após a carga.
+        """
+        parametros = {
+            'backend': backend, 'metodo': metodo,
+            'time_limit': self.time_limit, 'mip_gap': self.mip_gap,
+            'tipo_big_m': self.tipo_big_m, 'big_m_fixo': self._big_m_fixo,
+            'formulacao_r8': self.formulacao_r8,
+            'min_estacoes': self.min_estacoes, 'gamma': self.gamma,
+        }
+        if metodo == 'lexicografico':
+            parametros.update(passo1=passo1, inicio_passo2=inicio_passo2)
+        if self.progresso is not None and self.progresso.regras:
+            # Paradas antecipadas mudam a solução devolvida
+            parametros['parada'] = [repr(r) for r in self.progresso.regras]
+        return parametros
+    
+    def _rotulo_instancia(self) -> Optional[str]:
+        """Pasta do problema (caminho absoluto), usada para invalidar o cache de soluções"""
+        return str(self.pasta.resolve()) if self.pasta is not None else None
+    
+    def _resolver_lexicografico(self, inicio_passo2: Optional[str], passo1: str, n_alternativas: int = 1) -> bool:
+        """Passos 1 e 2 do Algoritmo 1 (ver resolver)"""
+        solver = self._solver
+        tel = self.telemetria
         tempo_total = 0
         
         # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -357,24 +816,29 @@ class FCSA_MILP:
         print(f"   ℹ️  Minimizar f = Instalar em links com MAIOR demanda VE")
         print(f"   ℹ️  βl baixo → advl/tf alto → MUITOS usuários VE")
         
-        # ✅ CORREÇÃO: MINIMIZAR f (não maximizar)
-        self.modelo.minimize(self._f_trans)
-        
-        t0 = time.time()
-        sol1 = self.modelo.solve(log_output=self.log_output)
-        tempo1 = time.time() - t0
+        with tel.fase('passo1') as registro:
+            sol1 = self._resolver_cobertura() if passo1 == 'cobertura' else None
+            if sol1 is None:
+                # ✅ CORREÇÃO: MINIMIZAR f (não maximizar)
+                solver.definir_objetivo(self._c_f)
+                sol1 = solver.resolver(self.time_limit, self.mip_gap, threads=self.threads, log_output=self.log_output,
+                                       progresso=self.progresso)
+            registro.update(tel.resumo_solver(sol1))
+        tempo1 = sol1['tempo_s']
         tempo_total += tempo1
         
-        if not sol1:
+        if not sol1['viavel']:
             print(f"\n❌ PASO 1 INFACTÍVEL")
             return False
         
-        f_otimo = sol1.objective_value
-        num_est_p1 = sum(1 for l in self.L if self._vars['x'][l].solution_value > 0.5)
-        est_p1 = [l for l in self.L if self._vars['x'][l].solution_value > 0.5]
+        f_otimo = sol1['objetivo']
+        est_p1 = np.asarray(self.L)[sol1['valores'][self._idx['x']] > 0.5].tolist()
+        num_est_p1 = len(est_p1)
         
         print(f"\n✅ PASO 1 CONCLUÍDO:")
         print(f"   ⏱️  Tempo: {tempo1:.2f}s")
+        if sol1.get('parada'):
+            print(f"   ⏹️  Parada antecipada: {sol1['parada']} (gap {sol1['gap'] * 100:.2f}%)")
         print(f"   📊 f* = {f_otimo:.6f} (menor = melhor cobertura)")
         print(f"   ⚡ Estações: {num_est_p1} → {est_p1}")
         
@@ -386,57 +850,359 @@ class FCSA_MILP:
         
         # ✅ CORREÇÃO: Restricción de IGUALDAD (não >=)
         # self.modelo.add_constraint(self._f_trans == f_otimo, ctname='R16_lexicografica')
-        self.modelo.add_constraint(self._f_trans <= f_otimo, ctname='R16_lexicografica')
+        ind_f = np.flatnonzero(self._c_f)
+        solver.adicionar_restricao(ind_f, self._c_f[ind_f], 'L', f_otimo, 'R16_lexicografica')
         
         # Minimizar custos
-        self.modelo.minimize(self._C_in + self._C_op)
-        
-        t0 = time.time()
-        sol2 = self.modelo.solve(log_output=self.log_output)
-        tempo2 = time.time() - t0
+        solver.definir_objetivo(self._c_custo)
+        
+        # MIP start: a solução do passo 1 já é viável para o passo 2 (satisfaz R16)
+        if inicio_passo2:
+            t0 = time.time()
+            with tel.fase('inicio_passo2'):
+                inicio = self._inicio_passo2(sol1['valores'], inicio_passo2)
+                solver.definir_inicio(inicio, f'inicio_{inicio_passo2}')
+            tempo_total += time.time() - t0
+            print(f"   💡 MIP start ({inicio_passo2}): custo inicial R$ {self._c_custo @ inicio:,.2f}")
+        
+        with tel.fase('passo2') as registro:
+            sol2 = solver.resolver(self.time_limit, self.mip_gap, threads=self.threads, log_output=self.log_output,
+                                   progresso=self.progresso)
+            registro.update(tel.resumo_solver(sol2))
+        tempo2 = sol2['tempo_s']
         tempo_total += tempo2
         
-        if not sol2:
+        if not sol2['viavel']:
             print(f"\n❌ PASO 2 INFACTÍVEL")
             return False
         
         print(f"\n✅ PASO 2 CONCLUÍDO:")
         print(f"   ⏱️  Tempo: {tempo2:.2f}s")
-        print(f"   💰 Custo: R$ {sol2.objective_value:,.2f}")
+        if sol2.get('parada'):
+            print(f"   ⏹️  Parada antecipada: {sol2['parada']} (gap {sol2['gap'] * 100:.2f}%)")
+        print(f"   💰 Custo: R$ {sol2['objetivo']:,.2f}")
         
-        self._extrair_solucao(tempo_total, f_otimo)
+        self._extrair_solucao(tempo_total, f_otimo, sol2)
+        if n_alternativas > 1:
+            self._gerar_alternativas(solver, n_alternativas)
         self._imprimir_resultados()
         
         return True
     
-    def _extrair_solucao(self, tempo: float, f_otimo: float):
-        """Extrai solução"""
-        x = self._vars['x']
-        w = self._vars['w']
-        E = self._vars['E']
-        E_pv = self._vars['E_pv']
-        E_nm = self._vars['E_nm']
-        E_plus_nm = self._vars['E_plus_nm']
-        E_minus_nm = self._vars['E_minus_nm']
-        
-        est = [l for l in self.L if x[l].solution_value > 0.5]
-        cp_inst = {l: k for l in est for k in self.K if w[l,k].solution_value > 0.5}
-        
-        custo_inv = sum(self.c_CS[l] for l in est) + sum(self.c_PV[k] for k in cp_inst.values())
-        custo_op = self.fator_vp * sum(self.c_e[t]*E[l,t].solution_value for l in est for t in self.T)
-        
-        # Calcular links cobertos
-        links_cobertos = set()
-        for i in self.L:
-            for j in est:
-                if j in self.L_i[i]:
-                    links_cobertos.add(i)
-                    break
+    def _emitir_telemetria(self):
+        """Grava o relatório de telemetria em JSON e/ou no log CSV, se configurados"""
+        if self.arquivo_telemetria:
+            print(f"   ⏱️  Telemetria: {self.telemetria.salvar_json(self.arquivo_telemetria)}")
+        if self.log_execucoes_csv:
+            print(f"   ⏱️  Log de execuções: {self.telemetria.anexar_csv(self.log_execucoes_csv)}")
+        
+    def _resolver_ponderado(self, n_alternativas: int = 1) -> bool:
+        """
+        Objetivo único: min (Cin + Cop) - γ·Σ(xl·ρl·βl)
+        
+        Mesmo modelo (R0-R12) do método lexicográfico, sem R16; γ vem de
+        parametros_otimizacao.gamma (ou do dicionário de parâmetros).
+        """
+        print(f"\n{'='*80}\n⚖️  OBJETIVO PONDERADO: min (Cin + Cop) - γ·f  (γ = {self.gamma})\n{'='*80}")
+        
+        with self.telemetria.fase('ponderado') as registro:
+            self._solver.definir_objetivo(self._c_custo - self.gamma * self._c_f)
+            resultado = self._solver.resolver(self.time_limit, self.mip_gap, threads=self.threads,
+                                              log_output=self.log_output, progresso=self.progresso)
+            registro.update(self.telemetria.resumo_solver(resultado))
+        if not resultado['viavel']:
+            print(f"\n❌ MODELO INFACTÍVEL OU SEM SOLUÇÃO")
+            return False
+        
+        f = float(self._c_f @ resultado['valores'])
+        print(f"\n✅ CONCLUÍDO: {resultado['tempo_s']:.2f}s | FO: R$ {resultado['objetivo']:,.2f} | f = {f:.6f}")
+        if resultado.get('parada'):
+            print(f"   ⏹️  Parada antecipada: {resultado['parada']} (gap {resultado['gap'] * 100:.2f}%)")
+        
+        self._extrair_solucao(resultado['tempo_s'], f, resultado)
+        if n_alternativas > 1:
+            self._gerar_alternativas(self._solver, n_alternativas)
+        self._imprimir_resultados()
+        return True
         
-        self.solucao = {
+    def _resolver_cobertura(self) -> Optional[Dict]:
+        """
+        Passo 1 reduzido: min f = Σ(xl·ρl·βl) s.a. R0 e R10 (set cover ponderado sobre L_i
+        com Σ x >= min_estacoes)
+        
+        f depende apenas de x, e para qualquer x que satisfaça R0 e R10 a solução com w = 0 e
+        toda a demanda comprada da rede satisfaz R1-R12, logo f* coincide com o do modelo
+        completo. A solução é completada e verificada contra a matriz completa; retorna
+        None se a verificação falhar (o passo 1 então usa o modelo completo).
+        """
+        if self._cob_indptr is None:
+            return None
+        t0 = time.time()
+        nL = len(self.L)
+        blocos = [self._bloco_cobertura(np.arange(nL), com_nomes=False)]
+        if self.min_estacoes > 0:
+            blocos.append(self._bloco('R0_min_estacoes', np.arange(nL)[None, :], 1.0, 'G',
+                                      [self.min_estacoes], None))
+        matriz = MatrizMILP(np.zeros(nL), np.ones(nL), np.full(nL, 'B'), blocos)
+        print(f"   ℹ️  Set cover: {matriz.num_linhas} × {matriz.num_colunas} ({matriz.nnz} não-nulos)")
+        
+        cobertura = criar_solver(matriz, self.backend, nome='FCSA_Passo1_Cobertura')
+        cobertura.definir_objetivo(self._rho_beta_vec)
+        resultado = cobertura.resolver(self.time_limit, self.mip_gap, threads=self.threads, log_output=self.log_output,
+                                       progresso=self.progresso)
+        if not resultado['viavel']:
+            return resultado
+        
+        # Completar a solução: E_d_eff = E = E_d·x, demais variáveis nulas
+        idx = self._idx
+        x = np.round(resultado['valores'])
+        valores = np.zeros(self._num_colunas)
+        valores[idx['x']] = x
+        valores[idx['E_d_eff']] = self._E_d_mat * x[:, None]
+        valores[idx['E']] = self._E_d_mat * x[:, None]
+        
+        lb, ub, tipos = self._limites_variaveis()
+        completo = MatrizMILP(lb, ub, tipos, self._blocos_restricoes(com_nomes=False))
+        violacao = completo.violacao_maxima(valores)
+        if violacao > 1e-6:
+            print(f"   ⚠️  Solução do set cover inviável no modelo completo (violação {violacao:.2e}): "
+                  f"resolvendo passo 1 completo")
+            return None
+        
+        print(f"   ✓ Solução completada viável no modelo completo")
+        return dict(resultado, objetivo=float(self._rho_beta_vec @ x), valores=valores,
+                    tempo_s=time.time() - t0)
+        
+    def _inicio_passo2(self, valores: np.ndarray, modo: str) -> np.ndarray:
+        """
+        Solução inicial do passo 2 a partir da solução do passo 1
+        
+        'passo1':   vetor do passo 1 (x, w, variáveis de energia e x_aux), binárias arredondadas
+        'reparado': x e w do passo 1 fixos; x_aux deduzido de E_pv - E_d_eff e as variáveis
+                    de energia obtidas pelo LP operacional de custo mínimo
+        'heuristica': x do passo 1 (f = f*, satisfaz R16); carports e operação da
+                      heurística (valores_heuristicos), sem LP
+        """
+        idx = self._idx
+        inicio = valores.copy()
+        binarias = self._binarias()
+        for nome in binarias:
+            inicio[idx[nome]] = np.round(inicio[idx[nome]])
+        if modo == 'passo1':
+            return inicio
+        if modo == 'heuristica':
+            return self.valores_heuristicos(x=inicio[idx['x']] > 0.5)
+        
+        # Com x e w fixos, E_pv (R5) e E_d_eff (R1) ficam determinados, e R8 só é
+        # viável com x_aux = 1 se E_pv > E_d_eff: o restante é um LP puro
+        x = inicio[idx['x']]
+        w = inicio[idx['w']]
+        E_pv = np.einsum('ltk,lk->lt', self._sh_mat[:, :, None] * self._P_k_vec[None, None, :], w)
+        x_aux = (E_pv - self._E_d_mat * x[:, None] > 0).astype(float)
+        if self.formulacao_r8 != 'big_m':
+            x_aux[:] = 0.0
+        
+        lb, ub, _ = self._limites_variaveis()
+        for nome, v in (('x', x), ('w', w), ('x_aux', x_aux)):
+            lb[idx[nome]] = v
+            ub[idx[nome]] = v
+        matriz = MatrizMILP(lb, ub, np.full(self._num_colunas, 'C'), self._blocos_restricoes(com_nomes=False))
+        
+        lp = criar_solver(matriz, 'highs' if self.backend == 'highs' else 'cplex')
+        lp.definir_objetivo(self._c_custo)
+        resultado = lp.resolver(self.time_limit, threads=self.threads)
+        if not resultado['viavel']:
+            print(f"   ⚠️  LP de reparo sem solução ({resultado['status']}): usando solução do passo 1")
+            return inicio
+        
+        reparado = resultado['valores']
+        for nome in binarias:
+            reparado[idx[nome]] = inicio[idx[nome]] if nome != 'x_aux' else x_aux
+        return reparado
+        
+    def resolver_heuristico(self, relaxacao_lp: bool = False) -> bool:
+        """
+        Plano viável sem solver MIP (modelos.heuristica), em milissegundos
+        
+        Estações pelo set cover guloso sobre L_i (prioridade de f, como no passo 1),
+        carports pelo índice de retorno (> 1) por link e operação pelo despacho de custo mínimo.
+        self.solucao tem o formato dos demais métodos, com valor_objetivo = Cin + Cop e
+        gap_% indefinido (NaN: não há limitante).
+        
+        Args:
+            relaxacao_lp: Guiar a escolha das estações pela relaxação linear do set cover
+                          (HiGHS) em vez da gulosa pura
+        """
+        titulo = 'GULOSA + ARREDONDAMENTO DE LP' if relaxacao_lp else 'GULOSA'
+        print(f"\n{'='*80}\n⚡ HEURÍSTICA {titulo}\n{'='*80}")
+        
+        t0 = time.time()
+        with self.telemetria.fase('heuristica') as registro:
+            valores = self.valores_heuristicos(relaxacao_lp=relaxacao_lp)
+            registro['status'] = 'viavel' if valores is not None else 'sem cobertura'
+        tempo = time.time() - t0
+        if valores is None:
+            print(f"\n❌ Há links sem cobertor em L_i: cobertura (R10) inviável")
+            return False
+        
+        f = float(self._c_f @ valores)
+        custo = float(self._c_custo @ valores)
+        print(f"\n✅ CONCLUÍDO: {tempo * 1000:.1f} ms | Custo: R$ {custo:,.2f} | f = {f:.6f}")
+        self._extrair_solucao(tempo, f, {'valores': valores, 'objetivo': custo, 'gap': math.nan, 'nos': 0})
+        self._imprimir_resultados()
+        return True
+        
+    def valores_heuristicos(self, x: Optional[np.ndarray] = None, relaxacao_lp: bool = False) -> Optional[np.ndarray]:
+        """
+        Vetor completo (colunas de self._idx) do plano heurístico, viável em R0-R12
+        
+        Serve de MIP start em qualquer solve do modelo completo, ex.:
+            modelo.construir('cplex')
+            modelo._solver.definir_inicio(modelo.valores_heuristicos(), 'heuristica')
+        
+        Args:
+            x: Estações fixas (booleano por link); None = set cover heurístico
+            relaxacao_lp: Ver resolver_heuristico
+        
+        Returns:
+            Vetor de valores, ou None se algum link não tem cobertor em L_i
+        """
+        if not self.modelo:
+            # Modo independente: apenas a indexação e os custos, sem construir o MILP
+            self._indexar_variaveis()
+            self._vetores_objetivo()
+        if x is None:
+            x = self._estacoes_heuristicas(relaxacao_lp)
+            if x is None:
+                return None
+        return self._valores_plano(x, self._carports_heuristicos(x))
+        
+    def _estacoes_heuristicas(self, relaxacao_lp: bool) -> Optional[np.ndarray]:
+        """Estações (booleano por link) que satisfazem R0 e R10 com f baixo; None se R10 é inviável"""
+        nL = len(self.L)
+        custos = self._rho_beta_vec
+        if self._cob_indptr is None:
+            # Sem R10, apenas R0: os min_estacoes links de menor ρβ
+            x = np.zeros(nL, dtype=bool)
+            x[np.argsort(custos, kind='stable')[:self.min_estacoes]] = True
+            return x
+        
+        indptr, indices = self._cob_indptr, self._cob_indices
+        if relaxacao_lp:
+            x = arredondar_lp(self._relaxacao_cobertura(), indptr, indices, custos, self.min_estacoes)
+        else:
+            x = cobertura_gulosa(indptr, indices, custos, self.min_estacoes)
+            # Redundantes: maior ρβ primeiro e, em empate, maior custo de instalação
+            x = remover_redundantes(x, indptr, indices, np.lexsort((-self._c_CS_vec, -custos)),
+                                    self.min_estacoes)
+        
+        coberto = np.bincount(np.repeat(np.arange(nL), np.diff(indptr)), weights=x[indices], minlength=nL) > 0
+        return x if coberto.all() else None
+        
+    def _relaxacao_cobertura(self) -> np.ndarray:
+        """x da relaxação linear de min f s.a. R0 e R10 (HiGHS, apenas |L| colunas)"""
+        nL = len(self.L)
+        blocos = [self._bloco_cobertura(np.arange(nL), com_nomes=False)]
+        if self.min_estacoes > 0:
+            blocos.append(self._bloco('R0_min_estacoes', np.arange(nL)[None, :], 1.0, 'G',
+                                      [self.min_estacoes], None))
+        matriz = MatrizMILP(np.zeros(nL), np.ones(nL), np.full(nL, 'C'), blocos)
+        lp = criar_solver(matriz, 'highs', nome='FCSA_Heuristica_LP')
+        lp.definir_objetivo(self._rho_beta_vec)
+        resultado = lp.resolver(self.time_limit, threads=self.threads)
+        print(f"   ℹ️  Relaxação linear do set cover: f ≥ {resultado['objetivo']:.6f}")
+        return resultado['valores']
+        
+    def _carports_heuristicos(self, x: np.ndarray) -> np.ndarray:
+        """
+        Carports (|L|, |K|) para as estações x (ver modelos.heuristica.escolher_carports)
+        
+        O valor do excedente exportado depende de haver déficit depois dele; os planos
+        com excedente valorado a zero e à tarifa média, e o plano sem carports, são
+        comparados pelo custo do despacho exato, e o de menor custo é mantido.
+        """
+        area = self._cp_vec * self.a
+        candidatos = [np.zeros((len(self.L), len(self.K)), dtype=bool)]
+        for valor in (0.0, float(self._c_e_vec.mean())):
+            candidatos.append(escolher_carports(x, self._E_d_mat, self._sh_mat, self._P_k_vec, self._a_k_vec,
+                                                self._c_PV_vec, area, self._c_e_vec, self.fator_vp, valor))
+        custos = [self._custo_plano(x, w) for w in candidatos]
+        return candidatos[int(np.argmin(custos))]
+        
+    def _custo_plano(self, x: np.ndarray, w: np.ndarray) -> float:
+        """Cin + Cop do plano (x, w) com a operação de custo mínimo, sem montar o vetor completo"""
+        E = despachar(x.astype(float), w, self._E_d_mat, self._sh_mat, self._P_k_vec, self._c_e_vec)['E']
+        return float(self._c_CS_vec @ x + (w @ self._c_PV_vec).sum() + self.fator_vp * (E.sum(axis=0) @ self._c_e_vec))
+        
+    def _valores_plano(self, x: np.ndarray, w: np.ndarray) -> np.ndarray:
+        """Vetor completo com x e w fixos e a operação de custo mínimo (modelos.heuristica.despachar)"""
+        idx = self._idx
+        operacao = despachar(x.astype(float), w, self._E_d_mat, self._sh_mat, self._P_k_vec, self._c_e_vec)
+        if self.formulacao_r8 != 'big_m':
+            operacao['x_aux'][:] = 0.0
+        valores = np.zeros(self._num_colunas)
+        valores[idx['x']] = x
+        valores[idx['w']] = w
+        for nome, v in operacao.items():
+            valores[idx[nome]] = v
+        return valores
+        
+    def arrays_solucao(self, valores: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Valores de cada família de variáveis com a forma de self._idx
+        
+        (|L|,) para x, (|L|,|K|) para w, (|L|,|T|) para E, E_pv, E_minus_nm, E_plus_nm,
+        E_lot, E_d_eff e x_aux, e (|T|,) para E_nm; cópias somente leitura.
+        """
+        arrays = {}
+        for nome, colunas in self._idx.items():
+            v = valores[colunas]
+            v.flags.writeable = False
+            arrays[nome] = v
+        return arrays
+        
+    @medir_fase('extracao')
+    def _extrair_solucao(self, tempo: float, f_otimo: float, resultado: Dict):
+        """
+        Extrai solução a partir do vetor de valores do solver
+        
+        O vetor completo (obtido em lote pelo backend) é fatiado uma única vez em
+        arrays por família (arrays_solucao), expostos em self.solucao['arrays'];
+        os indicadores são reduções vetoriais sobre esses arrays.
+        """
+        self._valores = resultado['valores']
+        self.solucao = self._montar_solucao(resultado['valores'], tempo, f_otimo, resultado)
+        
+    def _montar_solucao(self, z: np.ndarray, tempo: float, f_otimo: float, resultado: Dict) -> Dict:
+        """Dict solucao (indicadores e arrays por família) do vetor de valores z"""
+        v = self.arrays_solucao(z)
+        L = np.asarray(self.L)
+        
+        sel = v['x'] > 0.5
+        w = v['w'] > 0.5
+        est = L[sel].tolist()
+        pos_l, pos_k = np.nonzero(w & sel[:, None])
+        K = np.asarray(self.K)
+        cp_inst = dict(zip(L[pos_l].tolist(), K[pos_k].tolist()))
+        
+        custo_inv = float(self._c_CS_vec[sel].sum() + self._c_PV_vec[pos_k].sum())
+        E = v['E'][sel]
+        custo_op = self.fator_vp * float(E.sum(axis=0) @ self._c_e_vec)
+        
+        # Calcular links cobertos (linhas de L_i com algum cobertor instalado; sem
+        # cobertura espacial, cada estação cobre apenas o próprio link)
+        if self._cob_indptr is None:
+            coberto = sel
+        else:
+            coberto = np.bincount(np.repeat(np.arange(len(self.L)), np.diff(self._cob_indptr)),
+                                  weights=sel[self._cob_indices], minlength=len(self.L)) > 0
+        links_cobertos = L[coberto].tolist()
+        
+        return {
             'tempo_s': tempo,
-            'gap_%': self.modelo.solve_details.mip_relative_gap * 100,
-            'valor_objetivo': self.modelo.objective_value,
+            'gap_%': resultado['gap'] * 100,
+            'nos_bb': resultado.get('nos', 0),
+            'valor_objetivo': resultado['objetivo'],
             'f_otimo': f_otimo,
             'estacoes_instaladas': est,
             'num_estacoes': len(est),
@@ -447,18 +1213,73 @@ class FCSA_MILP:
             'custo_investimento': custo_inv,
             'custo_operacao_vp': custo_op,
             'custo_total': custo_inv + custo_op,
-            'energia_comprada_kwh': sum(E[l,t].solution_value for l in est for t in self.T),
-            'energia_pv_kwh': sum(E_pv[l,t].solution_value for l in est for t in self.T),
-            'energia_exportada_kwh': sum(E_plus_nm[l,t].solution_value for l in est for t in self.T),
-            'energia_importada_kwh': sum(E_minus_nm[l,t].solution_value for l in est for t in self.T),
-            'creditos_finais_kwh': E_nm[self.T[-1]].solution_value
+            'energia_comprada_kwh': float(E.sum()),
+            'energia_pv_kwh': float(v['E_pv'][sel].sum()),
+            'energia_exportada_kwh': float(v['E_plus_nm'][sel].sum()),
+            'energia_importada_kwh': float(v['E_minus_nm'][sel].sum()),
+            'creditos_finais_kwh': float(v['E_nm'][-1]),
+            'arrays': v,
         }
         
+    def _chave_plano(self, z: np.ndarray) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Plano de z: posições das estações (x) e dos carports (w) instalados"""
+        x = z[self._idx['x']] > 0.5
+        w = (z[self._idx['w']] > 0.5) & x[:, None]
+        return tuple(np.flatnonzero(x).tolist()), tuple(np.flatnonzero(w).tolist())
+        
+    def _gerar_alternativas(self, solver, n: int):
+        """
+        Até n planos distintos (estações e carports) do pool de soluções do CPLEX
+        
+        Após o solve final, populate continua a mesma árvore com um filtro de diversidade
+        sobre as binárias do plano (x e w): cada nova solução difere da ótima em ao menos
+        uma estação ou carport, com custo até gap_alternativas acima do melhor. As soluções
+        do pool são agrupadas por plano (a de menor custo de cada um). No método
+        lexicográfico todas respeitam R16 (f ≤ f*): com f* mínimo, mudar de estações só é
+        possível com empates em f, e as alternativas diferem sobretudo nos carports.
+        """
+        idx = self._idx
+        colunas = np.concatenate([idx['x'].ravel(), idx['w'].ravel()])
+        melhor = self.solucao
+        t0 = time.time()
+        with self.telemetria.fase('alternativas') as registro:
+            pool = solver.pool_solucoes(n, colunas, self._valores[colunas], self.gap_alternativas,
+                                        self.time_limit, threads=self.threads, log_output=self.log_output)
+            # Limitante do solve final (gap relativo ao incumbente, definição do CPLEX)
+            limitante = melhor['valor_objetivo'] - melhor['gap_%'] / 100 * abs(melhor['valor_objetivo'])
+            # Soluções encontradas no próprio solve ficam no pool mesmo além de relgap
+            teto = melhor['valor_objetivo'] + self.gap_alternativas * abs(melhor['valor_objetivo'])
+            planos = {self._chave_plano(self._valores): melhor}
+            for sol in pool:
+                if len(planos) >= n or sol['objetivo'] > teto + 1e-6:
+                    break
+                chave = self._chave_plano(sol['valores'])
+                if chave in planos:
+                    continue
+                gap = abs(sol['objetivo'] - limitante) / max(abs(sol['objetivo']), 1e-10)
+                planos[chave] = self._montar_solucao(
+                    sol['valores'], melhor['tempo_s'] + time.time() - t0, float(self._c_f @ sol['valores']),
+                    {'objetivo': sol['objetivo'], 'gap': gap, 'nos': melhor['nos_bb']})
+            self.alternativas = list(planos.values())
+            registro.update(status=f'{len(self.alternativas)} planos ({len(pool)} soluções no pool)')
+        
+    def _imprimir_alternativas(self):
+        """Tabela dos planos alternativos (custo e diferença em relação ao melhor)"""
+        melhor = self.alternativas[0]['valor_objetivo']
+        print(f"\n🔀 PLANOS ALTERNATIVOS ({len(self.alternativas)}, pool de soluções):")
+        print(f"   {'#':>2} | {'Objetivo (R$)':>16} | {'Δ':>7} | {'f':>10} | Estações → carports (link: tipo)")
+        for i, s in enumerate(self.alternativas, 1):
+            delta = 100 * (s['valor_objetivo'] - melhor) / max(abs(melhor), 1e-10)
+            carports = ', '.join(f"{l}: {k}" for l, k in s['carports_instalados'].items())
+            print(f"   {i:>2} | {s['valor_objetivo']:>16,.2f} | {delta:>6.2f}% | {s['f_otimo']:>10.4f} | "
+                  f"{s['estacoes_instaladas']} → {{{carports}}}")
+        
     def _imprimir_resultados(self):
         """Imprime resultados"""
         s = self.solucao
         print(f"\n{'='*80}\n📊 SOLUÇÃO FINAL (MODELO EXATO CAIO)\n{'='*80}")
-        print(f"⏱️  Tempo total: {s['tempo_s']:.2f}s | Gap: {s['gap_%']:.2f}%")
+        gap = f"{s['gap_%']:.2f}%" if math.isfinite(s['gap_%']) else 'sem limitante (heurística)'
+        print(f"⏱️  Tempo total: {s['tempo_s']:.2f}s | Gap: {gap}")
         print(f"💰 Custo total: R$ {s['custo_total']:,.2f}")
         print(f"📊 f* = {s['f_otimo']:.6f}\n")
         
@@ -479,6 +1300,8 @@ class FCSA_MILP:
         print(f"   📤 Exportada NM: {s['energia_exportada_kwh']:,.0f} kWh")
         print(f"   📥 Importada NM: {s['energia_importada_kwh']:,.0f} kWh")
         print(f"   💾 Créditos finais: {s['creditos_finais_kwh']:,.0f} kWh")
+        if self.alternativas:
+            self._imprimir_alternativas()
         print(f"{'='*80}")
 
 
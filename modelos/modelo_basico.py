@@ -255,11 +255,13 @@ Modelo de localización de electropostos con matriz de conectividad
 """
 
 import numpy as np
-from docplex.mp.model import Model
 import time
 
+from modelos.solvers import BACKENDS, ConstrutorMILP, criar_solver
+
 class ModeloEletropostos:
-    def __init__(self, coordenadas, demandas, capacidades_electropostos, custos_instalacao, max_distancia=50):
+    def __init__(self, coordenadas, demandas, capacidades_electropostos, custos_instalacao, max_distancia=50,
+                 solver='docplex'):
         """
         Inicializa el modelo de electropostos
         
@@ -269,12 +271,18 @@ class ModeloEletropostos:
             capacidades_electropostos: Lista con capacidad específica de cada posible electroposto
             custos_instalacao: Lista con costo de instalación específico de cada electroposto
             max_distancia: Distancia máxima de servicio (km)
+            solver: Backend de optimización ('docplex', 'cplex' o 'highs')
         """
+        if solver not in BACKENDS:
+            raise ValueError(f"Solver inválido: {solver} (opciones: {', '.join(BACKENDS)})")
+        
         self.coordenadas = coordenadas
         self.demandas = demandas
         self.capacidades = capacidades_electropostos
         self.custos_instalacao = custos_instalacao
         self.max_distancia = max_distancia
+        self.solver = solver
+        self.time_limit = None  # Límite de tiempo del solver (s); None = sin límite
         self.n_nodos = len(coordenadas)
         
         # Validaciones
@@ -329,25 +337,19 @@ class ModeloEletropostos:
         """Resuelve el modelo de optimización"""
         inicio = time.time()
         
-        # Crear modelo
-        self.modelo = Model('Electropostos')
+        # Crear modelo (matriz independiente del solver)
+        cm = ConstrutorMILP()
         
         # Variables de decisión
         # x[j] = 1 si se instala electroposto en nodo j
-        x = self.modelo.binary_var_dict(range(self.n_nodos), name='x')
+        x = cm.adicionar_variaveis(self.n_nodos, 'B', nomes=[f'x_{j}' for j in range(self.n_nodos)])
         
         # y[i,j] = 1 si nodo i es atendido por electroposto en j
         # Solo crear variables para conexiones factibles
-        variables_y = {}
-        for i in range(self.n_nodos):
-            for j in range(self.n_nodos):
-                if self.conectividad[i][j] == 1:
-                    variables_y[(i, j)] = self.modelo.binary_var(name=f'y_{i}_{j}')
-        
-        # Función objetivo: minimizar costo total de instalación
-        self.modelo.minimize(
-            self.modelo.sum(self.custos_instalacao[j] * x[j] for j in range(self.n_nodos))
-        )
+        pares = [(i, j) for i in range(self.n_nodos) for j in range(self.n_nodos)
+                 if self.conectividad[i][j] == 1]
+        colunas_y = cm.adicionar_variaveis(len(pares), 'B', nomes=[f'y_{i}_{j}' for i, j in pares])
+        variables_y = dict(zip(pares, colunas_y))
         
         # Restricciones
         
@@ -359,58 +361,56 @@ class ModeloEletropostos:
                     conexiones_posibles.append(variables_y[(i, j)])
             
             if conexiones_posibles:
-                self.modelo.add_constraint(
-                    self.modelo.sum(conexiones_posibles) == 1,
-                    ctname=f'atendimento_nodo_{i}'
-                )
+                cm.adicionar_restricao(conexiones_posibles, [1] * len(conexiones_posibles), 'E', 1,
+                                       f'atendimento_nodo_{i}')
             else:
                 print(f"⚠️  ADVERTENCIA: Nodo {i} no puede ser atendido por ningún electroposto")
         
         # 2. Solo se puede atender desde electropostos instalados
-        for i in range(self.n_nodos):
-            for j in range(self.n_nodos):
-                if self.conectividad[i][j] == 1:
-                    self.modelo.add_constraint(
-                        variables_y[(i, j)] <= x[j],
-                        ctname=f'instalacao_{i}_{j}'
-                    )
+        for (i, j), y in variables_y.items():
+            cm.adicionar_restricao([y, x[j]], [1, -1], 'L', 0, f'instalacao_{i}_{j}')
         
         # 3. Restricción de capacidad específica por electroposto
         for j in range(self.n_nodos):
-            demandas_atendidas = []
-            for i in range(self.n_nodos):
-                if self.conectividad[i][j] == 1:
-                    demandas_atendidas.append(self.demandas[i] * variables_y[(i, j)])
+            nodos = [i for i in range(self.n_nodos) if self.conectividad[i][j] == 1]
             
-            if demandas_atendidas:
-                self.modelo.add_constraint(
-                    self.modelo.sum(demandas_atendidas) <= self.capacidades[j],
-                    ctname=f'capacidad_especifica_{j}'
-                )
+            if nodos:
+                cm.adicionar_restricao([variables_y[(i, j)] for i in nodos],
+                                       [self.demandas[i] for i in nodos], 'L', self.capacidades[j],
+                                       f'capacidad_especifica_{j}')
+        
+        self.modelo = criar_solver(cm.matriz(), self.solver, nome='Electropostos')
+        
+        # Función objetivo: minimizar costo total de instalación
+        c = np.zeros(cm.num_colunas)
+        c[x] = self.custos_instalacao
+        self.modelo.definir_objetivo(c)
         
         # Resolver
-        print(f"\n🔍 RESOLVIENDO MODELO:")
+        print(f"\n🔍 RESOLVIENDO MODELO ({self.solver}):")
         print(f"   • Variables binarias: {len(x) + len(variables_y)}")
-        print(f"   • Restricciones: ~{len(x) + len(variables_y) + self.n_nodos}")
+        print(f"   • Restricciones: {self.modelo.num_linhas}")
         
-        solucion = self.modelo.solve()
+        solucion = self.modelo.resolver(self.time_limit)
         
         self.tiempo_solucion = time.time() - inicio
         
-        if solucion:
-            self._extraer_resultados(x, variables_y)
+        if solucion['viavel']:
+            self._extraer_resultados(x, variables_y, solucion)
             return True
         else:
             print("❌ No se encontró solución factible")
             self._diagnosticar_infactibilidad()
             return False
     
-    def _extraer_resultados(self, x, variables_y):
+    def _extraer_resultados(self, x, variables_y, solucion):
         """Extrae los resultados de la solución"""
+        valores = solucion['valores']
+        
         # Electropostos instalados
         self.electropostos_instalados = []
         for j in range(self.n_nodos):
-            if x[j].solution_value > 0.5:
+            if valores[x[j]] > 0.5:
                 self.electropostos_instalados.append(j)
         
         # Asignaciones
@@ -420,7 +420,7 @@ class ModeloEletropostos:
             demanda_atendida = 0
             
             for i in range(self.n_nodos):
-                if self.conectividad[i][j] == 1 and variables_y[(i, j)].solution_value > 0.5:
+                if self.conectividad[i][j] == 1 and valores[variables_y[(i, j)]] > 0.5:
                     self.asignaciones[j].append(i)
                     demanda_atendida += self.demandas[i]
             
@@ -428,7 +428,7 @@ class ModeloEletropostos:
                   f"(demanda: {demanda_atendida:.1f}/{self.capacidades[j]})")
         
         # Costo total
-        self.costo_total = self.modelo.objective_value
+        self.costo_total = solucion['objetivo']
     
     def _diagnosticar_infactibilidad(self):
         """Diagnostica por qué el modelo puede ser infactible"""
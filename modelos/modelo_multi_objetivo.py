@@ -3,13 +3,14 @@ Modelo de localização de eletropostos com múltiplos objetivos
 """
 
 import numpy as np
-from docplex.mp.model import Model
 import time
 
+from modelos.solvers import BACKENDS, ConstrutorMILP, criar_solver
+
 class ModeloEletropostosMultiObjetivo:
     def __init__(self, coordenadas, demandas, capacidades_eletropostos, custos_instalacao, 
                  distancia_maxima=50, tipo_objetivo='minimizar_custo', orcamento_maximo=None, 
-                 pesos=(0.6, 0.4)):
+                 pesos=(0.6, 0.4), solver='docplex'):
         """
         Inicializa o modelo multi-objetivo de eletropostos
         
@@ -22,6 +23,7 @@ class ModeloEletropostosMultiObjetivo:
             tipo_objetivo: 'minimizar_custo', 'maximizar_cobertura', 'multi_objetivo'
             orcamento_maximo: Orçamento máximo disponível (para maximizar cobertura)
             pesos: (peso_cobertura, peso_custo) para multi-objetivo
+            solver: Backend de otimização ('docplex', 'cplex' ou 'highs')
         """
         self.coordenadas = coordenadas
         self.demandas = demandas
@@ -31,6 +33,8 @@ class ModeloEletropostosMultiObjetivo:
         self.tipo_objetivo = tipo_objetivo
         self.orcamento_maximo = orcamento_maximo
         self.pesos = pesos
+        self.solver = solver
+        self.time_limit = None  # Limite de tempo do solver (s); None = sem limite
         self.n_nos = len(coordenadas)
         
         # Validações
@@ -41,6 +45,9 @@ class ModeloEletropostosMultiObjetivo:
         if tipo_objetivo == 'maximizar_cobertura' and orcamento_maximo is None:
             raise ValueError("Orçamento máximo requerido para maximizar cobertura")
         
+        if solver not in BACKENDS:
+            raise ValueError(f"Solver inválido: {solver} (opções: {', '.join(BACKENDS)})")
+        
         if tipo_objetivo == 'multi_objetivo':
             assert len(pesos) == 2 and abs(sum(pesos) - 1.0) < 0.01, "Pesos devem somar 1.0"
         
@@ -88,7 +95,7 @@ class ModeloEletropostosMultiObjetivo:
     
     def resolver(self):
         """Resolve o modelo conforme o tipo de objetivo selecionado"""
-        print(f"\n RESOLVENDO MODELO: {self.tipo_objetivo.upper()}")
+        print(f"\n RESOLVENDO MODELO: {self.tipo_objetivo.upper()} ({self.solver})")
         
         if self.tipo_objetivo == 'minimizar_custo':
             return self._resolver_minimizar_custo()
@@ -99,35 +106,45 @@ class ModeloEletropostosMultiObjetivo:
         else:
             raise ValueError(f"Tipo de objetivo não válido: {self.tipo_objetivo}")
     
+    def _criar_variaveis(self, cm, com_z=False):
+        """Cria as variáveis x[j], y[i,j] (apenas conexões factíveis) e, opcionalmente, z[i]"""
+        x = cm.adicionar_variaveis(self.n_nos, 'B', nomes=[f'x_{j}' for j in range(self.n_nos)])
+        z = cm.adicionar_variaveis(self.n_nos, 'B', nomes=[f'z_{i}' for i in range(self.n_nos)]) if com_z else None
+        
+        pares = [(i, j) for i in range(self.n_nos) for j in range(self.n_nos)
+                 if self.conectividade[i][j] == 1]
+        colunas_y = cm.adicionar_variaveis(len(pares), 'B', nomes=[f'y_{i}_{j}' for i, j in pares])
+        variaveis_y = dict(zip(pares, colunas_y))
+        return x, variaveis_y, z
+    
+    def _resolver_matriz(self, cm, nome, c, maximizar=False):
+        """Instancia o backend escolhido, define o objetivo c·z e resolve"""
+        self.modelo = criar_solver(cm.matriz(), self.solver, nome=nome)
+        self.modelo.definir_objetivo(-c if maximizar else c)
+        return self.modelo.resolver(self.time_limit)
+    
     def _resolver_minimizar_custo(self):
         """Minimiza custo de instalação atendendo toda a demanda"""
         inicio = time.time()
         
-        self.modelo = Model('Eletropostos_MinCusto')
+        cm = ConstrutorMILP()
         
         # Variáveis de decisão
-        x = self.modelo.binary_var_dict(range(self.n_nos), name='x')
+        x, variaveis_y, _ = self._criar_variaveis(cm)
         
-        variaveis_y = {}
-        for i in range(self.n_nos):
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    variaveis_y[(i, j)] = self.modelo.binary_var(name=f'y_{i}_{j}')
+        # Restrições
+        self._adicionar_restricoes_basicas(cm, x, variaveis_y)
         
         # Função objetivo: minimizar custo
-        self.modelo.minimize(
-            self.modelo.sum(self.custos_instalacao[j] * x[j] for j in range(self.n_nos))
-        )
-        
-        # Restrições
-        self._adicionar_restricoes_basicas(x, variaveis_y)
+        c = np.zeros(cm.num_colunas)
+        c[x] = self.custos_instalacao
         
         # Resolver
-        solucao = self.modelo.solve()
+        solucao = self._resolver_matriz(cm, 'Eletropostos_MinCusto', c)
         self.tempo_solucao = time.time() - inicio
         
-        if solucao:
-            self._extrair_resultados(x, variaveis_y)
+        if solucao['viavel']:
+            self._extrair_resultados(x, variaveis_y, solucao)
             self.valor_objetivo = self.custo_total
             return True
         return False
@@ -136,74 +153,29 @@ class ModeloEletropostosMultiObjetivo:
         """Maximiza cobertura de demanda com orçamento limitado"""
         inicio = time.time()
         
-        self.modelo = Model('Eletropostos_MaxCobertura')
+        cm = ConstrutorMILP()
         
-        # Variáveis de decisão
-        x = self.modelo.binary_var_dict(range(self.n_nos), name='x')
-        
-        # Variável para demanda atendida por nó
-        z = self.modelo.binary_var_dict(range(self.n_nos), name='z')
-        
-        variaveis_y = {}
-        for i in range(self.n_nos):
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    variaveis_y[(i, j)] = self.modelo.binary_var(name=f'y_{i}_{j}')
-        
-        # Função objetivo: maximizar demanda atendida
-        self.modelo.maximize(
-            self.modelo.sum(self.demandas[i] * z[i] for i in range(self.n_nos))
-        )
+        # Variáveis de decisão (z[i] = demanda atendida por nó)
+        x, variaveis_y, z = self._criar_variaveis(cm, com_z=True)
         
         # Restrições
         
         # 1. Orçamento máximo
-        self.modelo.add_constraint(
-            self.modelo.sum(self.custos_instalacao[j] * x[j] for j in range(self.n_nos)) <= self.orcamento_maximo,
-            ctname='orcamento_maximo'
-        )
+        cm.adicionar_restricao(x, self.custos_instalacao, 'L', self.orcamento_maximo, 'orcamento_maximo')
         
-        # 2. Um nó está atendido se algum eletroposto o atende
-        for i in range(self.n_nos):
-            conexoes_possiveis = []
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    conexoes_possiveis.append(variaveis_y[(i, j)])
-            
-            if conexoes_possiveis:
-                self.modelo.add_constraint(
-                    z[i] <= self.modelo.sum(conexoes_possiveis),
-                    ctname=f'atendimento_no_{i}'
-                )
-        
-        # 3. Só pode atender de eletropostos instalados
-        for i in range(self.n_nos):
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    self.modelo.add_constraint(
-                        variaveis_y[(i, j)] <= x[j],
-                        ctname=f'instalacao_{i}_{j}'
-                    )
+        # 2-4. Atendimento, instalação e capacidade
+        self._adicionar_restricoes_cobertura(cm, x, variaveis_y, z)
         
-        # 4. Restrição de capacidade
-        for j in range(self.n_nos):
-            demandas_atendidas = []
-            for i in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    demandas_atendidas.append(self.demandas[i] * variaveis_y[(i, j)])
-            
-            if demandas_atendidas:
-                self.modelo.add_constraint(
-                    self.modelo.sum(demandas_atendidas) <= self.capacidades[j],
-                    ctname=f'capacidade_{j}'
-                )
+        # Função objetivo: maximizar demanda atendida
+        c = np.zeros(cm.num_colunas)
+        c[z] = self.demandas
         
         # Resolver
-        solucao = self.modelo.solve()
+        solucao = self._resolver_matriz(cm, 'Eletropostos_MaxCobertura', c, maximizar=True)
         self.tempo_solucao = time.time() - inicio
         
-        if solucao:
-            self._extrair_resultados_cobertura(x, variaveis_y, z)
+        if solucao['viavel']:
+            self._extrair_resultados_cobertura(x, variaveis_y, z, solucao)
             self.valor_objetivo = self.cobertura_total
             return True
         return False
@@ -212,151 +184,87 @@ class ModeloEletropostosMultiObjetivo:
         """Resolve modelo com função objetivo ponderada"""
         inicio = time.time()
         
-        self.modelo = Model('Eletropostos_MultiObjetivo')
+        cm = ConstrutorMILP()
         
         # Variáveis de decisão
-        x = self.modelo.binary_var_dict(range(self.n_nos), name='x')
-        z = self.modelo.binary_var_dict(range(self.n_nos), name='z')
-        
-        variaveis_y = {}
-        for i in range(self.n_nos):
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    variaveis_y[(i, j)] = self.modelo.binary_var(name=f'y_{i}_{j}')
-        
-        # Função objetivo ponderada (normalizada)
-        peso_cobertura, peso_custo = self.pesos
-        
-        cobertura_normalizada = self.modelo.sum(self.demandas[i] * z[i] for i in range(self.n_nos)) / self.demanda_total
-        custo_normalizado = self.modelo.sum(self.custos_instalacao[j] * x[j] for j in range(self.n_nos)) / self.custo_total_maximo
-        
-        # Maximizar cobertura e minimizar custo
-        self.modelo.maximize(
-            peso_cobertura * cobertura_normalizada - peso_custo * custo_normalizado
-        )
+        x, variaveis_y, z = self._criar_variaveis(cm, com_z=True)
         
         # Restrições similares a maximizar cobertura mas sem limite de orçamento
+        self._adicionar_restricoes_cobertura(cm, x, variaveis_y, z)
         
-        # 1. Um nó está atendido se algum eletroposto o atende
-        for i in range(self.n_nos):
-            conexoes_possiveis = []
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    conexoes_possiveis.append(variaveis_y[(i, j)])
-            
-            if conexoes_possiveis:
-                self.modelo.add_constraint(
-                    z[i] <= self.modelo.sum(conexoes_possiveis),
-                    ctname=f'atendimento_no_{i}'
-                )
-        
-        # 2. Só pode atender de eletropostos instalados
-        for i in range(self.n_nos):
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    self.modelo.add_constraint(
-                        variaveis_y[(i, j)] <= x[j],
-                        ctname=f'instalacao_{i}_{j}'
-                    )
-        
-        # 3. Restrição de capacidade
-        for j in range(self.n_nos):
-            demandas_atendidas = []
-            for i in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    demandas_atendidas.append(self.demandas[i] * variaveis_y[(i, j)])
-            
-            if demandas_atendidas:
-                self.modelo.add_constraint(
-                    self.modelo.sum(demandas_atendidas) <= self.capacidades[j],
-                    ctname=f'capacidade_{j}'
-                )
+        # Função objetivo ponderada (normalizada):
+        # maximizar peso_cobertura·cobertura/demanda_total - peso_custo·custo/custo_total_maximo
+        peso_cobertura, peso_custo = self.pesos
+        c = np.zeros(cm.num_colunas)
+        c[z] = peso_cobertura * np.asarray(self.demandas, dtype=float) / self.demanda_total
+        c[x] = -peso_custo * np.asarray(self.custos_instalacao, dtype=float) / self.custo_total_maximo
         
         # Resolver
-        solucao = self.modelo.solve()
+        solucao = self._resolver_matriz(cm, 'Eletropostos_MultiObjetivo', c, maximizar=True)
         self.tempo_solucao = time.time() - inicio
         
-        if solucao:
-            self._extrair_resultados_cobertura(x, variaveis_y, z)
+        if solucao['viavel']:
+            self._extrair_resultados_cobertura(x, variaveis_y, z, solucao)
             self.valor_objetivo = peso_cobertura * (self.cobertura_total / self.demanda_total) - peso_custo * (self.custo_total / self.custo_total_maximo)
             return True
         return False
     
-    def _adicionar_restricoes_basicas(self, x, variaveis_y):
+    def _adicionar_restricoes_basicas(self, cm, x, variaveis_y):
         """Adiciona restrições básicas para minimizar custo"""
         # 1. Todo nó deve ser atendido
         for i in range(self.n_nos):
-            conexoes_possiveis = []
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    conexoes_possiveis.append(variaveis_y[(i, j)])
+            conexoes_possiveis = [variaveis_y[(i, j)] for j in range(self.n_nos)
+                                  if self.conectividade[i][j] == 1]
             
             if conexoes_possiveis:
-                self.modelo.add_constraint(
-                    self.modelo.sum(conexoes_possiveis) == 1,
-                    ctname=f'atendimento_no_{i}'
-                )
+                cm.adicionar_restricao(conexoes_possiveis, [1] * len(conexoes_possiveis), 'E', 1,
+                                       f'atendimento_no_{i}')
         
         # 2. Só pode atender de eletropostos instalados
+        # 3. Restrição de capacidade
+        self._adicionar_restricoes_instalacao_capacidade(cm, x, variaveis_y)
+    
+    def _adicionar_restricoes_cobertura(self, cm, x, variaveis_y, z):
+        """Adiciona restrições para maximizar cobertura ou multi-objetivo"""
+        # Um nó está atendido se algum eletroposto o atende: z[i] <= Σj y[i,j]
         for i in range(self.n_nos):
-            for j in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    self.modelo.add_constraint(
-                        variaveis_y[(i, j)] <= x[j],
-                        ctname=f'instalacao_{i}_{j}'
-                    )
+            conexoes_possiveis = [variaveis_y[(i, j)] for j in range(self.n_nos)
+                                  if self.conectividade[i][j] == 1]
+            
+            if conexoes_possiveis:
+                cm.adicionar_restricao([z[i]] + conexoes_possiveis, [1] + [-1] * len(conexoes_possiveis),
+                                       'L', 0, f'atendimento_no_{i}')
         
-        # 3. Restrição de capacidade
+        self._adicionar_restricoes_instalacao_capacidade(cm, x, variaveis_y)
+    
+    def _adicionar_restricoes_instalacao_capacidade(self, cm, x, variaveis_y):
+        """y[i,j] <= x[j] e Σi demanda[i]·y[i,j] <= capacidade[j]"""
+        # Só pode atender de eletropostos instalados
+        for (i, j), y in variaveis_y.items():
+            cm.adicionar_restricao([y, x[j]], [1, -1], 'L', 0, f'instalacao_{i}_{j}')
+        
+        # Restrição de capacidade
         for j in range(self.n_nos):
-            demandas_atendidas = []
-            for i in range(self.n_nos):
-                if self.conectividade[i][j] == 1:
-                    demandas_atendidas.append(self.demandas[i] * variaveis_y[(i, j)])
+            nos = [i for i in range(self.n_nos) if self.conectividade[i][j] == 1]
             
-            if demandas_atendidas:
-                self.modelo.add_constraint(
-                    self.modelo.sum(demandas_atendidas) <= self.capacidades[j],
-                    ctname=f'capacidade_{j}'
-                )
+            if nos:
+                cm.adicionar_restricao([variaveis_y[(i, j)] for i in nos],
+                                       [self.demandas[i] for i in nos], 'L', self.capacidades[j],
+                                       f'capacidade_{j}')
     
-    def _extrair_resultados(self, x, variaveis_y):
+    def _extrair_resultados(self, x, variaveis_y, solucao):
         """Extrai resultados para minimizar custo"""
-        # Eletropostos instalados
-        self.eletropostos_instalados = []
-        for j in range(self.n_nos):
-            if x[j].solution_value > 0.5:
-                self.eletropostos_instalados.append(j)
-        
-        # Atribuições
-        self.atribuicoes = {}
-        for j in self.eletropostos_instalados:
-            self.atribuicoes[j] = []
-            
-            for i in range(self.n_nos):
-                if self.conectividade[i][j] == 1 and variaveis_y[(i, j)].solution_value > 0.5:
-                    self.atribuicoes[j].append(i)
+        self._extrair_atribuicoes(x, variaveis_y, solucao['valores'])
         
         # Cálculos
-        self.custo_total = self.modelo.objective_value
+        self.custo_total = solucao['objetivo']
         self.cobertura_total = self.demanda_total  # 100% cobertura
         self.cobertura_percentual = 100.0
     
-    def _extrair_resultados_cobertura(self, x, variaveis_y, z):
+    def _extrair_resultados_cobertura(self, x, variaveis_y, z, solucao):
         """Extrai resultados para maximizar cobertura ou multi-objetivo"""
-        # Eletropostos instalados
-        self.eletropostos_instalados = []
-        for j in range(self.n_nos):
-            if x[j].solution_value > 0.5:
-                self.eletropostos_instalados.append(j)
-        
-        # Atribuições
-        self.atribuicoes = {}
-        for j in self.eletropostos_instalados:
-            self.atribuicoes[j] = []
-            
-            for i in range(self.n_nos):
-                if self.conectividade[i][j] == 1 and variaveis_y[(i, j)].solution_value > 0.5:
-                    self.atribuicoes[j].append(i)
+        valores = solucao['valores']
+        self._extrair_atribuicoes(x, variaveis_y, valores)
         
         # Cálculos
         self.custo_total = sum(self.custos_instalacao[j] for j in self.eletropostos_instalados)
@@ -364,12 +272,27 @@ class ModeloEletropostosMultiObjetivo:
         # Cobertura
         nos_atendidos = []
         for i in range(self.n_nos):
-            if z[i].solution_value > 0.5:
+            if valores[z[i]] > 0.5:
                 nos_atendidos.append(i)
         
         self.cobertura_total = sum(self.demandas[i] for i in nos_atendidos)
         self.cobertura_percentual = (self.cobertura_total / self.demanda_total) * 100
     
+    def _extrair_atribuicoes(self, x, variaveis_y, valores):
+        """Eletropostos instalados e nós atribuídos a cada um"""
+        self.eletropostos_instalados = []
+        for j in range(self.n_nos):
+            if valores[x[j]] > 0.5:
+                self.eletropostos_instalados.append(j)
+        
+        self.atribuicoes = {}
+        for j in self.eletropostos_instalados:
+            self.atribuicoes[j] = []
+            
+            for i in range(self.n_nos):
+                if self.conectividade[i][j] == 1 and valores[variaveis_y[(i, j)]] > 0.5:
+                    self.atribuicoes[j].append(i)
+    
     def obter_resumo(self):
         """Retorna resumo dos resultados"""
         return {
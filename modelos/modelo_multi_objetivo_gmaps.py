@@ -17,7 +17,8 @@ class ModeloEletropostosGoogleMaps(ModeloEletropostosMultiObjetivo):
                  tipo_objetivo: str = 'minimizar_custo',
                  orcamento_maximo: Optional[float] = None,
                  pesos: Tuple[float, float] = (0.6, 0.4),
-                 google_maps_api_key: Optional[str] = None):
+                 google_maps_api_key: Optional[str] = None,
+                 solver: str = 'docplex'):
         """
         Inicializa modelo com Google Maps
         
@@ -43,7 +44,8 @@ class ModeloEletropostosGoogleMaps(ModeloEletropostosMultiObjetivo):
             distancia_maxima=distancia_maxima,
             tipo_objetivo=tipo_objetivo,
             orcamento_maximo=orcamento_maximo,
-            pesos=pesos
+            pesos=pesos,
+            solver=solver
         )
     
     def _calcular_distancia(self, i: int, j: int) -> float:
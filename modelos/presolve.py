@@ -0,0 +1,211 @@
+"""
+Presolve estrutural para modelos MILP em forma matricial
+Elimina colunas definidas por expressões lineares exatas (z_j = Σ s·z_k + s0),
+substituindo-as em todas as linhas, e remove as linhas que apenas as definiam.
+
+As substituições são informadas pelo modelo (conhecimento estrutural), por exemplo
+E_d_eff[l,t] = E_d[l,t]·x[l]. Cabe ao modelo garantir que a expressão respeite os
+limites da coluna eliminada (ex.: soma de termos não negativos para colunas com lb = 0).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from modelos.solvers import MatrizMILP
+
+
+class Presolve:
+    """
+    Mapeamento entre o espaço completo de colunas e o espaço reduzido
+
+    Atributos:
+        matriz:    MatrizMILP reduzida (apenas colunas mantidas, sem as linhas de definição)
+        mantidas:  Colunas completas mantidas, na ordem das colunas reduzidas
+        eliminadas: Colunas completas eliminadas
+    """
+
+    def __init__(self, matriz: MatrizMILP, eliminadas: np.ndarray, expr_indptr: np.ndarray,
+                 expr_indices: np.ndarray, expr_data: np.ndarray, constantes: np.ndarray,
+                 linhas_removidas: np.ndarray):
+        """
+        Args:
+            matriz: Modelo completo
+            eliminadas: Colunas eliminadas (m,)
+            expr_indptr, expr_indices, expr_data: Expressões das colunas eliminadas em CSR
+                (m linhas sobre colunas completas, todas mantidas)
+            constantes: Termo constante s0 de cada expressão (m,)
+            linhas_removidas: Índices das linhas de definição a remover
+        """
+        n = matriz.num_colunas
+        self.n_completo = n
+        self.eliminadas = np.asarray(eliminadas, dtype=np.int64)
+        mantida = np.ones(n, dtype=bool)
+        mantida[self.eliminadas] = False
+        self.mantidas = np.flatnonzero(mantida)
+
+        self._pos = np.full(n, -1, dtype=np.int64)
+        self._pos[self.mantidas] = np.arange(len(self.mantidas))
+        self._pos_elim = np.full(n, -1, dtype=np.int64)
+        self._pos_elim[self.eliminadas] = np.arange(len(self.eliminadas))
+
+        nao_nulo = expr_data != 0
+        linhas_expr = np.repeat(np.arange(len(self.eliminadas)), np.diff(expr_indptr))
+        self._expr_linha = linhas_expr[nao_nulo]
+        self._expr_col = np.asarray(expr_indices, dtype=np.int64)[nao_nulo]
+        self._expr_val = np.asarray(expr_data, dtype=float)[nao_nulo]
+        self._expr_ptr = np.concatenate(([0], np.cumsum(np.bincount(self._expr_linha, minlength=len(self.eliminadas)))))
+        self.constantes = np.asarray(constantes, dtype=float)
+
+        if (self._pos[self._expr_col] < 0).any():
+            raise ValueError("Expressões de substituição devem usar apenas colunas mantidas")
+
+        self.matriz = self._reduzir(matriz, np.asarray(linhas_removidas, dtype=np.int64))
+        self.reducao = {
+            'colunas': (matriz.num_colunas, self.matriz.num_colunas),
+            'linhas': (matriz.num_linhas, self.matriz.num_linhas),
+            'nnz': (matriz.nnz, self.matriz.nnz),
+        }
+
+    def _substituir(self, linhas: np.ndarray, colunas: np.ndarray, valores: np.ndarray):
+        """
+        Substitui as colunas eliminadas das entradas (linhas, colunas, valores)
+
+        Retorna as entradas no espaço reduzido (somando duplicatas) e os termos
+        constantes gerados, como par (linhas, valores).
+        """
+        k = self._pos_elim[colunas]
+        fica = k < 0
+
+        # Expandir cada entrada eliminada nos termos da sua expressão
+        k_el, lin_el, val_el = k[~fica], linhas[~fica], valores[~fica]
+        tamanhos = self._expr_ptr[k_el + 1] - self._expr_ptr[k_el]
+        origem = np.repeat(np.arange(len(k_el)), tamanhos)
+        deslocamento = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+        posicao = self._expr_ptr[k_el][origem] + deslocamento
+
+        lin = np.concatenate([linhas[fica], lin_el[origem]])
+        col = np.concatenate([colunas[fica], self._expr_col[posicao]])
+        val = np.concatenate([valores[fica], val_el[origem] * self._expr_val[posicao]])
+        constantes = (lin_el, val_el * self.constantes[k_el])
+
+        # Somar entradas repetidas (linha, coluna) e descartar zeros
+        col = self._pos[col]
+        chave = lin * self.n_completo + col
+        unicas, inverso = np.unique(chave, return_inverse=True)
+        soma = np.bincount(inverso, weights=val, minlength=len(unicas))
+        nao_nulo = soma != 0
+        return (unicas[nao_nulo] // self.n_completo, unicas[nao_nulo] % self.n_completo,
+                soma[nao_nulo], constantes)
+
+    def _reduzir(self, matriz: MatrizMILP, linhas_removidas: np.ndarray) -> MatrizMILP:
+        """Aplica as substituições a todas as linhas mantidas do modelo completo"""
+        mantida = np.ones(matriz.num_linhas, dtype=bool)
+        mantida[linhas_removidas] = False
+        nova_linha = np.cumsum(mantida) - 1
+
+        linhas = np.repeat(np.arange(matriz.num_linhas), np.diff(matriz.indptr))
+        sel = mantida[linhas]
+        lin, col, val, (lin_c, val_c) = self._substituir(
+            nova_linha[linhas[sel]], matriz.indices[sel], matriz.data[sel]
+        )
+
+        n_linhas = int(mantida.sum())
+        rhs = matriz.rhs[mantida] - np.bincount(lin_c, weights=val_c, minlength=n_linhas)
+        bloco = {
+            'indptr': np.concatenate(([0], np.cumsum(np.bincount(lin, minlength=n_linhas)))),
+            'indices': col,
+            'data': val,
+            'sentido': matriz.sentidos[mantida],
+            'rhs': rhs,
+            'nomes': [nome for nome, m in zip(matriz.nomes, mantida) if m] if matriz.nomes else None,
+        }
+        nomes_colunas = ([matriz.nomes_colunas[j] for j in self.mantidas]
+                         if matriz.nomes_colunas else None)
+        return MatrizMILP(matriz.lb[self.mantidas], matriz.ub[self.mantidas],
+                          matriz.tipos[self.mantidas], [bloco], nomes_colunas)
+
+    def reduzir_linha(self, ind: np.ndarray, val: np.ndarray):
+        """Linha esparsa no espaço completo → (ind, val, constante) no espaço reduzido"""
+        ind = np.asarray(ind, dtype=np.int64)
+        _, col, v, (_, val_c) = self._substituir(np.zeros(len(ind), dtype=np.int64), ind,
+                                                 np.asarray(val, dtype=float))
+        return col, v, float(val_c.sum())
+
+    def reduzir_objetivo(self, c: np.ndarray):
+        """Vetor de custos completo → (custos reduzidos, constante)"""
+        ind = np.flatnonzero(c)
+        col, v, constante = self.reduzir_linha(ind, c[ind])
+        c_red = np.zeros(len(self.mantidas))
+        c_red[col] = v
+        return c_red, constante
+
+    def posicoes(self, colunas: np.ndarray) -> np.ndarray:
+        """Colunas completas mantidas → posições no modelo reduzido"""
+        posicoes = self._pos[np.asarray(colunas, dtype=np.int64)]
+        if (posicoes < 0).any():
+            raise ValueError("Colunas eliminadas no presolve não têm posição no modelo reduzido")
+        return posicoes
+
+    def expandir(self, valores: np.ndarray) -> np.ndarray:
+        """Solução reduzida → solução completa (colunas eliminadas recalculadas)"""
+        completo = np.zeros(self.n_completo)
+        completo[self.mantidas] = valores
+        termos = np.bincount(self._expr_linha, weights=self._expr_val * completo[self._expr_col],
+                             minlength=len(self.eliminadas))
+        completo[self.eliminadas] = termos + self.constantes
+        return completo
+
+    def imprimir_reducao(self):
+        """Relatório de redução de colunas, linhas e não-nulos"""
+        print(f"   🧹 Presolve:")
+        for nome, (antes, depois) in self.reducao.items():
+            pct = 100 * (antes - depois) / antes if antes else 0.0
+            print(f"      {nome:>8}: {antes:>8} → {depois:>8} (-{pct:.1f}%)")
+
+
+class SolverReduzido:
+    """
+    Adaptador que expõe um solver do modelo reduzido no espaço completo de colunas
+
+    Objetivos, restrições adicionais e soluções iniciais são recebidos com índices
+    completos e traduzidos; os valores retornados são expandidos para o vetor completo.
+    """
+
+    def __init__(self, solver, presolve: Presolve):
+        self.solver = solver
+        self.presolve = presolve
+        self.nome = solver.nome
+        self._constante = 0.0
+
+    @property
+    def num_colunas(self) -> int:
+        return self.solver.num_colunas
+
+    @property
+    def num_linhas(self) -> int:
+        return self.solver.num_linhas
+
+    def definir_objetivo(self, c: np.ndarray):
+        c_red, self._constante = self.presolve.reduzir_objetivo(np.asarray(c, dtype=float))
+        self.solver.definir_objetivo(c_red)
+
+    def adicionar_restricao(self, ind: np.ndarray, val: np.ndarray, sentido: str, rhs: float, nome: str):
+        ind_red, val_red, constante = self.presolve.reduzir_linha(ind, val)
+        self.solver.adicionar_restricao(ind_red, val_red, sentido, rhs - constante, nome)
+
+    def definir_inicio(self, valores: np.ndarray, nome: str = 'inicio'):
+        self.solver.definir_inicio(np.asarray(valores)[self.presolve.mantidas], nome)
+
+    def pool_solucoes(self, n: int, colunas: np.ndarray, referencia: np.ndarray, *args, **kwargs) -> List[Dict]:
+        posicoes = self.presolve.posicoes(colunas)
+        solucoes = self.solver.pool_solucoes(n, posicoes, np.asarray(referencia), *args, **kwargs)
+        return [dict(s, valores=self.presolve.expandir(s['valores']), objetivo=s['objetivo'] + self._constante)
+                for s in solucoes]
+
+    def resolver(self, *args, **kwargs) -> Dict:
+        resultado = self.solver.resolver(*args, **kwargs)
+        if resultado['viavel']:
+            resultado['valores'] = self.presolve.expandir(resultado['valores'])
+            resultado['objetivo'] += self._constante
+        return resultado
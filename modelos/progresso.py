@@ -0,0 +1,164 @@
+"""
+Progresso do solver em tempo real (incumbente, limitante, gap, nós)
+Os backends de modelos.solvers aceitam resolver(..., progresso=monitor) e registram no
+MonitorProgresso o andamento do branch-and-bound pelos callbacks nativos:
+    'docplex' - ProgressListener (docplex.mp.progress)
+    'cplex'   - MIPInfoCallback (cplex.callbacks)
+    'highs'   - callbacks kCallbackMipImprovingSolution / kCallbackMipInterrupt
+Cada registro emitido é um dict com data/hora e tempo desde o início do solve e vai
+para as funções em callbacks, para um arquivo JSONL (uma linha por registro) e para
+o histórico do monitor. Registros são emitidos a cada nova incumbente e, no máximo, a
+cada intervalo_s segundos; as regras de parada são avaliadas a cada chamada.
+
+Regras de parada: funções registro → bool (ex.: RegraParada(gap=0.02, apos_s=60));
+a primeira que retornar True interrompe o solver, que devolve a melhor solução
+encontrada (status 'aborted' / 'Interrupted by user') com resultado['parada'].
+O tempo das regras é contado a partir do início de cada solve (cada passo do FCSA).
+
+Uso:
+    monitor = MonitorProgresso(callbacks=[print], arquivo_jsonl='progresso.jsonl',
+                               regras=[RegraParada(gap=0.02, apos_s=60)])
+    solver.resolver(time_limit, mip_gap, progresso=monitor)
+    modelo.progresso = monitor     # FCSA_MILP: todos os solves MIP de resolver()
+"""
+
+import json
+import math
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+def gap_relativo(incumbente: Optional[float], limitante: Optional[float]) -> Optional[float]:
+    """|incumbente - limitante| / |incumbente| (definição do CPLEX); None sem incumbente"""
+    if incumbente is None or limitante is None or not math.isfinite(limitante):
+        return None
+    return abs(incumbente - limitante) / max(abs(incumbente), 1e-10)
+
+
+class RegraParada:
+    """Para o solver quando há incumbente com gap ≤ `gap` e já se passaram `apos_s` segundos"""
+
+    def __init__(self, gap: float, apos_s: float = 0.0):
+        self.gap = gap
+        self.apos_s = apos_s
+
+    def __call__(self, registro: Dict) -> bool:
+        return (registro['gap'] is not None and registro['gap'] <= self.gap
+                and registro['t_s'] >= self.apos_s)
+
+    def __repr__(self) -> str:
+        return f"gap ≤ {self.gap * 100:.2f}% após {self.apos_s:g}s"
+
+
+class MonitorProgresso:
+    """Recebe o andamento do solver, emite registros e decide paradas antecipadas"""
+
+    def __init__(self, callbacks: Iterable[Callable[[Dict], None]] = (), arquivo_jsonl=None,
+                 regras: Iterable[Callable[[Dict], bool]] = (), intervalo_s: float = 1.0):
+        """
+        Args:
+            callbacks: Funções chamadas com cada registro emitido
+            arquivo_jsonl: Arquivo ao qual os registros são acrescentados (opcional)
+            regras: Regras de parada (registro → bool), ex.: RegraParada
+            intervalo_s: Intervalo mínimo entre registros sem nova incumbente
+        """
+        self.callbacks = list(callbacks)
+        self.arquivo_jsonl = Path(arquivo_jsonl) if arquivo_jsonl is not None else None
+        self.regras = list(regras)
+        self.intervalo_s = intervalo_s
+        # Rótulo do solve corrente (ex.: 'passo1'); FCSA_MILP o atualiza a cada fase
+        self.fase: Optional[str] = None
+        self.historico: List[Dict] = []
+        self.parada: Optional[str] = None
+        self._backend = None
+        self._t0 = time.perf_counter()
+        self._ultima_emissao = -math.inf
+        self._incumbente = None
+
+    def iniciar(self, backend: str):
+        """Chamado pelo backend no início de cada solve"""
+        self._backend = backend
+        self._t0 = time.perf_counter()
+        self._ultima_emissao = -math.inf
+        self._incumbente = None
+        self.parada = None
+
+    def observar_fase(self, evento: str, registro: Dict):
+        """Observador de Telemetria: usa o nome da fase corrente como rótulo dos registros"""
+        if evento == 'inicio':
+            self.fase = registro['fase']
+
+    def registrar(self, incumbente: Optional[float], limitante: Optional[float], nos: Optional[int],
+                  gap: Optional[float] = None) -> bool:
+        """
+        Andamento corrente do solver (chamado pelos callbacks dos backends)
+
+        Returns:
+            True se uma regra de parada foi atingida (o backend interrompe o solve)
+        """
+        if self.parada is not None:
+            # Solver ainda não atendeu a interrupção
+            return True
+        t = time.perf_counter() - self._t0
+        if gap is None:
+            gap = gap_relativo(incumbente, limitante)
+        nova_incumbente = incumbente is not None and incumbente != self._incumbente
+        registro = self._registro(t, 'incumbente' if nova_incumbente else 'progresso',
+                                  incumbente, limitante, gap, nos)
+        for regra in self.regras:
+            if regra(registro):
+                self.parada = repr(regra)
+                registro['evento'] = 'parada'
+                self._emitir(registro)
+                return True
+        if nova_incumbente or t - self._ultima_emissao >= self.intervalo_s:
+            self._incumbente = incumbente
+            self._emitir(registro)
+        return False
+
+    def finalizar(self, resultado: Dict):
+        """Registro final com o resultado do solve; anota resultado['parada'] se houve parada"""
+        if self.parada is not None:
+            resultado['parada'] = self.parada
+        self._emitir(self._registro(time.perf_counter() - self._t0, 'fim', resultado.get('objetivo'), None,
+                                    resultado.get('gap'), resultado.get('nos')))
+
+    def _registro(self, t: float, evento: str, incumbente, limitante, gap, nos) -> Dict:
+        return {
+            'data_hora': datetime.now().isoformat(timespec='milliseconds'),
+            't_s': t,
+            'fase': self.fase,
+            'backend': self._backend,
+            'evento': evento,
+            'incumbente': incumbente,
+            'limitante': limitante if limitante is None or math.isfinite(limitante) else None,
+            'gap': gap,
+            'nos': nos,
+        }
+
+    def _emitir(self, registro: Dict):
+        self._ultima_emissao = registro['t_s']
+        self.historico.append(registro)
+        if self.arquivo_jsonl is not None:
+            self.arquivo_jsonl.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.arquivo_jsonl, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        for callback in self.callbacks:
+            callback(registro)
+
+
+def ler_jsonl(caminho) -> List[Dict]:
+    """Registros de um arquivo JSONL de progresso (linhas incompletas são ignoradas)"""
+    registros = []
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    registros.append(json.loads(linha))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    return registros
@@ -0,0 +1,594 @@
+"""
+Backends de solver para modelos MILP
+Todos os backends expõem a mesma interface baseada em índices de coluna,
+de forma que os modelos possam trocar de solver sem reescrever o algoritmo.
+
+Backends disponíveis:
+    'docplex' - docplex/CPLEX (modelo com objetos e nomes)
+    'cplex'   - API de baixo nível cplex.Cplex (matriz CSR)
+    'highs'   - HiGHS via highspy (open source, sem licença)
+
+resolver(..., progresso=monitor) envia o andamento do MIP (incumbente, limitante,
+gap, nós) a um MonitorProgresso (modelos.progresso), que pode interromper o solve.
+Os backends CPLEX expõem também pool_solucoes (soluções alternativas via populate).
+"""
+
+import copy
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class MatrizMILP:
+    """
+    Modelo MILP em forma matricial esparsa
+
+    Colunas: lb, ub e tipos ('C' contínua, 'B' binária)
+    Linhas:  A (CSR: indptr, indices, data), sentidos ('L', 'E', 'G') e rhs
+    """
+
+    def __init__(self, lb: np.ndarray, ub: np.ndarray, tipos: np.ndarray, blocos: List[Dict],
+                 nomes_colunas: Optional[List[str]] = None):
+        """
+        Args:
+            lb, ub: Limites das variáveis (n,)
+            tipos: Tipo de cada variável (n,) - 'C' ou 'B'
+            nomes_colunas: Nomes das variáveis (opcional, usado pelo backend docplex)
+            blocos: Famílias de restrições em CSR, cada uma com as chaves
+                    'indptr', 'indices', 'data', 'sentido', 'rhs' e 'nomes' (opcional).
+                    'sentido' pode ser um único caractere ou um array por linha.
+        """
+        self.lb = np.asarray(lb, dtype=float)
+        self.ub = np.asarray(ub, dtype=float)
+        self.tipos = np.asarray(tipos)
+        self.nomes_colunas = nomes_colunas
+
+        tamanhos = [len(b['rhs']) for b in blocos]
+        deslocamentos = np.cumsum([0] + [int(b['indptr'][-1]) for b in blocos])
+
+        self.indptr = np.concatenate([[0]] + [b['indptr'][1:] + d for b, d in zip(blocos, deslocamentos)])
+        self.indices = np.concatenate([b['indices'] for b in blocos]).astype(np.int64)
+        self.data = np.concatenate([b['data'] for b in blocos]).astype(float)
+        self.rhs = np.concatenate([b['rhs'] for b in blocos]).astype(float)
+        self.sentidos = np.concatenate(
+            [np.broadcast_to(np.asarray(b['sentido']), (n,)) for b, n in zip(blocos, tamanhos)]
+        )
+
+        if all(b.get('nomes') is not None for b in blocos):
+            self.nomes = [n for b in blocos for n in b['nomes']]
+        else:
+            self.nomes = None
+
+    @property
+    def num_colunas(self) -> int:
+        return len(self.lb)
+
+    @property
+    def num_linhas(self) -> int:
+        return len(self.rhs)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def violacao_maxima(self, valores: np.ndarray) -> float:
+        """Maior violação (linhas e limites de coluna) da solução valores"""
+        linhas = np.repeat(np.arange(self.num_linhas), np.diff(self.indptr))
+        atividade = np.bincount(linhas, weights=self.data * valores[self.indices], minlength=self.num_linhas)
+        folga = np.where(self.sentidos == 'L', atividade - self.rhs,
+                         np.where(self.sentidos == 'G', self.rhs - atividade, np.abs(atividade - self.rhs)))
+        limites = np.maximum(self.lb - valores, valores - self.ub)
+        return float(max(folga.max(initial=0.0), limites.max(initial=0.0)))
+
+    def com_limites(self, lb: np.ndarray, ub: np.ndarray, tipos: np.ndarray) -> 'MatrizMILP':
+        """Cópia rasa com novos limites/tipos de coluna (as linhas são compartilhadas)"""
+        nova = copy.copy(self)
+        nova.lb = np.asarray(lb, dtype=float)
+        nova.ub = np.asarray(ub, dtype=float)
+        nova.tipos = np.asarray(tipos)
+        return nova
+
+
+class ConstrutorMILP:
+    """
+    Monta uma MatrizMILP incrementalmente, variável a variável e linha a linha
+
+    Útil para modelos pequenos escritos com laços; modelos grandes devem
+    gerar os blocos CSR diretamente com NumPy.
+    """
+
+    def __init__(self):
+        self._lb, self._ub, self._tipos, self._nomes_colunas = [], [], [], []
+        self._ptr, self._ind, self._val = [0], [], []
+        self._sentidos, self._rhs, self._nomes = [], [], []
+
+    @property
+    def num_colunas(self) -> int:
+        return len(self._lb)
+
+    def adicionar_variaveis(self, n: int, tipo: str = 'C', lb: float = 0.0,
+                            ub: Optional[float] = None, nomes: Optional[List[str]] = None) -> np.ndarray:
+        """Cria n variáveis ('C' ou 'B') e retorna seus índices de coluna"""
+        if ub is None:
+            ub = 1.0 if tipo == 'B' else np.inf
+        inicio = len(self._lb)
+        self._nomes_colunas.extend(nomes if nomes is not None else [f'z{inicio + i}' for i in range(n)])
+        self._lb.extend([lb] * n)
+        self._ub.extend([ub] * n)
+        self._tipos.extend([tipo] * n)
+        return np.arange(inicio, inicio + n)
+
+    def adicionar_restricao(self, ind, val, sentido: str, rhs: float, nome: Optional[str] = None):
+        """Adiciona linha Σ val·z[ind] <sentido> rhs"""
+        self._ind.extend(int(j) for j in ind)
+        self._val.extend(float(v) for v in val)
+        self._ptr.append(len(self._ind))
+        self._sentidos.append(sentido)
+        self._rhs.append(float(rhs))
+        self._nomes.append(nome or f'c{len(self._rhs)}')
+
+    def matriz(self) -> MatrizMILP:
+        bloco = {
+            'indptr': np.array(self._ptr, dtype=np.int64),
+            'indices': np.array(self._ind, dtype=np.int64),
+            'data': np.array(self._val, dtype=float),
+            'sentido': np.array(self._sentidos if self._sentidos else [], dtype='<U1'),
+            'rhs': np.array(self._rhs, dtype=float),
+            'nomes': self._nomes,
+        }
+        return MatrizMILP(self._lb, self._ub, self._tipos, [bloco], self._nomes_colunas)
+
+
+class SolverDocplex:
+    """Adaptador para um modelo docplex (colunas na ordem dos índices)"""
+
+    nome = 'docplex'
+
+    def __init__(self, modelo, colunas: List):
+        self.modelo = modelo
+        self.colunas = colunas
+
+    @classmethod
+    def de_matriz(cls, matriz: MatrizMILP, nome: str = 'MILP') -> 'SolverDocplex':
+        """Cria o modelo docplex a partir de uma MatrizMILP"""
+        from docplex.mp.model import Model
+
+        m = Model(nome, checker='off')
+        colunas = []
+        # Cria as variáveis em trechos contíguos de mesmo tipo, preservando a ordem das colunas
+        cortes = np.flatnonzero(matriz.tipos[1:] != matriz.tipos[:-1]) + 1
+        for trecho in np.split(np.arange(matriz.num_colunas), cortes):
+            if len(trecho) == 0:
+                continue
+            lb, ub = matriz.lb[trecho].tolist(), matriz.ub[trecho].tolist()
+            ub = [u if np.isfinite(u) else None for u in ub]
+            nomes = [matriz.nomes_colunas[j] for j in trecho] if matriz.nomes_colunas else None
+            if matriz.tipos[trecho[0]] == 'B':
+                colunas.extend(m.binary_var_list(len(trecho), name=nomes))
+            else:
+                colunas.extend(m.continuous_var_list(len(trecho), lb=lb, ub=ub, name=nomes))
+
+        cls.adicionar_bloco(m, colunas, {
+            'indptr': matriz.indptr, 'indices': matriz.indices, 'data': matriz.data,
+            'sentido': matriz.sentidos, 'rhs': matriz.rhs, 'nomes': matriz.nomes,
+        })
+        return cls(m, colunas)
+
+    @staticmethod
+    def adicionar_bloco(m, colunas: List, bloco: Dict):
+        """Adiciona uma família inteira de restrições com uma única chamada add_constraints"""
+        from docplex.mp.constants import ComparisonType
+
+        tipos = {s: ComparisonType.parse(op) for s, op in (('L', 'le'), ('E', 'eq'), ('G', 'ge'))}
+        n = len(bloco['rhs'])
+        sentidos = [tipos[s] for s in np.broadcast_to(np.asarray(bloco['sentido']), (n,)).tolist()]
+        ptr = bloco['indptr'].tolist()
+        ind = bloco['indices'].tolist()
+        val = bloco['data'].tolist()
+        cts = [
+            m.linear_constraint(m.scal_prod([colunas[j] for j in ind[a:b]], val[a:b]), r, s)
+            for a, b, r, s in zip(ptr[:-1], ptr[1:], bloco['rhs'].tolist(), sentidos)
+        ]
+        m.add_constraints(cts, bloco['nomes'])
+
+    @property
+    def num_colunas(self) -> int:
+        return self.modelo.number_of_variables
+
+    @property
+    def num_linhas(self) -> int:
+        return self.modelo.number_of_constraints
+
+    def definir_objetivo(self, c: np.ndarray):
+        """Define objetivo de minimização c·z"""
+        ind = np.flatnonzero(c)
+        self.modelo.minimize(self.modelo.scal_prod([self.colunas[j] for j in ind], c[ind].tolist()))
+
+    def adicionar_restricao(self, ind: np.ndarray, val: np.ndarray, sentido: str, rhs: float, nome: str):
+        """Adiciona uma linha esparsa ind/val <sentido> rhs"""
+        expr = self.modelo.scal_prod([self.colunas[j] for j in ind], np.asarray(val).tolist())
+        sentido = {'L': 'le', 'E': 'eq', 'G': 'ge'}[sentido]
+        self.modelo.add_constraint(self.modelo.linear_constraint(expr, rhs, sentido), ctname=nome)
+
+    def definir_inicio(self, valores: np.ndarray, nome: str = 'inicio'):
+        """Substitui os MIP starts do modelo pela solução valores (vetor completo de colunas)"""
+        from docplex.mp.solution import SolveSolution
+
+        m = self.modelo
+        m.clear_mip_starts()
+        ind = np.flatnonzero(valores)
+        inicio = SolveSolution(m, dict(zip([self.colunas[j] for j in ind], valores[ind].tolist())), name=nome)
+        m.add_mip_start(inicio, complete_vars=True)
+
+    def resolver(self, time_limit: Optional[float] = None, mip_gap: Optional[float] = None,
+                 threads: int = 0, log_output: bool = False, progresso=None) -> Dict:
+        """Resolve e retorna dict com viavel, status, objetivo, valores, gap, nos e tempo_s"""
+        m = self.modelo
+        if mip_gap is not None:
+            m.parameters.mip.tolerances.mipgap = mip_gap
+        if time_limit is not None:
+            m.parameters.timelimit = time_limit
+        m.parameters.threads = threads
+
+        ouvinte = None
+        if progresso is not None:
+            progresso.iniciar(self.nome)
+            ouvinte = _ouvinte_docplex(progresso)
+            m.add_progress_listener(ouvinte)
+
+        t0 = time.time()
+        try:
+            sol = m.solve(log_output=log_output)
+        finally:
+            if ouvinte is not None:
+                m.remove_progress_listener(ouvinte)
+        tempo = time.time() - t0
+
+        detalhes = m.solve_details
+        if not sol:
+            return _concluir({'viavel': False, 'status': detalhes.status, 'tempo_s': tempo}, progresso)
+        return _concluir({
+            'viavel': True,
+            'status': detalhes.status,
+            'objetivo': sol.objective_value,
+            'valores': np.array(sol.get_values(self.colunas), dtype=float),
+            'gap': detalhes.mip_relative_gap,
+            'nos': detalhes.nb_nodes_processed,
+            'tempo_s': tempo,
+        }, progresso)
+
+    def pool_solucoes(self, n: int, colunas: np.ndarray, referencia: np.ndarray, gap_relativo: float = 0.05,
+                      time_limit: Optional[float] = None, threads: int = 0, log_output: bool = False) -> List[Dict]:
+        """Soluções do pool após o último solve (ver _popular_pool), no motor CPLEX do docplex"""
+        cpx = self.modelo.get_cplex()
+        indices = np.array([v.index for v in self.colunas])
+        return [dict(s, valores=s['valores'][indices])
+                for s in _popular_pool(cpx, n, indices[colunas], referencia, gap_relativo, time_limit,
+                                       threads, log_output)]
+
+
+class SolverCplex:
+    """
+    Backend CPLEX de baixo nível (cplex.Cplex)
+
+    A matriz é enviada diretamente com linear_constraints.add a partir das
+    listas de índices/valores do CSR, sem criar objetos Python por variável.
+    """
+
+    nome = 'cplex'
+
+    def __init__(self, matriz: MatrizMILP):
+        import cplex
+
+        self.cpx = self.modelo = cplex.Cplex()
+        self.cpx.objective.set_sense(self.cpx.objective.sense.minimize)
+        # Sem tipos, o CPLEX trata o problema como LP
+        tipos = {'types': ''.join(matriz.tipos.tolist())} if (matriz.tipos != 'C').any() else {}
+        self.cpx.variables.add(lb=matriz.lb.tolist(), ub=matriz.ub.tolist(), **tipos)
+
+        ptr = matriz.indptr.tolist()
+        ind = matriz.indices.tolist()
+        val = matriz.data.tolist()
+        lin_expr = [[ind[a:b], val[a:b]] for a, b in zip(ptr[:-1], ptr[1:])]
+        self.cpx.linear_constraints.add(
+            lin_expr=lin_expr,
+            senses=''.join(matriz.sentidos.tolist()),
+            rhs=matriz.rhs.tolist(),
+            names=matriz.nomes,
+        )
+
+    @property
+    def num_colunas(self) -> int:
+        return self.cpx.variables.get_num()
+
+    @property
+    def num_linhas(self) -> int:
+        return self.cpx.linear_constraints.get_num()
+
+    def definir_objetivo(self, c: np.ndarray):
+        """Define objetivo de minimização c·z"""
+        self.cpx.objective.set_linear(list(enumerate(np.asarray(c, dtype=float).tolist())))
+
+    def adicionar_restricao(self, ind: np.ndarray, val: np.ndarray, sentido: str, rhs: float, nome: str):
+        """Adiciona uma linha esparsa ind/val <sentido> rhs"""
+        self.cpx.linear_constraints.add(
+            lin_expr=[[np.asarray(ind).tolist(), np.asarray(val, dtype=float).tolist()]],
+            senses=sentido,
+            rhs=[float(rhs)],
+            names=[nome],
+        )
+
+    def definir_inicio(self, valores: np.ndarray, nome: str = 'inicio'):
+        """Substitui os MIP starts do modelo pela solução valores (vetor completo de colunas)"""
+        starts = self.cpx.MIP_starts
+        if starts.get_num():
+            starts.delete()
+        starts.add([list(range(len(valores))), np.asarray(valores, dtype=float).tolist()],
+                   starts.effort_level.auto, nome)
+
+    def resolver(self, time_limit: Optional[float] = None, mip_gap: Optional[float] = None,
+                 threads: int = 0, log_output: bool = False, progresso=None) -> Dict:
+        """Resolve e retorna dict com viavel, status, objetivo, valores, gap, nos e tempo_s"""
+        cpx = self.cpx
+        if mip_gap is not None:
+            cpx.parameters.mip.tolerances.mipgap.set(mip_gap)
+        if time_limit is not None:
+            cpx.parameters.timelimit.set(time_limit)
+        cpx.parameters.threads.set(threads)
+
+        fluxo = sys.stdout if log_output else None
+        cpx.set_log_stream(fluxo)
+        cpx.set_results_stream(fluxo)
+        cpx.set_warning_stream(fluxo)
+
+        classe = None
+        if progresso is not None:
+            progresso.iniciar(self.nome)
+            classe = _callback_cplex()
+            cpx.register_callback(classe).progresso = progresso
+
+        t0 = time.time()
+        try:
+            cpx.solve()
+        finally:
+            if classe is not None:
+                cpx.unregister_callback(classe)
+        tempo = time.time() - t0
+
+        status = cpx.solution.get_status_string()
+        if not cpx.solution.is_primal_feasible():
+            return _concluir({'viavel': False, 'status': status, 'tempo_s': tempo}, progresso)
+        mip = cpx.get_problem_type() != cpx.problem_type.LP
+        return _concluir({
+            'viavel': True,
+            'status': status,
+            'objetivo': cpx.solution.get_objective_value(),
+            'valores': np.array(cpx.solution.get_values(), dtype=float),
+            'gap': cpx.solution.MIP.get_mip_relative_gap() if mip else 0.0,
+            'nos': cpx.solution.progress.get_num_nodes_processed() if mip else 0,
+            'tempo_s': tempo,
+        }, progresso)
+
+    def pool_solucoes(self, n: int, colunas: np.ndarray, referencia: np.ndarray, gap_relativo: float = 0.05,
+                      time_limit: Optional[float] = None, threads: int = 0, log_output: bool = False) -> List[Dict]:
+        """Soluções do pool após o último solve (ver _popular_pool)"""
+        return _popular_pool(self.cpx, n, colunas, referencia, gap_relativo, time_limit, threads, log_output)
+
+
+class SolverHighs:
+    """
+    Backend HiGHS (highspy)
+
+    Solver MILP open source: não requer licença nem limita o tamanho do modelo,
+    podendo rodar em qualquer worker Linux e em quantos processos paralelos forem necessários.
+    """
+
+    nome = 'highs'
+
+    def __init__(self, matriz: MatrizMILP):
+        import highspy
+
+        self.highspy = highspy
+        self.h = self.modelo = highspy.Highs()
+        self.h.setOptionValue('output_flag', False)
+        inf = highspy.kHighsInf
+
+        n = matriz.num_colunas
+        ub = np.where(np.isfinite(matriz.ub), matriz.ub, inf)
+        self.h.addVars(n, matriz.lb, ub)
+        inteiras = np.flatnonzero(matriz.tipos != 'C').astype(np.int32)
+        if len(inteiras):
+            self.h.changeColsIntegrality(
+                len(inteiras), inteiras,
+                np.full(len(inteiras), highspy.HighsVarType.kInteger)
+            )
+
+        inferior = np.where(matriz.sentidos == 'L', -inf, matriz.rhs)
+        superior = np.where(matriz.sentidos == 'G', inf, matriz.rhs)
+        self.h.addRows(
+            matriz.num_linhas, inferior, superior, matriz.nnz,
+            matriz.indptr[:-1].astype(np.int32), matriz.indices.astype(np.int32), matriz.data
+        )
+
+    @property
+    def num_colunas(self) -> int:
+        return self.h.getNumCol()
+
+    @property
+    def num_linhas(self) -> int:
+        return self.h.getNumRow()
+
+    def definir_objetivo(self, c: np.ndarray):
+        """Define objetivo de minimização c·z"""
+        n = self.h.getNumCol()
+        self.h.changeColsCost(n, np.arange(n, dtype=np.int32), np.asarray(c, dtype=float))
+
+    def adicionar_restricao(self, ind: np.ndarray, val: np.ndarray, sentido: str, rhs: float, nome: str):
+        """Adiciona uma linha esparsa ind/val <sentido> rhs"""
+        inf = self.highspy.kHighsInf
+        inferior = -inf if sentido == 'L' else rhs
+        superior = inf if sentido == 'G' else rhs
+        self.h.addRow(inferior, superior, len(ind), np.asarray(ind, dtype=np.int32),
+                      np.asarray(val, dtype=float))
+
+    def definir_inicio(self, valores: np.ndarray, nome: str = 'inicio'):
+        """Define a solução inicial (vetor completo de colunas) usada pelo MIP"""
+        n = len(valores)
+        self.h.setSolution(n, np.arange(n, dtype=np.int32), np.asarray(valores, dtype=float))
+
+    def resolver(self, time_limit: Optional[float] = None, mip_gap: Optional[float] = None,
+                 threads: int = 0, log_output: bool = False, progresso=None) -> Dict:
+        """Resolve e retorna dict com viavel, status, objetivo, valores, gap, nos e tempo_s"""
+        h = self.h
+        h.setOptionValue('output_flag', bool(log_output))
+        if time_limit is not None:
+            h.setOptionValue('time_limit', float(time_limit))
+        if mip_gap is not None:
+            h.setOptionValue('mip_rel_gap', float(mip_gap))
+        if threads:
+            h.setOptionValue('threads', int(threads))
+
+        tipos_callback = ()
+        if progresso is not None:
+            progresso.iniciar(self.nome)
+            tipos_callback = (self.highspy.cb.HighsCallbackType.kCallbackMipImprovingSolution,
+                              self.highspy.cb.HighsCallbackType.kCallbackMipInterrupt)
+            h.setCallback(_callback_highs, progresso)
+            for tipo in tipos_callback:
+                h.startCallback(tipo)
+
+        t0 = time.time()
+        try:
+            h.run()
+        finally:
+            for tipo in tipos_callback:
+                h.stopCallback(tipo)
+        tempo = time.time() - t0
+
+        info = h.getInfo()
+        status = h.modelStatusToString(h.getModelStatus())
+        if info.primal_solution_status != self.highspy.SolutionStatus.kSolutionStatusFeasible:
+            return _concluir({'viavel': False, 'status': status, 'tempo_s': tempo}, progresso)
+        return _concluir({
+            'viavel': True,
+            'status': status,
+            'objetivo': info.objective_function_value,
+            'valores': np.array(h.getSolution().col_value, dtype=float),
+            'gap': info.mip_gap if np.isfinite(info.mip_gap) else 0.0,
+            'nos': max(int(info.mip_node_count), 0),
+            'tempo_s': tempo,
+        }, progresso)
+
+
+def _concluir(resultado: Dict, progresso) -> Dict:
+    """Registro final do solve no monitor de progresso (se houver)"""
+    if progresso is not None:
+        progresso.finalizar(resultado)
+    return resultado
+
+
+def _ouvinte_docplex(progresso):
+    """ProgressListener do docplex que repassa cada notificação ao monitor"""
+    from docplex.mp.progress import ProgressClock, ProgressListener
+
+    class OuvinteProgresso(ProgressListener):
+        def __init__(self):
+            # Todas as notificações: as regras de parada dependem também do tempo
+            super().__init__(ProgressClock.All)
+
+        def notify_progress(self, dados):
+            incumbente = dados.current_objective if dados.has_incumbent else None
+            gap = dados.mip_gap if dados.has_incumbent else None
+            if progresso.registrar(incumbente, dados.best_bound, dados.current_nb_nodes, gap):
+                self.abort()
+
+    return OuvinteProgresso()
+
+
+def _callback_cplex():
+    """Classe de MIPInfoCallback (cplex registra classes, não instâncias)"""
+    from cplex.callbacks import MIPInfoCallback
+
+    class CallbackProgresso(MIPInfoCallback):
+        progresso = None
+
+        def __call__(self):
+            com_incumbente = self.has_incumbent()
+            incumbente = self.get_incumbent_objective_value() if com_incumbente else None
+            gap = self.get_MIP_relative_gap() if com_incumbente else None
+            if self.progresso.registrar(incumbente, self.get_best_objective_value(), self.get_num_nodes(), gap):
+                self.abort()
+
+    return CallbackProgresso
+
+
+def _callback_highs(tipo, mensagem, saida, entrada, progresso):
+    """Callback do HiGHS (nova incumbente e pontos de interrupção do MIP)"""
+    incumbente = saida.mip_primal_bound if np.isfinite(saida.mip_primal_bound) else None
+    gap = saida.mip_gap if incumbente is not None and np.isfinite(saida.mip_gap) else None
+    if progresso.registrar(incumbente, saida.mip_dual_bound, int(saida.mip_node_count), gap):
+        entrada.user_interrupt = True
+
+
+def _popular_pool(cpx, n: int, colunas: np.ndarray, referencia: np.ndarray, gap_relativo: float,
+                  time_limit: Optional[float], threads: int, log_output: bool) -> List[Dict]:
+    """
+    Preenche o pool de soluções do CPLEX (populate), continuando a árvore do último solve
+
+    Um filtro de diversidade admite no pool apenas soluções a distância de Hamming ≥ 1
+    de `referencia` nas `colunas` binárias, e o pool substitui soluções de modo a
+    maximizar a diversidade; soluções com objetivo além de gap_relativo do melhor são
+    descartadas. Soluções encontradas durante o solve continuam no pool.
+
+    Returns:
+        [{'objetivo', 'valores'}] de todo o pool, em ordem crescente de objetivo
+    """
+    parametros = cpx.parameters
+    parametros.mip.pool.relgap.set(gap_relativo)
+    parametros.mip.pool.capacity.set(max(20, 4 * n))
+    parametros.mip.pool.replace.set(parametros.mip.pool.replace.values.diversity)
+    parametros.mip.limits.populate.set(max(20, 4 * n))
+    if time_limit is not None:
+        parametros.timelimit.set(time_limit)
+    parametros.threads.set(threads)
+    fluxo = sys.stdout if log_output else None
+    cpx.set_log_stream(fluxo)
+    cpx.set_results_stream(fluxo)
+    cpx.set_warning_stream(fluxo)
+
+    filtros = cpx.solution.pool.filter
+    filtro = filtros.add_diversity_filter(1.0, float(len(colunas)),
+                                          [np.asarray(colunas).tolist(), np.round(referencia).tolist()],
+                                          [], 'alternativas')
+    try:
+        cpx.populate_solution_pool()
+    finally:
+        filtros.delete(filtro)
+
+    pool = cpx.solution.pool
+    solucoes = [{'objetivo': pool.get_objective_value(i), 'valores': np.array(pool.get_values(i), dtype=float)}
+                for i in range(pool.get_num())]
+    return sorted(solucoes, key=lambda s: s['objetivo'])
+
+
+BACKENDS = ('docplex', 'cplex', 'highs')
+
+
+def criar_solver(matriz: MatrizMILP, backend: str, nome: str = 'MILP'):
+    """
+    Instancia o backend escolhido a partir de uma MatrizMILP
+
+    Args:
+        matriz: Modelo em forma matricial
+        backend: 'docplex', 'cplex' ou 'highs'
+        nome: Nome do modelo (usado apenas pelo docplex)
+    """
+    if backend == 'docplex':
+        return SolverDocplex.de_matriz(matriz, nome)
+    if backend == 'cplex':
+        return SolverCplex(matriz)
+    if backend == 'highs':
+        return SolverHighs(matriz)
+    raise ValueError(f"Backend inválido: {backend} (opções: {', '.join(BACKENDS)})")
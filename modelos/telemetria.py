@@ -0,0 +1,188 @@
+"""
+Telemetria por fase do pipeline FCSA
+Cada fase (carga, cobertura, Big-M, construção, passos do solver, extração) registra
+tempo de parede, tempo de CPU do processo e pico de memória residente (RSS); as fases
+de solver registram também status, gap, nós e nós/s. O relatório é um dict
+serializável em JSON e pode ser acrescentado a um log CSV de execuções (uma linha por
+fase) para acompanhar o desempenho entre instâncias e versões do código.
+
+Uso:
+    tel = Telemetria({'instancia': 'dados/problema0'})
+    with tel.fase('carga'):
+        ...
+    with tel.fase('passo1') as registro:
+        registro.update(Telemetria.resumo_solver(resultado))
+    tel.salvar_json('telemetria.json')
+    tel.anexar_csv('execucoes.csv')
+"""
+
+import csv
+import functools
+import hashlib
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Fontes cujo conteúdo define a versão do código (ver versao_codigo)
+FONTES_CODIGO = ('modelo_Caio.py', 'solvers.py', 'presolve.py', 'instancia.py', 'cache_instancia.py',
+                 'cobertura.py', 'heuristica.py', 'progresso.py')
+
+COLUNAS_CSV = ('execucao', 'data_hora', 'versao_codigo', 'instancia', 'backend', 'links', 'periodos',
+               'colunas', 'linhas', 'nnz', 'binarias', 'fase', 'wall_s', 'cpu_s', 'pico_rss_mb',
+               'status', 'objetivo', 'gap', 'nos', 'nos_por_s')
+
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (None se indisponível na plataforma)"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1e6
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: kB no Linux, bytes no macOS
+    return pico / 1e6 if sys.platform == 'darwin' else pico / 1e3
+
+
+@functools.lru_cache(maxsize=None)
+def versao_codigo() -> str:
+    """Hash curto (SHA-256) das fontes do modelo em modelos/ (muda a cada alteração do código)"""
+    h = hashlib.sha256()
+    pasta = Path(__file__).parent
+    for nome in FONTES_CODIGO:
+        h.update(nome.encode('utf-8'))
+        h.update((pasta / nome).read_bytes())
+    return h.hexdigest()[:12]
+
+
+class Telemetria:
+    """Registro estruturado das fases de uma execução"""
+
+    def __init__(self, contexto: Optional[Dict] = None):
+        """
+        Args:
+            contexto: Metadados da execução (ex.: instancia, backend, links, periodos)
+        """
+        self.contexto = dict(contexto or {})
+        self.modelo: Dict = {}
+        self.fases: List[Dict] = []
+        # Chamados com (evento, registro), evento 'inicio' ou 'fim' de cada fase (ex.: jobs em segundo plano)
+        self.observadores: List[Callable[[str, Dict], None]] = []
+        self.data_hora = datetime.now().isoformat(timespec='seconds')
+        self.execucao = f"{datetime.now():%Y%m%d%H%M%S}-{id(self) & 0xffff:04x}"
+
+    @contextmanager
+    def fase(self, nome: str) -> Iterator[Dict]:
+        """Mede a fase `nome`; o dict retornado aceita campos extras (ex.: resumo_solver)"""
+        registro = {'fase': nome}
+        self._notificar('inicio', registro)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield registro
+        finally:
+            registro['wall_s'] = time.perf_counter() - wall
+            registro['cpu_s'] = time.process_time() - cpu
+            registro['pico_rss_mb'] = pico_rss_mb()
+            self.fases.append(registro)
+            self._notificar('fim', registro)
+
+    def _notificar(self, evento: str, registro: Dict):
+        for observador in self.observadores:
+            observador(evento, registro)
+
+    @staticmethod
+    def resumo_solver(resultado: Dict) -> Dict:
+        """Status, objetivo, gap, nós e nós/s de um resultado de solver (ver modelos.solvers)"""
+        nos = resultado.get('nos')
+        tempo = resultado.get('tempo_s') or 0.0
+        resumo = {
+            'status': str(resultado.get('status', '')),
+            'objetivo': resultado.get('objetivo'),
+            'gap': resultado.get('gap'),
+            'nos': nos,
+            'nos_por_s': nos / tempo if nos is not None and tempo > 0 else None,
+        }
+        if resultado.get('parada'):
+            # Solve interrompido por regra de parada (ver modelos.progresso)
+            resumo['parada'] = resultado['parada']
+        return resumo
+
+    def registrar_modelo(self, **tamanho):
+        """Tamanho do modelo enviado ao solver (colunas, linhas, nnz, binarias, ...)"""
+        self.modelo.update(tamanho)
+
+    def relatorio(self) -> Dict:
+        """Relatório completo (serializável em JSON)"""
+        wall = sum(f['wall_s'] for f in self.fases)
+        cpu = sum(f['cpu_s'] for f in self.fases)
+        picos = [f['pico_rss_mb'] for f in self.fases if f['pico_rss_mb'] is not None]
+        return {
+            'execucao': self.execucao,
+            'data_hora': self.data_hora,
+            'versao_codigo': versao_codigo(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            **self.contexto,
+            'modelo': dict(self.modelo),
+            'fases': [dict(f) for f in self.fases],
+            'total': {'wall_s': wall, 'cpu_s': cpu, 'pico_rss_mb': max(picos) if picos else None},
+        }
+
+    def para_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.relatorio(), indent=indent, ensure_ascii=False, default=str)
+
+    def salvar_json(self, caminho) -> Path:
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(self.para_json(), encoding='utf-8')
+        return caminho
+
+    def anexar_csv(self, caminho) -> Path:
+        """Acrescenta uma linha por fase ao log CSV de execuções (cabeçalho se o arquivo é novo)"""
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        rel = self.relatorio()
+        comum = {c: rel.get(c, self.modelo.get(c)) for c in COLUNAS_CSV}
+        novo = not caminho.exists() or caminho.stat().st_size == 0
+        with open(caminho, 'a', encoding='utf-8', newline='') as f:
+            escritor = csv.DictWriter(f, fieldnames=COLUNAS_CSV, extrasaction='ignore')
+            if novo:
+                escritor.writeheader()
+            for fase in rel['fases']:
+                escritor.writerow({**comum, **fase})
+        return caminho
+
+    def imprimir(self):
+        """Tabela resumida das fases"""
+        rel = self.relatorio()
+        print(f"\n{'='*80}\n⏱️  TELEMETRIA ({rel['versao_codigo']})\n{'='*80}")
+        if self.modelo:
+            print("   " + " | ".join(f"{k}: {v}" for k, v in self.modelo.items()))
+        print(f"{'Fase':>14} | {'Parede (s)':>10} | {'CPU (s)':>8} | {'Pico RSS (MB)':>13} | {'Nós':>7} | {'Gap':>8}")
+        print('-' * 75)
+        for f in rel['fases'] + [{'fase': 'total', **rel['total']}]:
+            rss = f"{f['pico_rss_mb']:.1f}" if f.get('pico_rss_mb') is not None else '-'
+            nos = f"{f['nos']}" if f.get('nos') is not None else '-'
+            gap = f"{f['gap'] * 100:.2f}%" if f.get('gap') is not None else '-'
+            print(f"{f['fase']:>14} | {f['wall_s']:>10.3f} | {f['cpu_s']:>8.3f} | {rss:>13} | {nos:>7} | {gap:>8}")
+        print('=' * 80)
+
+
+def medir_fase(nome: str):
+    """Decorador de método: mede a chamada como a fase `nome` de self.telemetria"""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envolvido(self, *args, **kwargs):
+            with self.telemetria.fase(nome):
+                return metodo(self, *args, **kwargs)
+        return envolvido
+    return decorador
@@ -0,0 +1,325 @@
+"""
+Serviço local de jobs de otimização FCSA (fila + API HTTP)
+Vários analistas no mesmo servidor submetem otimizações de pastas de problema a um
+único serviço, que as executa com GerenciadorJobs (modelos/jobs_solucao.py):
+    - no máximo --max-processos jobs simultâneos (--max-cplex para licenças CPLEX)
+    - núcleos divididos entre os jobs pelo parâmetro threads do solver
+    - solicitações idênticas a um job na fila ou em execução são unidas a ele
+    - estados, logs e resultados ficam em --pasta
+Pasta, limites e porta vêm de configuracao_jobs() (variáveis FCSA_JOBS_PASTA,
+FCSA_MAX_PROCESSOS, FCSA_MAX_CPLEX, FCSA_THREADS_TOTAL e FCSA_JOBS_PORTA), a mesma
+configuração lida pelo dashboard, que submete a este serviço quando ele está no ar;
+as opções de linha de comando sobrepõem-se às variáveis.
+
+API (apenas em 127.0.0.1):
+    POST   /jobs                 {"problema": "/caminho/dados/problema1", "backend": "cplex", ...}
+    GET    /jobs                 lista de estados
+    GET    /jobs/<id>            estado
+    GET    /jobs/<id>/resultado  solucao e alternativas (JSON; ?arrays=1 inclui os arrays por família)
+    GET    /jobs/<id>/log        últimas linhas do log (?linhas=N)
+    GET    /jobs/<id>/progresso  registros de progresso do solver (?desde=N: a partir do N-ésimo)
+    DELETE /jobs/<id>            cancela
+    GET    /config               pasta dos jobs e limites do serviço
+Caminhos de problema relativos são resolvidos no diretório do serviço; o cliente
+(submeter) envia o caminho absoluto, de modo que a deduplicação e o estado usam
+sempre a mesma forma do caminho.
+
+Uso:
+    FCSA_MAX_PROCESSOS=2 FCSA_MAX_CPLEX=1 python servico_jobs.py servir
+    python servico_jobs.py submeter dados/problema1 --backend cplex --time-limit 900 --aguardar
+    python servico_jobs.py submeter dados/problema1 --parada-gap 0.02 --parada-apos 60
+    python servico_jobs.py submeter dados/problema1 --backend cplex --alternativas 5
+    python servico_jobs.py submeter dados/problema1 --metodo heuristico
+    python servico_jobs.py listar
+    python servico_jobs.py estado <job_id>
+    python servico_jobs.py resultado <job_id> --saida solucao.json
+    python servico_jobs.py progresso <job_id> --seguir
+    python servico_jobs.py cancelar <job_id>
+"""
+
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from modelos.jobs_solucao import ESTADOS_FINAIS, PARAMETROS, GerenciadorJobs, configuracao_jobs
+from modelos.solvers import BACKENDS
+
+
+def _para_json(v):
+    """Arrays e escalares NumPy → Python (json.dumps default)"""
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    if isinstance(v, np.generic):
+        return v.item()
+    return str(v)
+
+
+def _solucao_json(solucao: dict, arrays: bool) -> dict:
+    """Dict solucao serializável (carports como pares [link, tipo]; arrays opcionais)"""
+    solucao = dict(solucao)
+    if not arrays:
+        solucao.pop('arrays', None)
+    solucao['carports_instalados'] = [[l, k] for l, k in solucao['carports_instalados'].items()]
+    if not math.isfinite(solucao['gap_%']):
+        # Heurística: sem limitante (NaN não é JSON válido)
+        solucao['gap_%'] = None
+    return solucao
+
+
+class ManipuladorJobs(BaseHTTPRequestHandler):
+    """Rotas da API; self.server.jobs é o GerenciadorJobs do serviço"""
+
+    def _responder(self, codigo: int, corpo, tipo: str = 'application/json'):
+        dados = corpo.encode('utf-8') if tipo != 'application/json' else json.dumps(
+            corpo, ensure_ascii=False, default=_para_json).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', f'{tipo}; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _rota(self):
+        url = urlparse(self.path)
+        partes = [p for p in url.path.split('/') if p]
+        return partes, {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+    def log_message(self, formato, *args):
+        print(f"   🌐 {self.address_string()} {formato % args}")
+
+    def do_GET(self):
+        jobs = self.server.jobs
+        partes, consulta = self._rota()
+        if partes == ['jobs']:
+            return self._responder(200, jobs.listar())
+        if partes == ['config']:
+            return self._responder(200, {'pasta': str(jobs.pasta.resolve()), 'max_processos': jobs.max_processos,
+                                         'max_cplex': jobs.max_cplex, 'threads_por_job': jobs.threads_por_job})
+        if len(partes) < 2 or partes[0] != 'jobs':
+            return self._responder(404, {'erro': 'rota inexistente'})
+        job_id = partes[1]
+        estado = jobs.estado(job_id)
+        if estado is None:
+            return self._responder(404, {'erro': f'job inexistente: {job_id}'})
+        if len(partes) == 2:
+            return self._responder(200, estado)
+        if partes[2] == 'log':
+            return self._responder(200, jobs.log(job_id, int(consulta.get('linhas', 50))), 'text/plain')
+        if partes[2] == 'progresso':
+            return self._responder(200, jobs.progresso(job_id)[int(consulta.get('desde', 0)):])
+        if partes[2] == 'resultado':
+            resultado = jobs.resultado(job_id)
+            if resultado is None:
+                return self._responder(409, {'erro': f"job {estado['status']}, sem resultado", 'estado': estado})
+            arrays = consulta.get('arrays') == '1'
+            return self._responder(200, {
+                'estado': estado,
+                'solucao': _solucao_json(resultado['solucao'], arrays),
+                'alternativas': [_solucao_json(s, arrays) for s in resultado.get('alternativas', [])],
+            })
+        return self._responder(404, {'erro': 'rota inexistente'})
+
+    def do_POST(self):
+        jobs = self.server.jobs
+        partes, _ = self._rota()
+        if partes != ['jobs']:
+            return self._responder(404, {'erro': 'rota inexistente'})
+        try:
+            pedido = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            problema = str(Path(pedido.pop('problema')).resolve())
+            if not (Path(problema) / 'config_geral.yaml').exists():
+                raise ValueError(f"pasta de problema inválida: {problema}")
+            existente = jobs.encontrar_ativo(problema, **pedido)
+            job_id = jobs.submeter(problema, **pedido)
+        except (KeyError, ValueError, TypeError) as e:
+            return self._responder(400, {'erro': f'{type(e).__name__}: {e}'})
+        self._responder(200 if job_id == existente else 201,
+                        {'job_id': job_id, 'duplicado': job_id == existente, 'estado': jobs.estado(job_id)})
+
+    def do_DELETE(self):
+        partes, _ = self._rota()
+        if len(partes) != 2 or partes[0] != 'jobs':
+            return self._responder(404, {'erro': 'rota inexistente'})
+        if not self.server.jobs.cancelar(partes[1]):
+            return self._responder(409, {'erro': 'job finalizado ou inexistente'})
+        self._responder(200, self.server.jobs.estado(partes[1]))
+
+
+def servir(args):
+    config = configuracao_jobs()
+    opcoes = {nome: getattr(args, nome) if getattr(args, nome) is not None else config[nome]
+              for nome in ('pasta', 'max_processos', 'max_cplex', 'threads_total')}
+    jobs = GerenciadorJobs(**opcoes)
+    interrompidos = jobs.marcar_interrompidos()
+    servidor = ThreadingHTTPServer(('127.0.0.1', args.porta), ManipuladorJobs)
+    servidor.jobs = jobs
+
+    def avancar_fila():
+        while True:
+            jobs.atualizar()
+            time.sleep(1)
+
+    threading.Thread(target=avancar_fila, daemon=True, name='fila-jobs').start()
+    print(f"\n{'='*80}\n🛰️  SERVIÇO DE JOBS FCSA: http://127.0.0.1:{args.porta}\n{'='*80}")
+    print(f"   Processos: {jobs.max_processos} | Licenças CPLEX: {jobs.max_cplex} | "
+          f"Threads por job: {jobs.threads_por_job}")
+    print(f"   Resultados: {jobs.pasta}")
+    if interrompidos:
+        print(f"   ⚠️  {interrompidos} job(s) da execução anterior marcados como interrompidos")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Encerrando (jobs em execução são cancelados)")
+        for estado in jobs.listar():
+            if estado['status'] not in ESTADOS_FINAIS:
+                jobs.cancelar(estado['job_id'])
+    finally:
+        servidor.server_close()
+
+
+def _requisitar(args, metodo: str, rota: str, corpo=None):
+    """Chamada à API do serviço; retorna (código, resposta)"""
+    dados = json.dumps(corpo).encode('utf-8') if corpo is not None else None
+    pedido = urllib.request.Request(f'http://127.0.0.1:{args.porta}{rota}', data=dados, method=metodo,
+                                    headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(pedido) as resposta:
+            codigo, texto = resposta.status, resposta.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        codigo, texto = e.code, e.read().decode('utf-8')
+    except urllib.error.URLError as e:
+        sys.exit(f"❌ Serviço indisponível em 127.0.0.1:{args.porta} ({e.reason})")
+    try:
+        return codigo, json.loads(texto)
+    except ValueError:
+        return codigo, texto
+
+
+def _imprimir_estado(e: dict):
+    objetivo = f"{e['objetivo']:,.2f}" if e.get('objetivo') is not None else '-'
+    gap = f"{e['gap'] * 100:.2f}%" if e.get('gap') is not None else '-'
+    print(f"{e['job_id']:<24} | {e['status']:<10} | {e.get('fase', '-'):<13} | {objetivo:>16} | "
+          f"{gap:>7} | {e['problema']}")
+
+
+def _imprimir_progresso(r: dict):
+    incumbente = f"{r['incumbente']:,.2f}" if r['incumbente'] is not None else '-'
+    limitante = f"{r['limitante']:,.2f}" if r['limitante'] is not None else '-'
+    gap = f"{r['gap'] * 100:.2f}%" if r['gap'] is not None else '-'
+    print(f"{r['data_hora'][11:]} | {r['fase'] or '-':<8} | {r['t_s']:>8.1f}s | {r['evento']:<10} | "
+          f"{incumbente:>16} | {limitante:>16} | {gap:>7} | {r['nos'] if r['nos'] is not None else '-':>7}")
+
+
+def cliente(args):
+    if args.comando == 'submeter':
+        corpo = {'problema': str(Path(args.problema).resolve())}
+        for nome in PARAMETROS:
+            valor = getattr(args, nome, None)
+            if valor is not None:
+                corpo[nome] = valor
+        if args.sem_cache:
+            corpo['usar_cache'] = False
+        codigo, r = _requisitar(args, 'POST', '/jobs', corpo)
+        if codigo >= 400:
+            sys.exit(f"❌ {r['erro']}")
+        print(f"{'♻️  Unido ao job' if r['duplicado'] else '📨 Job submetido'}: {r['job_id']}")
+        if not args.aguardar:
+            return
+        while r['estado']['status'] not in ESTADOS_FINAIS:
+            time.sleep(2)
+            _, r['estado'] = _requisitar(args, 'GET', f"/jobs/{r['job_id']}")
+        _imprimir_estado(r['estado'])
+        return
+    if args.comando == 'listar':
+        _, estados = _requisitar(args, 'GET', '/jobs')
+        for e in estados:
+            _imprimir_estado(e)
+        return
+    if args.comando == 'progresso':
+        # Acompanha o job (com --seguir, até terminar) pedindo só os registros novos
+        vistos = 0
+        while True:
+            codigo, registros = _requisitar(args, 'GET', f'/jobs/{args.job_id}/progresso?desde={vistos}')
+            if codigo >= 400:
+                sys.exit(f"❌ {registros['erro']}")
+            for r in registros:
+                _imprimir_progresso(r)
+            vistos += len(registros)
+            if not args.seguir or _requisitar(args, 'GET', f'/jobs/{args.job_id}')[1]['status'] in ESTADOS_FINAIS:
+                return
+            time.sleep(2)
+
+    rotas = {'estado': ('GET', ''), 'cancelar': ('DELETE', ''), 'resultado': ('GET', '/resultado'),
+             'log': ('GET', '/log')}
+    metodo, sufixo = rotas[args.comando]
+    codigo, r = _requisitar(args, metodo, f'/jobs/{args.job_id}{sufixo}')
+    if codigo >= 400:
+        sys.exit(f"❌ {r['erro'] if isinstance(r, dict) else r}")
+    if args.comando == 'log':
+        print(r)
+    elif args.comando == 'resultado' and args.saida:
+        Path(args.saida).write_text(json.dumps(r, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 Resultado: {args.saida}")
+    elif args.comando == 'resultado':
+        print(json.dumps(r['solucao'], indent=2, ensure_ascii=False))
+        for i, s in enumerate(r['alternativas'], 1):
+            print(f"🔀 Plano {i}: R$ {s['valor_objetivo']:,.2f} | estações {s['estacoes_instaladas']} | "
+                  f"carports {s['carports_instalados']}")
+    else:
+        _imprimir_estado(r)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serviço local de jobs de otimização FCSA')
+    parser.add_argument('--porta', type=int, default=configuracao_jobs()['porta'])
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    p = comandos.add_parser('servir', help='Inicia o serviço')
+    p.add_argument('--pasta', help='Pasta dos jobs e resultados (padrão: FCSA_JOBS_PASTA ou .cache/jobs)')
+    p.add_argument('--max-processos', type=int, help='Jobs simultâneos (padrão: FCSA_MAX_PROCESSOS ou 1)')
+    p.add_argument('--max-cplex', type=int, help='Jobs CPLEX simultâneos (licenças); padrão = max-processos')
+    p.add_argument('--threads-total', type=int, help='Núcleos divididos entre os jobs (padrão: todos)')
+
+    p = comandos.add_parser('submeter', help='Submete a otimização de uma pasta de problema')
+    p.add_argument('problema')
+    p.add_argument('--backend', choices=BACKENDS)
+    p.add_argument('--metodo', choices=('lexicografico', 'ponderado', 'heuristico'))
+    p.add_argument('--time-limit', dest='time_limit', type=float)
+    p.add_argument('--mip-gap', dest='mip_gap', type=float)
+    p.add_argument('--threads', type=int)
+    p.add_argument('--alternativas', dest='n_alternativas', type=int,
+                   help='Planos alternativos do pool de soluções (backends docplex/cplex)')
+    p.add_argument('--sem-cache', action='store_true', help='Não reutilizar o cache de soluções')
+    p.add_argument('--parada-gap', dest='parada_gap', type=float,
+                   help='Parada antecipada: interrompe cada solve quando o gap atingir este valor (ex.: 0.02)')
+    p.add_argument('--parada-apos', dest='parada_apos_s', type=float,
+                   help='Segundos de solve antes de aplicar --parada-gap (padrão: 0)')
+    p.add_argument('--aguardar', action='store_true', help='Aguarda o fim do job')
+
+    comandos.add_parser('listar', help='Lista os jobs')
+    for nome in ('estado', 'cancelar', 'resultado', 'log', 'progresso'):
+        p = comandos.add_parser(nome)
+        p.add_argument('job_id')
+        if nome == 'resultado':
+            p.add_argument('--saida', help='Grava a resposta em um arquivo JSON')
+        if nome == 'progresso':
+            p.add_argument('--seguir', action='store_true', help='Acompanha até o job terminar')
+
+    args = parser.parse_args()
+    if args.comando == 'servir':
+        servir(args)
+    else:
+        cliente(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,13 +9,16 @@ from streamlit_folium import st_folium
 import pandas as pd
 import sys
 import os
+import time
+from datetime import datetime
 from pathlib import Path
 import yaml
 
 # Adicionar diretório raiz ao path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modelos.modelo_Caio import FCSA_MILP
+from modelos.cache_solucao import CacheSolucoes
+from modelos.jobs_solucao import ESTADOS_FINAIS, ClienteServicoJobs, GerenciadorJobs, configuracao_jobs
 
 # Configuração da página
 st.set_page_config(
@@ -86,6 +89,19 @@ def inicializar_sessao():
         st.session_state.modelo_atual = None
     if 'problema_selecionado' not in st.session_state:
         st.session_state.problema_selecionado = None
+    if 'job_id' not in st.session_state:
+        st.session_state.job_id = None
+
+@st.cache_resource
+def obter_gerenciador_jobs():
+    """Gerenciador de jobs único do servidor (compartilhado entre sessões e reruns)
+    Com servico_jobs.py no ar, submete a ele (fila única); senão, usa um gerenciador
+    local com a mesma configuração (pasta e limites) do serviço."""
+    config = configuracao_jobs()
+    if ClienteServicoJobs.disponivel(config['porta']):
+        return ClienteServicoJobs(config['porta'])
+    return GerenciadorJobs(config['pasta'], max_processos=config['max_processos'],
+                           max_cplex=config['max_cplex'], threads_total=config['threads_total'])
 
 def listar_problemas_disponiveis():
     """Lista problemas disponíveis na pasta dados/"""
@@ -156,32 +172,133 @@ def criar_sidebar():
             
             st.markdown("---")
             
-            # Botão de otimização
-            if st.button("Executar otimização", use_container_width=True):
-                executar_otimizacao(f'dados/{problema_selecionado}')
+            # Cache de soluções: problema e parâmetros inalterados não são resolvidos de novo
+            usar_cache = st.checkbox("♻️ Reutilizar solução em cache", value=True)
+            
+            # Heurística gulosa: plano viável em milissegundos, sem solver MIP (nem gap)
+            heuristica = st.checkbox("⚡ Heurística rápida (sem solver MIP)", value=False)
+            
+            # Planos alternativos do pool de soluções do CPLEX (no mesmo solve)
+            n_alternativas = st.number_input("🔀 Planos alternativos", min_value=1, max_value=20, value=1,
+                                             help="Mais de 1: os próximos melhores planos de estações e carports",
+                                             disabled=heuristica)
+            
+            # Parada antecipada: cada solve é interrompido ao atingir o gap após o tempo mínimo
+            parada = {}
+            with st.expander("⏹️ Parada antecipada"):
+                if st.checkbox("Parar ao atingir o gap", value=False):
+                    parada['parada_gap'] = st.number_input("Gap (%)", min_value=0.0, max_value=100.0,
+                                                           value=2.0, step=0.5) / 100
+                    parada['parada_apos_s'] = st.number_input("Após (s)", min_value=0.0, value=60.0, step=10.0)
+            
+            # Botão de otimização (desabilitado enquanto há um job desta sessão em andamento)
+            if st.button("Executar otimização", use_container_width=True,
+                         disabled=st.session_state.job_id is not None):
+                parametros = {'metodo': 'heuristico'} if heuristica else dict(parada, n_alternativas=int(n_alternativas))
+                executar_otimizacao(f'dados/{problema_selecionado}', usar_cache, parametros)
+            
+            if st.button("🗑️ Limpar cache deste problema", use_container_width=True):
+                removidas = CacheSolucoes().invalidar(instancia=f'dados/{problema_selecionado}')
+                st.info(f"{removidas} solução(ões) removida(s) do cache")
+            
+            exibir_jobs_anteriores(f'dados/{problema_selecionado}')
         
         return problema_selecionado
 
-def executar_otimizacao(pasta_problema):
-    """Executa otimização do modelo"""
-    with st.spinner("🔄 Resolvendo modelo FCSA MILP... Isso pode levar alguns minutos."):
-        try:
-            # Criar e resolver modelo
-            modelo = FCSA_MILP(pasta_problema)
-            sucesso = modelo.resolver()
-            
-            if sucesso:
-                st.session_state.modelo_resolvido = True
-                st.session_state.modelo_atual = modelo
-                st.session_state.problema_selecionado = pasta_problema
-                st.success("✅ Otimização concluída com sucesso!")
-                st.rerun()
-            else:
-                st.error("❌ Não foi possível encontrar uma solução viável.")
-                
-        except Exception as e:
-            st.error(f"❌ Erro durante otimização: {str(e)}")
-            st.exception(e)
+def exibir_jobs_anteriores(pasta_problema):
+    """Execuções concluídas deste problema (ex.: de outra sessão), abertas sem resolver de novo"""
+    pasta = Path(pasta_problema).resolve()
+    concluidos = [e for e in obter_gerenciador_jobs().listar()
+                  if Path(e['problema']).resolve() == pasta and e['status'] == 'concluido']
+    if not concluidos:
+        return
+    with st.expander(f"🗂️ Execuções concluídas ({len(concluidos)})"):
+        rotulos = {f"{e['fim']} · R$ {e['objetivo']:,.0f}": e['job_id'] for e in concluidos}
+        escolhido = st.selectbox("Execução:", list(rotulos))
+        if st.button("Abrir resultado", use_container_width=True):
+            carregar_resultado_job(rotulos[escolhido])
+
+def executar_otimizacao(pasta_problema, usar_cache=True, parametros=None):
+    """Submete a otimização como job em segundo plano (ver modelos.jobs_solucao)"""
+    st.session_state.job_id = obter_gerenciador_jobs().submeter(pasta_problema, usar_cache=usar_cache,
+                                                                **(parametros or {}))
+    st.rerun()
+
+def carregar_resultado_job(job_id):
+    """Carrega a solução de um job concluído na sessão (sem resolver de novo)"""
+    try:
+        modelo = obter_gerenciador_jobs().modelo(job_id)
+    except Exception as e:
+        st.error(f"❌ Erro ao carregar resultado: {str(e)}")
+        st.exception(e)
+        return
+    st.session_state.modelo_resolvido = True
+    st.session_state.modelo_atual = modelo
+    st.session_state.problema_selecionado = str(modelo.pasta)
+    st.session_state.job_id = None
+    st.rerun()
+
+def acompanhar_job(intervalo_s=2):
+    """
+    Exibe o progresso do job da sessão; enquanto ele roda, a página é reexecutada a
+    cada intervalo_s segundos. Ao concluir, a solução é carregada na sessão.
+    """
+    jobs = obter_gerenciador_jobs()
+    job_id = st.session_state.job_id
+    estado = jobs.estado(job_id)
+    
+    if estado is None:
+        st.session_state.job_id = None
+        return
+    if estado['status'] == 'concluido':
+        st.success("✅ Otimização concluída com sucesso!")
+        carregar_resultado_job(job_id)
+        return
+    if estado['status'] in ESTADOS_FINAIS:
+        st.session_state.job_id = None
+        if estado['status'] == 'cancelado':
+            st.warning("⏹️ Otimização cancelada.")
+        else:
+            st.error(f"❌ Não foi possível encontrar uma solução viável ({estado.get('erro', '')}).")
+            with st.expander("Log da execução"):
+                st.code(jobs.log(job_id, linhas=40))
+        return
+    
+    st.markdown(f"#### 🔄 Otimização em andamento · job `{job_id}`")
+    col1, col2, col3, col4 = st.columns(4)
+    if estado['status'] == 'na_fila':
+        col1.metric("Status", "Na fila", f"posição {estado.get('posicao_fila', '-')}")
+    else:
+        col1.metric("Status", "Executando", estado.get('fase', ''))
+    inicio = estado.get('inicio') or estado['submetido']
+    decorrido = (datetime.now() - datetime.fromisoformat(inicio)).total_seconds()
+    col2.metric("Tempo decorrido", f"{decorrido:.0f}s")
+    if estado.get('objetivo') is not None:
+        if estado.get('fase_solver') == 'passo1':
+            col3.metric("f* (passo 1)", f"{estado['objetivo']:,.4f}")
+        else:
+            col3.metric("Melhor custo", f"R$ {estado['objetivo']:,.0f}")
+    if estado.get('gap') is not None:
+        col4.metric("Gap", f"{estado['gap'] * 100:.2f}%")
+    exibir_progresso_solver(jobs.progresso(job_id), estado.get('fase_solver'))
+    
+    if st.button("⏹️ Cancelar otimização"):
+        jobs.cancelar(job_id)
+        st.rerun()
+    with st.expander("Log da execução"):
+        st.code(jobs.log(job_id))
+    
+    time.sleep(intervalo_s)
+    st.rerun()
+
+def exibir_progresso_solver(registros, fase):
+    """Incumbente e limitante do solve corrente ao longo do tempo (modelos.progresso)"""
+    registros = [r for r in registros if r['fase'] == fase and r['incumbente'] is not None]
+    if not registros:
+        return
+    df = pd.DataFrame(registros).set_index('t_s')[['incumbente', 'limitante']]
+    st.caption(f"Progresso do solver · {fase} · {registros[-1]['nos'] or 0} nós")
+    st.line_chart(df, height=220)
 
 def criar_mapa_resultados(modelo):
     """Cria mapa interativo com resultados"""
@@ -359,7 +476,7 @@ def exibir_detalhes_solucao(modelo):
     solucao = modelo.solucao
     
     # Abas para organizar informações (SEM ANÁLISE)
-    tab1, tab2, tab3 = st.tabs(["💰 Custos", "⚡ Energia", "☀️ Sistemas PV"])
+    tab1, tab2, tab3, tab4 = st.tabs(["💰 Custos", "⚡ Energia", "☀️ Sistemas PV", "🔀 Alternativas"])
     
     with tab1:
         col1, col2 = st.columns(2)
@@ -434,6 +551,31 @@ def exibir_detalhes_solucao(modelo):
                          f"R$ {sum(modelo.c_PV[k] for k in solucao['carports_instalados'].values()):,.0f}")
         else:
             st.info("Nenhum sistema PV foi instalado nesta solução.")
+    
+    with tab4:
+        exibir_alternativas(modelo)
+
+def exibir_alternativas(modelo):
+    """Planos alternativos do pool de soluções; o escolhido passa a ser exibido no mapa"""
+    if len(modelo.alternativas) < 2:
+        st.info("Sem planos alternativos: execute com \"Planos alternativos\" > 1 (backend CPLEX).")
+        return
+    melhor = modelo.alternativas[0]['valor_objetivo']
+    st.dataframe(pd.DataFrame([{
+        'Plano': i,
+        'Custo total (R$)': f"{s['custo_total']:,.0f}",
+        'Δ objetivo': f"{100 * (s['valor_objetivo'] - melhor) / abs(melhor):.2f}%",
+        'Investimento (R$)': f"{s['custo_investimento']:,.0f}",
+        'Operação VP (R$)': f"{s['custo_operacao_vp']:,.0f}",
+        'Estações': ', '.join(map(str, s['estacoes_instaladas'])),
+        'Carports (link: tipo)': ', '.join(f"{l}: {k}" for l, k in s['carports_instalados'].items()),
+    } for i, s in enumerate(modelo.alternativas, 1)]), use_container_width=True, hide_index=True)
+    
+    atual = next((i for i, s in enumerate(modelo.alternativas) if s is modelo.solucao), 0)
+    plano = st.selectbox("Plano exibido:", range(1, len(modelo.alternativas) + 1), index=atual)
+    if plano - 1 != atual:
+        modelo.solucao = modelo.alternativas[plano - 1]
+        st.rerun()
 
 def main():
     """Função principal do dashboard"""
@@ -449,6 +591,11 @@ def main():
     if not problema_selecionado:
         return
     
+    # Job em segundo plano desta sessão: progresso até concluir
+    if st.session_state.job_id is not None:
+        acompanhar_job()
+        return
+    
     # Verificar se há modelo resolvido
     if st.session_state.modelo_resolvido and st.session_state.modelo_atual:
         modelo = st.session_state.modelo_atual
@@ -0,0 +1,83 @@
+"""
+Script de validação dos planos alternativos do FCSA (resolver com n_alternativas)
+Na instância sintética média (dentro dos limites do CPLEX Community), para cada backend
+CPLEX e método, verifica:
+    - o primeiro plano é a solução ótima (self.solucao) e os custos são crescentes
+    - os planos são distintos (estações e carports) e estão dentro de gap_alternativas
+    - o objetivo de cada plano confere com seus custos (Cin + Cop, menos γ·f no ponderado)
+E que o backend HiGHS (sem pool de soluções) é recusado.
+
+Uso:
+    python teste_alternativas_fcsa.py
+    python teste_alternativas_fcsa.py --alternativas 8 --gap 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+
+from dados.dados_fcsa_sintetico import obter_dados_fcsa_medio
+from modelos.modelo_Caio import FCSA_MILP
+
+
+def resolver(dados: dict, backend: str, metodo: str, n: int, gap: float) -> FCSA_MILP:
+    modelo = FCSA_MILP.de_dict(dados['L'], dados['T'], dados['K'], dados['parametros'])
+    modelo.log_output = False
+    modelo.gap_alternativas = gap
+    modelo.resolver(backend=backend, metodo=metodo, n_alternativas=n)
+    return modelo
+
+
+def checar(modelo: FCSA_MILP, metodo: str, n: int, gap: float):
+    planos = modelo.alternativas
+    objetivos = [s['valor_objetivo'] for s in planos]
+    chaves = {(tuple(s['estacoes_instaladas']), tuple(sorted(s['carports_instalados'].items()))) for s in planos}
+    peso_f = modelo.gamma if metodo == 'ponderado' else 0.0
+    return [
+        (bool(planos) and planos[0] is modelo.solucao and objetivos == sorted(objetivos),
+         f"{len(planos)} plano(s) (máx. {n}), o ótimo primeiro e custos crescentes"),
+        (len(chaves) == len(planos) and objetivos[-1] <= objetivos[0] + gap * abs(objetivos[0]) + 1e-6,
+         f"Planos distintos, até {gap * 100:.0f}% acima do ótimo"),
+        (all(abs(s['custo_total'] - peso_f * s['f_otimo'] - s['valor_objetivo']) <= 1e-6 * abs(s['valor_objetivo'])
+             for s in planos),
+         "Objetivo de cada plano confere com seus custos"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação dos planos alternativos do FCSA')
+    parser.add_argument('--alternativas', type=int, default=5)
+    parser.add_argument('--gap', type=float, default=0.5, help='gap_alternativas')
+    parser.add_argument('--backends', nargs='+', default=list(FCSA_MILP.BACKENDS_POOL),
+                        choices=FCSA_MILP.BACKENDS_POOL)
+    args = parser.parse_args()
+
+    dados = obter_dados_fcsa_medio()
+    resultados = []
+    for backend in args.backends:
+        for metodo in ('lexicografico', 'ponderado'):
+            with contextlib.redirect_stdout(io.StringIO()):
+                modelo = resolver(dados, backend, metodo, args.alternativas, args.gap)
+            resultados.append((f"{backend} / {metodo}", checar(modelo, metodo, args.alternativas, args.gap)))
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resolver(dados, 'highs', 'lexicografico', args.alternativas, args.gap)
+        recusado = False
+    except ValueError:
+        recusado = True
+
+    print(f"\n{'='*80}\n🔀 PLANOS ALTERNATIVOS (pool de soluções) - instância média\n{'='*80}")
+    falhas = 0
+    for rotulo, checagens in resultados:
+        print(f"   [{rotulo}]")
+        for ok, descricao in checagens:
+            print(f"   {'✅' if ok else '❌'} {descricao}")
+            falhas += not ok
+    print(f"   {'✅' if recusado else '❌'} Backend highs recusado (sem pool de soluções)")
+    return 1 if falhas or not recusado else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Script de validação dos backends do modelo FCSA MILP
+Resolve os problemas com cada backend e compara os valores objetivo
+"""
+
+from modelos.modelo_Caio import FCSA_MILP
+import sys
+
+
+def comparar_backends(pasta: str, backends=FCSA_MILP.BACKENDS) -> bool:
+    """Resolve pasta com cada backend e verifica se os objetivos coincidem (dentro do gap MIP)"""
+    resultados = {}
+    for backend in backends:
+        modelo = FCSA_MILP(pasta)
+        if not modelo.resolver(backend=backend):
+            print(f"\n❌ {pasta} [{backend}]: sem solução")
+            return False
+        resultados[backend] = modelo.solucao
+
+    print(f"\n{'='*80}\n📊 COMPARAÇÃO DE BACKENDS - {pasta}\n{'='*80}")
+    print(f"{'Backend':>10} | {'f*':>12} | {'Objetivo (R$)':>16} | {'Tempo (s)':>10} | Estações")
+    print('-' * 80)
+    for backend, s in resultados.items():
+        print(f"{backend:>10} | {s['f_otimo']:>12.4f} | {s['valor_objetivo']:>16,.2f} | "
+              f"{s['tempo_s']:>10.2f} | {s['estacoes_instaladas']}")
+
+    referencia = resultados[backends[0]]
+    tolerancia = modelo.mip_gap * abs(referencia['valor_objetivo'])
+    ok = all(
+        abs(s['valor_objetivo'] - referencia['valor_objetivo']) <= tolerancia
+        and abs(s['f_otimo'] - referencia['f_otimo']) <= 1e-6 * max(1.0, abs(referencia['f_otimo']))
+        for s in resultados.values()
+    )
+    print(f"\n{'✅ Objetivos coincidem' if ok else '❌ Objetivos divergem'} (tolerância: gap MIP {modelo.mip_gap*100:.1f}%)")
+    return ok
+
+
+def main():
+    """Compara backends nos problemas fornecidos (padrão: problema0 e problema1)"""
+    pastas = sys.argv[1:] or ['dados/problema0', 'dados/problema1']
+    ok = all([comparar_backends(pasta) for pasta in pastas])
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Script de validação do cache de soluções do FCSA (modelos/cache_solucao.py)
+Numa pasta de cache temporária verifica:
+    - a segunda execução do mesmo problema vem do cache (sem construir o modelo) e
+      devolve a mesma solução, inclusive os arrays por (l,t)
+    - mudar um parâmetro do solver (mip_gap) muda a chave
+    - invalidar(instancia=...) remove as entradas do problema
+    - o despejo LRU mantém o cache dentro de tamanho_max_mb
+
+Uso:
+    python teste_cache_solucao.py
+    python teste_cache_solucao.py --problema dados/problema1 --backend cplex
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from modelos.cache_solucao import CacheSolucoes
+from modelos.modelo_Caio import FCSA_MILP
+
+
+def resolver(pasta: str, backend: str, cache: CacheSolucoes, **atributos):
+    modelo = FCSA_MILP(pasta)
+    modelo.log_output = False
+    modelo.cache_solucoes = cache
+    for nome, valor in atributos.items():
+        setattr(modelo, nome, valor)
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok = modelo.resolver(backend=backend)
+    return modelo, ok, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação do cache de soluções do FCSA')
+    parser.add_argument('--problema', default='dados/problema0')
+    parser.add_argument('--backend', default='highs', choices=FCSA_MILP.BACKENDS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CacheSolucoes(tmp)
+        m1, ok1, t1 = resolver(args.problema, args.backend, cache)
+        m2, ok2, t2 = resolver(args.problema, args.backend, cache)
+        s1, s2 = m1.solucao, m2.solucao
+        do_cache = m2.modelo is None
+        iguais = (ok1 and ok2 and all(s1[k] == s2[k] for k in s1 if k != 'arrays')
+                  and all(np.array_equal(s1['arrays'][k], s2['arrays'][k]) for k in s1['arrays']))
+
+        resolver(args.problema, args.backend, cache, mip_gap=m1.mip_gap / 2)
+        nova_chave = len(cache.entradas()) == 2
+
+        tamanho = cache.tamanho_mb()
+        cache.tamanho_max_mb = 0.6 * tamanho
+        despejo = cache.despejar() == 1 and cache.tamanho_mb() <= cache.tamanho_max_mb
+        invalidado = cache.invalidar(instancia=args.problema) == 1 and not cache.entradas()
+
+    print(f"\n{'='*80}\n♻️  CACHE DE SOLUÇÕES - {args.problema} [{args.backend}]\n{'='*80}")
+    print(f"   1ª execução (resolve): {t1:.3f}s | 2ª execução: {t2:.3f}s ({t1 / max(t2, 1e-9):.0f}x)")
+    checagens = [
+        (do_cache, "2ª execução recuperada do cache (modelo não construído)"),
+        (iguais, "Mesma solução (indicadores e arrays por família)"),
+        (nova_chave, "Parâmetro do solver diferente → nova entrada"),
+        (despejo, "Despejo LRU respeita tamanho_max_mb"),
+        (invalidado, "invalidar(instancia=...) remove as entradas do problema"),
+    ]
+    for ok, descricao in checagens:
+        print(f"   {'✅' if ok else '❌'} {descricao}")
+    return 0 if all(ok for ok, _ in checagens) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
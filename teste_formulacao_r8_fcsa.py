@@ -0,0 +1,85 @@
+"""
+Script de validação da formulação sem binárias de R8 (E_lot = max{0, E_pv - E_d_eff})
+Resolve cada problema com a formulação big-M da tese e com a formulação 'sem_binarias'
+(com e sem presolve) e verifica:
+    - igualdade de f* e do valor objetivo ótimo
+    - viabilidade da solução 'sem_binarias' no modelo big-M completo (com x_aux deduzido)
+Imprime também o número de binárias do modelo resolvido e os tempos.
+
+Uso:
+    python teste_formulacao_r8_fcsa.py
+    python teste_formulacao_r8_fcsa.py dados/problema0 --backend highs
+"""
+
+import argparse
+import sys
+
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.solvers import MatrizMILP
+
+
+def resolver(pasta: str, backend: str, formulacao: str, presolve: bool, gap: float) -> FCSA_MILP:
+    modelo = FCSA_MILP(pasta)
+    modelo.mip_gap = gap
+    modelo.log_output = False
+    modelo.construir(backend=backend, presolve=presolve, formulacao_r8=formulacao)
+    if not modelo.resolver():
+        raise RuntimeError(f"{pasta} [{backend}, {formulacao}, presolve={presolve}]: sem solução")
+    return modelo
+
+
+def num_binarias(modelo: FCSA_MILP) -> int:
+    tipos = modelo._presolve.matriz.tipos if modelo._presolve else modelo._limites_variaveis()[2]
+    return int((tipos == 'B').sum())
+
+
+def violacao_big_m(modelo: FCSA_MILP) -> float:
+    """Violação máxima da solução no modelo big-M completo, com x_aux = (E_lot > 0)"""
+    z = modelo._valores.copy()
+    idx = modelo._idx
+    z[idx['x_aux']] = (z[idx['E_lot']] > 1e-9).astype(float)
+    formulacao, modelo.formulacao_r8 = modelo.formulacao_r8, 'big_m'
+    lb, ub, tipos = modelo._limites_variaveis()
+    matriz = MatrizMILP(lb, ub, tipos, modelo._blocos_restricoes(com_nomes=False))
+    modelo.formulacao_r8 = formulacao
+    return matriz.violacao_maxima(z)
+
+
+def verificar_formulacao(pasta: str, backend: str, gap: float) -> bool:
+    """Compara as formulações de R8; retorna True se os ótimos coincidem"""
+    casos = [('big_m', True), ('sem_binarias', True), ('sem_binarias', False)]
+    modelos = [resolver(pasta, backend, f, p, gap) for f, p in casos]
+    violacao = max(violacao_big_m(m) for m in modelos[1:])
+
+    print(f"\n{'='*80}\n🔀 FORMULAÇÃO R8 - {pasta} [{backend}]\n{'='*80}")
+    print(f"{'Formulação':>14} | {'Presolve':>8} | {'Binárias':>8} | {'f*':>10} | "
+          f"{'Objetivo (R$)':>16} | {'Nós':>6} | {'Tempo (s)':>9}")
+    print('-' * 90)
+    for (formulacao, presolve), m in zip(casos, modelos):
+        s = m.solucao
+        print(f"{formulacao:>14} | {'sim' if presolve else 'não':>8} | {num_binarias(m):>8} | "
+              f"{s['f_otimo']:>10.4f} | {s['valor_objetivo']:>16,.2f} | {s['nos_bb']:>6} | {s['tempo_s']:>9.2f}")
+
+    ref = modelos[0].solucao
+    tolerancia = 1e-6 * max(1.0, abs(ref['valor_objetivo']))
+    ok = all(abs(m.solucao['f_otimo'] - ref['f_otimo']) <= 1e-6 * max(1.0, abs(ref['f_otimo']))
+             and abs(m.solucao['valor_objetivo'] - ref['valor_objetivo']) <= tolerancia
+             for m in modelos[1:]) and violacao <= 1e-6
+    print(f"\n   Violação máxima das soluções sem binárias no modelo big-M: {violacao:.2e}")
+    print(f"{'✅ Objetivos coincidem' if ok else '❌ Objetivos divergem'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação da formulação sem binárias de R8 do FCSA MILP')
+    parser.add_argument('pastas', nargs='*', default=['dados/problema0', 'dados/problema1'])
+    parser.add_argument('--backend', default='highs', choices=FCSA_MILP.BACKENDS)
+    parser.add_argument('--gap', type=float, default=0.0, help='Gap MIP (0 = ótimo exato)')
+    args = parser.parse_args()
+
+    ok = all([verificar_formulacao(pasta, args.backend, args.gap) for pasta in args.pastas])
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Script de validação da heurística do FCSA (modelos/heuristica.py)
+Em cada instância (pastas de problema e uma instância gerada), verifica:
+    - os planos da gulosa e da gulosa + LP são viáveis no modelo completo (R0-R12)
+      e self.solucao tem as mesmas chaves da solução exata
+    - f da heurística não é menor que f* do método exato (passo 1)
+    - o despacho em forma fechada tem o custo do LP operacional ('reparado'), também
+      com carports sorteados (créditos NM exportados e importados)
+    - inicio_passo2='heuristica' leva ao mesmo ótimo que o MIP start padrão
+
+Uso:
+    python teste_heuristica_fcsa.py
+    python teste_heuristica_fcsa.py --problemas dados/problema1 --links 400
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from dados.gerador_instancias import gerar_problema
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.solvers import MatrizMILP
+
+
+def carregar(pasta: str) -> FCSA_MILP:
+    with contextlib.redirect_stdout(io.StringIO()):
+        modelo = FCSA_MILP(pasta)
+    modelo.log_output = False
+    return modelo
+
+
+def violacao(modelo: FCSA_MILP, valores: np.ndarray) -> float:
+    lb, ub, tipos = modelo._limites_variaveis()
+    return MatrizMILP(lb, ub, tipos, modelo._blocos_restricoes(com_nomes=False)).violacao_maxima(valores)
+
+
+def custo_reparado(modelo: FCSA_MILP, valores: np.ndarray) -> float:
+    """Custo com x e w de valores e a operação do LP operacional (_inicio_passo2 'reparado')"""
+    modelo.backend = 'highs'
+    with contextlib.redirect_stdout(io.StringIO()):
+        return float(modelo._c_custo @ modelo._inicio_passo2(valores, 'reparado'))
+
+
+def carports_sorteados(modelo: FCSA_MILP, x: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Um tipo que cabe na área (R11) em cada estação, sorteado"""
+    rng = np.random.default_rng(seed)
+    cabe = modelo._a_k_vec[None, :] <= modelo._cp_vec[:, None] * modelo.a
+    w = np.zeros(cabe.shape, dtype=bool)
+    for l in np.flatnonzero(x & cabe.any(axis=1)):
+        w[l, rng.choice(np.flatnonzero(cabe[l]))] = True
+    return w
+
+
+def checar(pasta: str):
+    gulosa, lp = carregar(pasta), carregar(pasta)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok_gulosa = gulosa.resolver(metodo='heuristico')
+        ok_lp = lp.resolver_heuristico(relaxacao_lp=True)
+    exato, inicio_heur = carregar(pasta), carregar(pasta)
+    with contextlib.redirect_stdout(io.StringIO()):
+        exato.resolver(backend='highs')
+        inicio_heur.resolver(backend='highs', inicio_passo2='heuristica')
+
+    x = gulosa._valores[gulosa._idx['x']] > 0.5
+    com_pv = gulosa._valores_plano(x, carports_sorteados(gulosa, x))
+    ref = exato.solucao['valor_objetivo']
+    tolerancia = exato.mip_gap * abs(ref) + 1e-6
+    return [
+        (ok_gulosa and ok_lp and max(violacao(gulosa, gulosa._valores), violacao(lp, lp._valores)) <= 1e-6,
+         f"Planos viáveis: gulosa {gulosa.solucao['tempo_s'] * 1000:.1f} ms "
+         f"(f = {gulosa.solucao['f_otimo']:,.2f}), gulosa + LP {lp.solucao['tempo_s'] * 1000:.1f} ms "
+         f"(f = {lp.solucao['f_otimo']:,.2f})"),
+        (gulosa.solucao.keys() == exato.solucao.keys(), "Solução no mesmo formato da exata"),
+        (min(gulosa.solucao['f_otimo'], lp.solucao['f_otimo']) >= exato.solucao['f_otimo'] - 1e-6,
+         f"f da heurística ≥ f* = {exato.solucao['f_otimo']:,.2f}"),
+        (np.isclose(gulosa.solucao['valor_objetivo'], custo_reparado(gulosa, gulosa._valores), rtol=1e-9)
+         and violacao(gulosa, com_pv) <= 1e-6
+         and np.isclose(gulosa._c_custo @ com_pv, custo_reparado(gulosa, com_pv), rtol=1e-9),
+         f"Despacho = LP operacional (carports sorteados: "
+         f"{com_pv[gulosa._idx['E_minus_nm']].sum():,.0f} kWh importados de créditos NM)"),
+        (abs(inicio_heur.solucao['valor_objetivo'] - ref) <= tolerancia,
+         f"inicio_passo2='heuristica': ótimo R$ {inicio_heur.solucao['valor_objetivo']:,.2f} "
+         f"(padrão R$ {ref:,.2f})"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação da heurística do FCSA')
+    parser.add_argument('--problemas', nargs='*', default=['dados/problema0'])
+    parser.add_argument('--links', nargs='*', type=int, default=[100])
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}\n⚡ HEURÍSTICA FCSA (gulosa + arredondamento de LP)\n{'='*80}")
+    falhas = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pastas = list(args.problemas) + [str(gerar_problema(Path(tmp) / f'L{L}', L)) for L in args.links]
+        for pasta in pastas:
+            print(f"   [{Path(pasta).name}]")
+            for ok, descricao in checar(pasta):
+                print(f"   {'✅' if ok else '❌'} {descricao}")
+                falhas += not ok
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Script de validação da instância compilada comum aos modelos FCSA
+Para os casos sintéticos de dados/dados_fcsa_sintetico.py verifica:
+    - FCSAInstance.de_dict → salvar → de_arquivo preserva arrays e config
+    - ModeloFCSA_MILP (API de dicionários) e FCSA_MILP sobre a instância recarregada
+      (objetivo ponderado) chegam ao mesmo valor objetivo
+E que a carga de uma pasta com CSVs truncados (cópia de dados/problema0 sem uma linha
+por link ou por (link, período)) falha com ValueError em vez de resolver com NaN/zeros,
+e que uma fonte com mtime alterado e conteúdo igual (touch) reaproveita o cache e tem
+o mtime regravado no cabeçalho.
+
+Uso:
+    python teste_instancia_fcsa.py
+    python teste_instancia_fcsa.py --backend cplex
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dados.dados_fcsa_sintetico import obter_dados_fcsa_medio, obter_dados_fcsa_simplificado
+from modelos import cache_instancia
+from modelos.instancia import FCSAInstance
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.modelo_Caio_testes import ModeloFCSA_MILP
+
+
+def verificar_caso(nome: str, dados: dict, backend: str) -> bool:
+    L, T, K, parametros = dados['L'], dados['T'], dados['K'], dados['parametros']
+
+    inst = FCSAInstance.de_dict(L, T, K, parametros)
+    with tempfile.TemporaryDirectory() as tmp:
+        recarregada = FCSAInstance.de_arquivo(inst.salvar(Path(tmp) / 'instancia.bin'))
+        iguais = (inst.config == recarregada.config and sorted(inst.arrays) == sorted(recarregada.arrays)
+                  and all(np.array_equal(inst.arrays[a], recarregada.arrays[a]) for a in inst.arrays))
+
+        modelo_dict = ModeloFCSA_MILP(L, T, K, parametros, backend=backend)
+        ok_dict = modelo_dict.resolver(mip_gap=0.0, log_output=False)
+
+        modelo_arq = FCSA_MILP.de_instancia(recarregada)
+        modelo_arq.mip_gap, modelo_arq.log_output = 0.0, False
+        modelo_arq.tipo_big_m = modelo_dict.fcsa.tipo_big_m
+        ok_arq = modelo_arq.resolver(backend=backend, metodo='ponderado')
+
+    print(f"\n{'='*80}\n🧩 INSTÂNCIA COMPILADA - {nome} [{backend}]\n{'='*80}")
+    print(f"   Links: {len(L)} | Períodos: {len(T)} | Tipos PV: {len(K)}")
+    print(f"   {'✅' if iguais else '❌'} de_dict → salvar → de_arquivo: arrays e config preservados")
+    if not (ok_dict and ok_arq):
+        print(f"   ❌ Sem solução (dicionários: {ok_dict}, arquivo: {ok_arq})")
+        return False
+
+    obj_dict = modelo_dict.valor_objetivo
+    obj_arq = modelo_arq.solucao['valor_objetivo']
+    mesmo = abs(obj_dict - obj_arq) <= 1e-6 * max(1.0, abs(obj_dict))
+    print(f"   ModeloFCSA_MILP (dicionários): R$ {obj_dict:,.2f} → {modelo_dict.estacoes_instaladas}")
+    print(f"   FCSA_MILP (arquivo):           R$ {obj_arq:,.2f} → {modelo_arq.solucao['estacoes_instaladas']}")
+    print(f"{'✅ Objetivos coincidem' if mesmo else '❌ Objetivos divergem'}")
+    return iguais and mesmo
+
+
+def verificar_csv_truncado(pasta_base: str = 'dados/problema0') -> bool:
+    """Pastas com uma linha removida de um CSV por link e de um CSV por (link, período)"""
+    print(f"\n{'='*80}\n✂️  CSVs TRUNCADOS ({pasta_base})\n{'='*80}")
+    ok = True
+    for arquivo in ('custos_estacoes.csv', 'demanda_energia.csv'):
+        with tempfile.TemporaryDirectory() as tmp:
+            pasta = Path(tmp) / 'problema'
+            shutil.copytree(pasta_base, pasta, ignore=shutil.ignore_patterns('.cache'))
+            df = pd.read_csv(pasta / arquivo)
+            df.drop(index=len(df) // 2).to_csv(pasta / arquivo, index=False)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    FCSA_MILP(str(pasta), usar_cache=False)
+                erro = None
+            except ValueError as e:
+                erro = str(e)
+        rejeitado = erro is not None and arquivo in erro
+        print(f"   {'✅' if rejeitado else '❌'} {arquivo} sem uma linha: "
+              f"{erro if erro is not None else 'carregado sem erro'}")
+        ok &= rejeitado
+    return ok
+
+
+def verificar_mtime_regravado(pasta_base: str = 'dados/problema0') -> bool:
+    """Cache compilado após touch numa fonte: carga do cache e cabeçalho com o novo mtime"""
+    print(f"\n{'='*80}\n🕒 CACHE APÓS TOUCH NAS FONTES ({pasta_base})\n{'='*80}")
+    with tempfile.TemporaryDirectory() as tmp:
+        pasta = Path(tmp) / 'problema'
+        shutil.copytree(pasta_base, pasta, ignore=shutil.ignore_patterns('.cache'))
+        cache_instancia.carregar_pasta(pasta)
+        fonte = pasta / 'demanda_energia.csv'
+        mtime = fonte.stat().st_mtime_ns + 10**9
+        os.utime(fonte, ns=(mtime, mtime))
+        origem = cache_instancia.carregar_pasta(pasta)[2]
+        cabecalho, _ = cache_instancia._ler_cabecalho(pasta / cache_instancia.ARQUIVO_CACHE)
+        regravado = cabecalho['fontes']['demanda_energia.csv'][0] == mtime
+    ok = origem == 'cache' and regravado
+    print(f"   {'✅' if ok else '❌'} Origem após touch: {origem}; "
+          f"mtime {'regravado' if regravado else 'não regravado'} no cabeçalho")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação da instância compilada do FCSA')
+    parser.add_argument('--backend', default='highs', choices=FCSA_MILP.BACKENDS)
+    args = parser.parse_args()
+
+    casos = [('simplificado', obter_dados_fcsa_simplificado()), ('médio', obter_dados_fcsa_medio())]
+    ok = all([verificar_caso(nome, dados, args.backend) for nome, dados in casos] + [verificar_csv_truncado(), verificar_mtime_regravado()])
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
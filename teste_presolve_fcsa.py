@@ -0,0 +1,73 @@
+"""
+Script de validação do presolve estrutural do modelo FCSA MILP
+Resolve cada problema com e sem presolve e verifica:
+    - igualdade de f* e do valor objetivo ótimo
+    - viabilidade da solução expandida no modelo completo
+Imprime também a redução de colunas, linhas e não-nulos.
+
+Uso:
+    python teste_presolve_fcsa.py
+    python teste_presolve_fcsa.py dados/problema0 --backend highs
+"""
+
+import argparse
+import sys
+
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.solvers import MatrizMILP
+
+
+def resolver(pasta: str, backend: str, presolve: bool, gap: float) -> FCSA_MILP:
+    modelo = FCSA_MILP(pasta)
+    modelo.mip_gap = gap
+    modelo.log_output = False
+    modelo.construir(backend=backend, presolve=presolve)
+    if not modelo.resolver():
+        raise RuntimeError(f"{pasta} [{backend}, presolve={presolve}]: sem solução")
+    return modelo
+
+
+def verificar_presolve(pasta: str, backend: str, gap: float) -> bool:
+    """Compara as soluções com e sem presolve; retorna True se coincidem"""
+    completo = resolver(pasta, backend, presolve=False, gap=gap)
+    reduzido = resolver(pasta, backend, presolve=True, gap=gap)
+
+    # Solução do modelo reduzido, expandida, deve ser viável no modelo completo
+    lb, ub, tipos = reduzido._limites_variaveis()
+    matriz = MatrizMILP(lb, ub, tipos, reduzido._blocos_restricoes(com_nomes=False))
+    violacao = matriz.violacao_maxima(reduzido._valores)
+
+    print(f"\n{'='*80}\n🧹 PRESOLVE - {pasta} [{backend}]\n{'='*80}")
+    print(f"{'':>12} | {'Completo':>10} | {'Reduzido':>10} | {'Redução':>8}")
+    print('-' * 50)
+    for nome, (antes, depois) in reduzido._presolve.reducao.items():
+        print(f"{nome:>12} | {antes:>10} | {depois:>10} | {100 * (antes - depois) / antes:>7.1f}%")
+
+    s1, s2 = completo.solucao, reduzido.solucao
+    print(f"\n{'':>12} | {'f*':>12} | {'Objetivo (R$)':>16} | {'Tempo (s)':>10}")
+    print('-' * 60)
+    for nome, s in (('Completo', s1), ('Reduzido', s2)):
+        print(f"{nome:>12} | {s['f_otimo']:>12.4f} | {s['valor_objetivo']:>16,.2f} | {s['tempo_s']:>10.2f}")
+
+    tolerancia = 1e-6 * max(1.0, abs(s1['valor_objetivo']))
+    ok = (abs(s1['f_otimo'] - s2['f_otimo']) <= 1e-6 * max(1.0, abs(s1['f_otimo']))
+          and abs(s1['valor_objetivo'] - s2['valor_objetivo']) <= tolerancia
+          and violacao <= 1e-6)
+    print(f"\n   Violação máxima da solução expandida no modelo completo: {violacao:.2e}")
+    print(f"{'✅ Objetivos coincidem' if ok else '❌ Objetivos divergem'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação do presolve estrutural do FCSA MILP')
+    parser.add_argument('pastas', nargs='*', default=['dados/problema0', 'dados/problema1'])
+    parser.add_argument('--backend', default='docplex', choices=FCSA_MILP.BACKENDS)
+    parser.add_argument('--gap', type=float, default=0.0, help='Gap MIP (0 = ótimo exato)')
+    args = parser.parse_args()
+
+    ok = all([verificar_presolve(pasta, args.backend, args.gap) for pasta in args.pastas])
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Script de validação do progresso do solver em tempo real (modelos/progresso.py)
+Num set cover aleatório pequeno (dentro dos limites do CPLEX Community), em cada backend:
+    - os registros emitidos (callback e JSONL) trazem incumbente, limitante, gap e nós
+    - RegraParada interrompe o solve e o resultado traz a melhor solução e 'parada'
+    - o mesmo solver volta a resolver até o fim sem monitor
+E no FCSA_MILP, os registros de cada solve são rotulados com a fase (passo1, passo2).
+
+Uso:
+    python teste_progresso_solver.py
+    python teste_progresso_solver.py --backends highs --problema dados/problema1
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from modelos.modelo_Caio import FCSA_MILP
+from modelos.progresso import MonitorProgresso, RegraParada, ler_jsonl
+from modelos.solvers import BACKENDS, ConstrutorMILP, criar_solver
+
+
+def set_cover(n: int = 60, linhas: int = 40, seed: int = 0):
+    """Set cover ponderado com custos inteiros (algumas centenas de nós de branch-and-bound)"""
+    rng = np.random.default_rng(seed)
+    construtor = ConstrutorMILP()
+    construtor.adicionar_variaveis(n, 'B')
+    for _ in range(linhas):
+        ind = rng.choice(n, 12, replace=False)
+        construtor.adicionar_restricao(ind, rng.integers(1, 20, 12), 'G', 40)
+    return construtor.matriz(), rng.integers(5, 50, n).astype(float)
+
+
+def checar_backend(backend: str, matriz, custos, pasta: Path):
+    recebidos = []
+    monitor = MonitorProgresso([recebidos.append], pasta / f'{backend}.jsonl', intervalo_s=0.05)
+    solver = criar_solver(matriz, backend)
+    solver.definir_objetivo(custos)
+    completo = solver.resolver(threads=1, progresso=monitor)
+
+    # Modelo novo: o CPLEX reaproveita a incumbente de um solve anterior do mesmo modelo
+    solver = criar_solver(matriz, backend)
+    solver.definir_objetivo(custos)
+    parada = MonitorProgresso(regras=[RegraParada(gap=0.05)])
+    interrompido = solver.resolver(threads=1, progresso=parada)
+    novamente = solver.resolver(threads=1)
+
+    com_limitante = [r for r in recebidos if r['incumbente'] is not None and r['limitante'] is not None]
+    return [
+        (len(recebidos) > 1 and recebidos[-1]['evento'] == 'fim'
+         and ler_jsonl(pasta / f'{backend}.jsonl') == recebidos,
+         "Registros no callback e no JSONL, o último com evento 'fim'"),
+        (bool(com_limitante) and all(r['gap'] is not None and r['nos'] is not None for r in com_limitante),
+         "Registros com incumbente e limitante trazem gap e nós"),
+        (interrompido['viavel'] and interrompido.get('parada') and interrompido['gap'] <= 0.05 + 1e-9
+         and interrompido['objetivo'] >= completo['objetivo'] - 1e-6,
+         f"Parada antecipada: {interrompido.get('parada')} (gap {interrompido.get('gap', 0) * 100:.2f}%)"),
+        (novamente['viavel'] and 'parada' not in novamente
+         and abs(novamente['objetivo'] - completo['objetivo']) < 1e-6,
+         "Sem monitor, o solver resolve até o fim"),
+    ]
+
+
+def checar_fcsa(pasta_problema: str):
+    monitor = MonitorProgresso()
+    modelo = FCSA_MILP(pasta_problema)
+    modelo.log_output = False
+    modelo.progresso = monitor
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok = modelo.resolver(backend='highs')
+    fases = {r['fase'] for r in monitor.historico}
+    return [(ok and {'passo1', 'passo2'} <= fases, f"FCSA_MILP: registros rotulados por fase {sorted(fases)}")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validação do progresso do solver em tempo real')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--problema', default='dados/problema0')
+    args = parser.parse_args()
+
+    matriz, custos = set_cover()
+    print(f"\n{'='*80}\n📈 PROGRESSO DO SOLVER - set cover {matriz.num_linhas} × {matriz.num_colunas}\n{'='*80}")
+    falhas = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends:
+            print(f"   [{backend}]")
+            for ok, descricao in checar_backend(backend, matriz, custos, Path(tmp)):
+                print(f"   {'✅' if ok else '❌'} {descricao}")
+                falhas += not ok
+    for ok, descricao in checar_fcsa(args.problema):
+        print(f"   {'✅' if ok else '❌'} {descricao}")
+        falhas += not ok
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())